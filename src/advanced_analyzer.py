@@ -21,12 +21,14 @@ class AdvancedTechnicalAnalyzer:
         """初期化"""
         self.indicators = {}
 
-    def calculate_all_indicators(self, df: pd.DataFrame) -> Dict:
+    def calculate_all_indicators(self, df: pd.DataFrame, series: pd.DataFrame = None) -> Dict:
         """
         全てのテクニカル指標を計算
 
         Args:
             df: OHLCV DataFrame
+            series: calculate_indicator_seriesで事前計算した指標系列（dfと同じ行範囲）
+                    指定時は系列の再計算を省略し、最終行の値を参照する
 
         Returns:
             dict: 計算された指標
@@ -37,18 +39,18 @@ class AdvancedTechnicalAnalyzer:
 
         try:
             indicators = {
-                'rsi': self.calculate_rsi(df),
-                'macd': self.calculate_macd(df),
-                'bollinger': self.calculate_bollinger_bands(df),
-                'stochastic': self.calculate_stochastic(df),
-                'adx': self.calculate_adx(df),
-                'obv': self.calculate_obv(df),
-                'vwap': self.calculate_vwap(df),
-                'atr': self.calculate_atr(df),
+                'rsi': self.calculate_rsi(df, series=series),
+                'macd': self.calculate_macd(df, series=series),
+                'bollinger': self.calculate_bollinger_bands(df, series=series),
+                'stochastic': self.calculate_stochastic(df, series=series),
+                'adx': self.calculate_adx(df, series=series),
+                'obv': self.calculate_obv(df, series=series),
+                'vwap': self.calculate_vwap(df, series=series),
+                'atr': self.calculate_atr(df, series=series),
                 'pivot_points': self.calculate_pivot_points(df),
                 'fibonacci': self.calculate_fibonacci_levels(df),
                 'volume_profile': self.calculate_volume_profile(df),
-                'trend_strength': self.analyze_trend_strength(df)
+                'trend_strength': self.analyze_trend_strength(df, series=series)
             }
 
             # シグナルの統合評価
@@ -60,15 +62,208 @@ class AdvancedTechnicalAnalyzer:
             logger.error(f"Error calculating advanced indicators: {e}")
             return {}
 
-    def calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> Dict:
+    def calculate_indicator_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        calculate_all_indicatorsが参照する指標系列を全期間について一括計算
+
+        各系列は当日までのデータのみで決まるため、先頭から任意の日付までを
+        切り出した結果はその日付までのデータで計算した値と一致する
+        （バックテストで日付ごとに指標を再計算しないために使用）
+
+        Args:
+            df: OHLCV DataFrame
+
+        Returns:
+            DataFrame: dfと同じインデックスの指標系列
+        """
+        close = df['Close']
+        high = df['High']
+        low = df['Low']
+        volume = df['Volume']
+
+        macd = ta.trend.MACD(close)
+        bb = ta.volatility.BollingerBands(close, window=20)
+        stoch = ta.momentum.StochasticOscillator(high, low, close, window=14)
+        adx = ta.trend.ADXIndicator(high, low, close, window=14)
+        obv = ta.volume.OnBalanceVolumeIndicator(close, volume).on_balance_volume()
+        typical_price = (high + low + close) / 3
+        bb_width = bb.bollinger_hband() - bb.bollinger_lband()
+
+        return pd.DataFrame({
+            'rsi': ta.momentum.RSIIndicator(close, window=14).rsi(),
+            'macd': macd.macd(),
+            'macd_signal': macd.macd_signal(),
+            'macd_diff': macd.macd_diff(),
+            'bb_upper': bb.bollinger_hband(),
+            'bb_middle': bb.bollinger_mavg(),
+            'bb_lower': bb.bollinger_lband(),
+            'bb_width_mean_10': bb_width.rolling(10, min_periods=1).mean(),
+            'stoch_k': stoch.stoch(),
+            'stoch_d': stoch.stoch_signal(),
+            'adx': adx.adx(),
+            'adx_pos': adx.adx_pos(),
+            'adx_neg': adx.adx_neg(),
+            'obv': obv,
+            'obv_sma_20': obv.rolling(20, min_periods=1).mean(),
+            'close_sma_20': close.rolling(20, min_periods=1).mean(),
+            'vwap': (typical_price * volume).cumsum() / volume.cumsum(),
+            'atr': ta.volatility.AverageTrueRange(high, low, close, window=14).average_true_range(),
+            'sma_5': ta.trend.sma_indicator(close, 5),
+            'sma_10': ta.trend.sma_indicator(close, 10),
+            'sma_20': ta.trend.sma_indicator(close, 20)
+        }, index=df.index)
+
+    def calculate_indicator_series_grouped(self, df: pd.DataFrame, group_col: str = 'Symbol') -> pd.DataFrame:
+        """
+        複数銘柄を縦持ちにしたDataFrameからcalculate_indicator_seriesと同じ指標系列を一括計算
+
+        銘柄ごとのforループではなくgroupby(group_col).transformで処理するため、
+        少ないサンプル数の銘柄を大量に扱う場合のpandas呼び出しコストを抑えられる
+        RSI・ATRはtaと同じWilder平滑化（alpha=1/14の指数平滑）で計算する
+
+        Args:
+            df: group_col列を含むOHLCV DataFrame（銘柄ごとに日付昇順）
+            group_col: 銘柄コード列名
+
+        Returns:
+            DataFrame: dfと同じインデックス・行順の指標系列
+        """
+        index = df.index
+        df = df.reset_index(drop=True)
+        keys = df[group_col]
+        groups = df.groupby(keys, sort=False)
+
+        close = df['Close']
+        high = df['High']
+        low = df['Low']
+        volume = df['Volume']
+        prev_close = groups['Close'].shift(1)
+
+        def transform(values: pd.Series, func) -> pd.Series:
+            return values.groupby(keys, sort=False).transform(func)
+
+        def wilder(values: pd.Series, min_periods: int = 0) -> pd.Series:
+            return transform(values, lambda x: x.ewm(alpha=1 / 14, min_periods=min_periods, adjust=False).mean())
+
+        def ema(values: pd.Series, span: int) -> pd.Series:
+            return transform(values, lambda x: x.ewm(span=span, min_periods=span, adjust=False).mean())
+
+        def sma(values: pd.Series, window: int, min_periods: int = None) -> pd.Series:
+            return transform(values, lambda x: x.rolling(window, min_periods=min_periods or window).mean())
+
+        # RSI（Wilder平滑化）
+        diff = close - prev_close
+        avg_gain = wilder(diff.where(diff > 0, 0.0), min_periods=14)
+        avg_loss = wilder(-diff.where(diff < 0, 0.0), min_periods=14)
+        rsi = pd.Series(np.where(avg_loss == 0, 100, 100 - 100 / (1 + avg_gain / avg_loss)))
+
+        # ATR（先頭14本の真の値幅の平均を初期値とするWilder平滑化、それ以前は0）
+        true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+        position = groups.cumcount()
+        seeded_range = true_range.where(position > 13)
+        seeded_range[position == 13] = sma(true_range, 14)
+        atr = wilder(seeded_range).fillna(0)
+
+        # MACD
+        macd = ema(close, 12) - ema(close, 26)
+        macd_signal = ema(macd, 9)
+
+        # ボリンジャーバンド
+        bb_middle = sma(close, 20)
+        bb_std = transform(close, lambda x: x.rolling(20).std(ddof=0))
+        bb_upper = bb_middle + 2 * bb_std
+        bb_lower = bb_middle - 2 * bb_std
+
+        # ストキャスティクス
+        lowest = transform(low, lambda x: x.rolling(14).min())
+        highest = transform(high, lambda x: x.rolling(14).max())
+        stoch_k = 100 * (close - lowest) / (highest - lowest)
+
+        # ADX（再帰計算のため銘柄ごとにtaで計算）
+        adx = df.groupby(keys, sort=False, group_keys=False)[['High', 'Low', 'Close']].apply(self._adx_series)
+        adx = adx.reindex(df.index)
+
+        # OBV・VWAP
+        obv = transform(pd.Series(np.where(close < prev_close, -volume, volume)), 'cumsum')
+        typical_price = (high + low + close) / 3
+        vwap = transform(typical_price * volume, 'cumsum') / transform(volume, 'cumsum')
+
+        return pd.DataFrame({
+            'rsi': rsi,
+            'macd': macd,
+            'macd_signal': macd_signal,
+            'macd_diff': macd - macd_signal,
+            'bb_upper': bb_upper,
+            'bb_middle': bb_middle,
+            'bb_lower': bb_lower,
+            'bb_width_mean_10': sma(bb_upper - bb_lower, 10, min_periods=1),
+            'stoch_k': stoch_k,
+            'stoch_d': sma(stoch_k, 3),
+            'adx': adx['adx'],
+            'adx_pos': adx['adx_pos'],
+            'adx_neg': adx['adx_neg'],
+            'obv': obv,
+            'obv_sma_20': sma(obv, 20, min_periods=1),
+            'close_sma_20': sma(close, 20, min_periods=1),
+            'vwap': vwap,
+            'atr': atr,
+            'sma_5': sma(close, 5),
+            'sma_10': sma(close, 10),
+            'sma_20': bb_middle
+        }).set_axis(index)
+
+    def calculate_all_indicators_grouped(self, df: pd.DataFrame, group_col: str = 'Symbol') -> Dict[str, Dict]:
+        """
+        複数銘柄を縦持ちにしたDataFrameから全銘柄の指標を一括計算
+
+        指標系列はcalculate_indicator_series_groupedで1回だけ計算し、
+        銘柄ごとの結果はcalculate_all_indicatorsと同じ形式で返す
+
+        Args:
+            df: group_col列を含むOHLCV DataFrame（銘柄ごとに日付昇順）
+            group_col: 銘柄コード列名
+
+        Returns:
+            dict: 銘柄コード -> 計算された指標
+        """
+        if df.empty or group_col not in df.columns:
+            return {}
+
+        try:
+            series = self.calculate_indicator_series_grouped(df, group_col)
+            results = {}
+            for symbol, positions in df.groupby(group_col, sort=False).indices.items():
+                indicators = self.calculate_all_indicators(df.iloc[positions], series=series.iloc[positions])
+                if indicators:
+                    results[symbol] = indicators
+            return results
+
+        except Exception as e:
+            logger.error(f"Error calculating grouped indicators: {e}")
+            return {}
+
+    @staticmethod
+    def _adx_series(group: pd.DataFrame) -> pd.DataFrame:
+        """1銘柄分のADX系列を計算（calculate_indicator_series_grouped用）"""
+        adx = ta.trend.ADXIndicator(group['High'], group['Low'], group['Close'], window=14)
+        return pd.DataFrame({
+            'adx': adx.adx(),
+            'adx_pos': adx.adx_pos(),
+            'adx_neg': adx.adx_neg()
+        }, index=group.index)
+
+    def calculate_rsi(self, df: pd.DataFrame, period: int = 14, series: pd.DataFrame = None) -> Dict:
         """
         RSI（相対力指数）計算
 
         Returns:
             dict: RSI値と状態
         """
-        rsi = ta.momentum.RSIIndicator(df['Close'], window=period)
-        rsi_value = rsi.rsi().iloc[-1]
+        if series is not None:
+            rsi_series = series['rsi']
+        else:
+            rsi_series = ta.momentum.RSIIndicator(df['Close'], window=period).rsi()
+        rsi_value = rsi_series.iloc[-1]
 
         # RSI解釈
         if rsi_value > 70:
@@ -82,7 +277,7 @@ class AdvancedTechnicalAnalyzer:
             signal = 'hold'
 
         # ダイバージェンス検出
-        divergence = self._detect_rsi_divergence(df, rsi.rsi())
+        divergence = self._detect_rsi_divergence(df, rsi_series)
 
         return {
             'value': float(rsi_value),
@@ -91,21 +286,25 @@ class AdvancedTechnicalAnalyzer:
             'divergence': divergence
         }
 
-    def calculate_macd(self, df: pd.DataFrame) -> Dict:
+    def calculate_macd(self, df: pd.DataFrame, series: pd.DataFrame = None) -> Dict:
         """
         MACD計算
 
         Returns:
             dict: MACD、シグナル、ヒストグラム
         """
-        macd = ta.trend.MACD(df['Close'])
+        if series is not None:
+            macd_series, signal_series, diff_series = series['macd'], series['macd_signal'], series['macd_diff']
+        else:
+            macd = ta.trend.MACD(df['Close'])
+            macd_series, signal_series, diff_series = macd.macd(), macd.macd_signal(), macd.macd_diff()
 
-        macd_line = macd.macd().iloc[-1]
-        signal_line = macd.macd_signal().iloc[-1]
-        histogram = macd.macd_diff().iloc[-1]
+        macd_line = macd_series.iloc[-1]
+        signal_line = signal_series.iloc[-1]
+        histogram = diff_series.iloc[-1]
 
         # 前日のヒストグラム
-        prev_histogram = macd.macd_diff().iloc[-2]
+        prev_histogram = diff_series.iloc[-2]
 
         # クロスオーバー検出
         crossover = None
@@ -122,18 +321,24 @@ class AdvancedTechnicalAnalyzer:
             'trend': 'bullish' if histogram > 0 else 'bearish'
         }
 
-    def calculate_bollinger_bands(self, df: pd.DataFrame, window: int = 20) -> Dict:
+    def calculate_bollinger_bands(self, df: pd.DataFrame, window: int = 20, series: pd.DataFrame = None) -> Dict:
         """
         ボリンジャーバンド計算
 
         Returns:
             dict: バンド情報と現在位置
         """
-        bb = ta.volatility.BollingerBands(df['Close'], window=window)
-
-        upper_band = bb.bollinger_hband().iloc[-1]
-        middle_band = bb.bollinger_mavg().iloc[-1]
-        lower_band = bb.bollinger_lband().iloc[-1]
+        if series is not None:
+            upper_band = series['bb_upper'].iloc[-1]
+            middle_band = series['bb_middle'].iloc[-1]
+            lower_band = series['bb_lower'].iloc[-1]
+            recent_width_mean = series['bb_width_mean_10'].iloc[-1]
+        else:
+            bb = ta.volatility.BollingerBands(df['Close'], window=window)
+            upper_band = bb.bollinger_hband().iloc[-1]
+            middle_band = bb.bollinger_mavg().iloc[-1]
+            lower_band = bb.bollinger_lband().iloc[-1]
+            recent_width_mean = (bb.bollinger_hband() - bb.bollinger_lband()).tail(10).mean()
         current_price = df['Close'].iloc[-1]
 
         # バンド幅
@@ -144,8 +349,7 @@ class AdvancedTechnicalAnalyzer:
         position_in_band = (current_price - lower_band) / band_width if band_width > 0 else 0.5
 
         # スクイーズ検出（バンドが狭まっている）
-        recent_widths = (bb.bollinger_hband() - bb.bollinger_lband()).tail(10)
-        is_squeeze = band_width < recent_widths.mean() * 0.8
+        is_squeeze = band_width < recent_width_mean * 0.8
 
         return {
             'upper': float(upper_band),
@@ -158,19 +362,23 @@ class AdvancedTechnicalAnalyzer:
             'signal': self._get_bb_signal(position_in_band, is_squeeze)
         }
 
-    def calculate_stochastic(self, df: pd.DataFrame, window: int = 14) -> Dict:
+    def calculate_stochastic(self, df: pd.DataFrame, window: int = 14, series: pd.DataFrame = None) -> Dict:
         """
         ストキャスティクス計算
 
         Returns:
             dict: %K、%D値とシグナル
         """
-        stoch = ta.momentum.StochasticOscillator(
-            df['High'], df['Low'], df['Close'], window=window
-        )
+        if series is not None:
+            k_series, d_series = series['stoch_k'], series['stoch_d']
+        else:
+            stoch = ta.momentum.StochasticOscillator(
+                df['High'], df['Low'], df['Close'], window=window
+            )
+            k_series, d_series = stoch.stoch(), stoch.stoch_signal()
 
-        k_value = stoch.stoch().iloc[-1]
-        d_value = stoch.stoch_signal().iloc[-1]
+        k_value = k_series.iloc[-1]
+        d_value = d_series.iloc[-1]
 
         # オーバーボート/オーバーソールド判定
         if k_value > 80:
@@ -181,8 +389,8 @@ class AdvancedTechnicalAnalyzer:
             status = 'neutral'
 
         # クロスオーバー検出
-        prev_k = stoch.stoch().iloc[-2]
-        prev_d = stoch.stoch_signal().iloc[-2]
+        prev_k = k_series.iloc[-2]
+        prev_d = d_series.iloc[-2]
 
         crossover = None
         if prev_k < prev_d and k_value > d_value:
@@ -197,18 +405,22 @@ class AdvancedTechnicalAnalyzer:
             'crossover': crossover
         }
 
-    def calculate_adx(self, df: pd.DataFrame, window: int = 14) -> Dict:
+    def calculate_adx(self, df: pd.DataFrame, window: int = 14, series: pd.DataFrame = None) -> Dict:
         """
         ADX（平均方向性指数）計算
 
         Returns:
             dict: ADX値とトレンド強度
         """
-        adx = ta.trend.ADXIndicator(df['High'], df['Low'], df['Close'], window=window)
-
-        adx_value = adx.adx().iloc[-1]
-        plus_di = adx.adx_pos().iloc[-1]
-        minus_di = adx.adx_neg().iloc[-1]
+        if series is not None:
+            adx_value = series['adx'].iloc[-1]
+            plus_di = series['adx_pos'].iloc[-1]
+            minus_di = series['adx_neg'].iloc[-1]
+        else:
+            adx = ta.trend.ADXIndicator(df['High'], df['Low'], df['Close'], window=window)
+            adx_value = adx.adx().iloc[-1]
+            plus_di = adx.adx_pos().iloc[-1]
+            minus_di = adx.adx_neg().iloc[-1]
 
         # トレンド強度判定
         if adx_value < 25:
@@ -231,24 +443,29 @@ class AdvancedTechnicalAnalyzer:
             'trend_direction': trend_direction
         }
 
-    def calculate_obv(self, df: pd.DataFrame) -> Dict:
+    def calculate_obv(self, df: pd.DataFrame, series: pd.DataFrame = None) -> Dict:
         """
         OBV（オンバランスボリューム）計算
 
         Returns:
             dict: OBV値とトレンド
         """
-        obv = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume'])
-        obv_values = obv.on_balance_volume()
-
-        current_obv = obv_values.iloc[-1]
-        obv_sma = obv_values.tail(20).mean()
+        if series is not None:
+            current_obv = series['obv'].iloc[-1]
+            obv_sma = series['obv_sma_20'].iloc[-1]
+            close_sma = series['close_sma_20'].iloc[-1]
+        else:
+            obv = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume'])
+            obv_values = obv.on_balance_volume()
+            current_obv = obv_values.iloc[-1]
+            obv_sma = obv_values.tail(20).mean()
+            close_sma = df['Close'].tail(20).mean()
 
         # OBVトレンド判定
         obv_trend = 'bullish' if current_obv > obv_sma else 'bearish'
 
         # 価格との乖離チェック
-        price_trend = 'bullish' if df['Close'].iloc[-1] > df['Close'].tail(20).mean() else 'bearish'
+        price_trend = 'bullish' if df['Close'].iloc[-1] > close_sma else 'bearish'
         divergence = obv_trend != price_trend
 
         return {
@@ -258,17 +475,19 @@ class AdvancedTechnicalAnalyzer:
             'divergence': divergence
         }
 
-    def calculate_vwap(self, df: pd.DataFrame) -> Dict:
+    def calculate_vwap(self, df: pd.DataFrame, series: pd.DataFrame = None) -> Dict:
         """
         VWAP（出来高加重平均価格）計算
 
         Returns:
             dict: VWAP値と現在価格との関係
         """
-        typical_price = (df['High'] + df['Low'] + df['Close']) / 3
-        vwap = (typical_price * df['Volume']).cumsum() / df['Volume'].cumsum()
-
-        current_vwap = vwap.iloc[-1]
+        if series is not None:
+            current_vwap = series['vwap'].iloc[-1]
+        else:
+            typical_price = (df['High'] + df['Low'] + df['Close']) / 3
+            vwap = (typical_price * df['Volume']).cumsum() / df['Volume'].cumsum()
+            current_vwap = vwap.iloc[-1]
         current_price = df['Close'].iloc[-1]
 
         # 価格位置
@@ -280,15 +499,18 @@ class AdvancedTechnicalAnalyzer:
             'signal': 'buy' if deviation < -0.01 else 'sell' if deviation > 0.01 else 'neutral'
         }
 
-    def calculate_atr(self, df: pd.DataFrame, window: int = 14) -> Dict:
+    def calculate_atr(self, df: pd.DataFrame, window: int = 14, series: pd.DataFrame = None) -> Dict:
         """
         ATR（平均真幅）計算
 
         Returns:
             dict: ATR値とボラティリティ評価
         """
-        atr = ta.volatility.AverageTrueRange(df['High'], df['Low'], df['Close'], window=window)
-        atr_value = atr.average_true_range().iloc[-1]
+        if series is not None:
+            atr_value = series['atr'].iloc[-1]
+        else:
+            atr = ta.volatility.AverageTrueRange(df['High'], df['Low'], df['Close'], window=window)
+            atr_value = atr.average_true_range().iloc[-1]
 
         # ボラティリティレベル
         atr_percentage = atr_value / df['Close'].iloc[-1]
@@ -428,7 +650,7 @@ class AdvancedTechnicalAnalyzer:
             'current_in_value_area': self._is_in_value_area(df['Close'].iloc[-1], value_area)
         }
 
-    def analyze_trend_strength(self, df: pd.DataFrame) -> Dict:
+    def analyze_trend_strength(self, df: pd.DataFrame, series: pd.DataFrame = None) -> Dict:
         """
         トレンド強度の総合分析
 
@@ -436,9 +658,14 @@ class AdvancedTechnicalAnalyzer:
             dict: トレンド評価
         """
         # 複数の移動平均線
-        sma_5 = ta.trend.sma_indicator(df['Close'], 5).iloc[-1]
-        sma_10 = ta.trend.sma_indicator(df['Close'], 10).iloc[-1]
-        sma_20 = ta.trend.sma_indicator(df['Close'], 20).iloc[-1]
+        if series is not None:
+            sma_5 = series['sma_5'].iloc[-1]
+            sma_10 = series['sma_10'].iloc[-1]
+            sma_20 = series['sma_20'].iloc[-1]
+        else:
+            sma_5 = ta.trend.sma_indicator(df['Close'], 5).iloc[-1]
+            sma_10 = ta.trend.sma_indicator(df['Close'], 10).iloc[-1]
+            sma_20 = ta.trend.sma_indicator(df['Close'], 20).iloc[-1]
         current_price = df['Close'].iloc[-1]
 
         # トレンドスコア計算
@@ -4,16 +4,179 @@
 銘柄ごとにスコアを計算し、ランキングを作成
 """
 
+import heapq
+import sys
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from loguru import logger
 from datetime import datetime
+from dataclasses import dataclass, field
+
+import analyzer_kernels as kernels
+
+# シグナル表現: (シグナルコード, 表示用パラメータ)
+Signal = Tuple[str, Dict]
+
+# シグナルの表示テンプレート（言語別）
+SIGNAL_TEMPLATES = {
+    'ja': {
+        'volume_surge': "出来高急増 (前日比{ratio:.1f}倍)",
+        'gap_up_moderate': "適度なギャップアップ ({ratio:.1%})",
+        'gap_up_high': "大幅ギャップアップ ({ratio:.1%})",
+        'ma5_breakout': "5日移動平均線突破",
+        'ma25_breakout': "25日移動平均線突破",
+        'lower_shadow': "下ヒゲ陽線",
+        'high_close': "高値引け",
+        'resistance_break': "レジスタンス突破",
+        'positive_news': "好材料ニュース ({category})",
+    },
+}
+
+
+def format_signal(code: str, payload: Optional[Dict] = None, lang: str = 'ja') -> str:
+    """
+    シグナルを表示用文字列に整形
+
+    スコアリング処理では文字列化せず、レポート・通知などの表示時にのみ呼び出す
+
+    Args:
+        code: シグナルコード
+        payload: テンプレートに埋め込むパラメータ
+        lang: 表示言語
+
+    Returns:
+        str: 表示用文字列（未定義のコードはコードをそのまま返す）
+    """
+    template = SIGNAL_TEMPLATES.get(lang, SIGNAL_TEMPLATES['ja']).get(code)
+    if template is None:
+        return code
+    return template.format(**(payload or {}))
+
+
+def format_signals(signals: List, lang: str = 'ja') -> List[str]:
+    """
+    シグナルリストを表示用文字列のリストに整形
+
+    Args:
+        signals: (コード, パラメータ)のリスト（整形済みの文字列はそのまま扱う）
+        lang: 表示言語
+
+    Returns:
+        list: 表示用文字列のリスト
+    """
+    return [signal if isinstance(signal, str) else format_signal(signal[0], signal[1], lang)
+            for signal in signals or []]
+
+
+def positive_news_categories(news_list: Optional[List]) -> tuple:
+    """
+    ポジティブニュースのカテゴリーを出現順に抽出
+
+    Args:
+        news_list: ニュースのリスト（NewsItemまたは辞書）
+
+    Returns:
+        tuple: ポジティブニュースごとのカテゴリー（件数はlenで取得）
+    """
+    categories = []
+    for news in news_list or []:
+        if isinstance(news, dict):
+            if news.get('sentiment') == 'positive':
+                categories.append(news.get('category', ''))
+        elif news.sentiment == 'positive':
+            categories.append(news.category)
+    return tuple(categories)
+
+
+def round_scores(result: Dict, ndigits: int = 2) -> Dict:
+    """
+    スコア結果の総合スコアと内訳を丸めたコピーを作成
+
+    スコアリング処理では丸めずに保持し、レポート・保存・配信時にのみ呼び出す
+
+    Args:
+        result: calculate_score / score_batchの結果
+        ndigits: 小数点以下の桁数
+
+    Returns:
+        dict: 丸めたスコアを持つ結果のコピー
+    """
+    rounded = dict(result)
+    if 'total_score' in result:
+        rounded['total_score'] = round(result['total_score'], ndigits)
+    if 'score_breakdown' in result:
+        rounded['score_breakdown'] = {
+            key: round(value, ndigits) for key, value in result['score_breakdown'].items()
+        }
+    return rounded
+
+
+# dataclassのslots指定はPython 3.10以降のみ対応（3.9では通常のインスタンス辞書を使用）
+# StockRecordはデフォルト値を持つため__slots__を手動で宣言できない
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class StockRecord:
+    """銘柄データ（スコアリング入力）"""
+    symbol: str = ''
+    name: str = ''
+    market: str = ''
+    current_price: float = 0.0
+    previous_close: float = 0.0
+    open: float = 0.0
+    high: float = 0.0
+    low: float = 0.0
+    volume: int = 0
+    average_volume: float = 0.0
+    market_cap: float = 0.0
+    is_marginable: bool = False
+    gap_ratio: float = 0.0
+    volume_ratio: float = 1.0
+    technical_indicators: dict = field(default_factory=dict)
+    news: list = field(default_factory=list)
+    sector_data: dict = field(default_factory=dict)
+    price_data: Optional[pd.DataFrame] = None
+    # ニュース集計（生成時に1回だけ計算）
+    positive_news_count: int = field(default=0, init=False)
+    positive_news_categories: tuple = field(default=(), init=False)
+
+    def __post_init__(self):
+        self.positive_news_categories = positive_news_categories(self.news)
+        self.positive_news_count = len(self.positive_news_categories)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StockRecord':
+        """辞書から生成（未定義のキーは無視）"""
+        fields = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in data.items() if key in fields and fields[key].init})
+
+    def get(self, key: str, default=None):
+        """dict互換のアクセス（辞書で銘柄データを渡す既存コードとの互換用）"""
+        return getattr(self, key, default)
 
 
 class StockAnalyzer:
     """株式分析・スコアリングクラス"""
 
+    # ローソク足パターンの数値コード（一括スコア計算用）
+    _PATTERN_CODES = {'lower_shadow': 1, 'high_close': 2}
+
+    # ギャップ率の区分境界（score_batchのシグナル判定とギャップスコアで共有）
+    # 2%以上（side='right'）と5%超・10%超（side='left'）のsearchsorted結果の和が区分番号になる
+    _GAP_LOWER_THRESHOLD = np.array([0.02])
+    _GAP_UPPER_THRESHOLDS = np.array([0.05, 0.10])
+    # ギャップ区分 -> ギャップアップシグナル番号
+    _GAP_SIGNAL_TABLE = np.array([0, 1, 2, 0], dtype=np.int8)
+    _GAP_SIGNAL_NAMES = (None, 'gap_up_moderate', 'gap_up_high')
+
+    # 警告の判定境界（ギャップ率: 極端/大幅、出来高倍率: 異常）
+    _WARN_GAP_EXTREME = 0.10
+    _WARN_GAP_LARGE = 0.05
+    _WARN_VOLUME_SURGE = 5.0
+
     def __init__(self, config: Dict, data_fetcher):
         """
         初期化
@@ -24,28 +187,139 @@ class StockAnalyzer:
         self.data_fetcher = data_fetcher
         self.scoring_weights = config.get('screening', {}).get('scoring_weights', {})
         self.filters = config.get('screening', {}).get('filters', {})
-
-    def calculate_score(self, stock_data: Dict) -> Dict:
+        self.top_n = config.get('screening', {}).get('top_n', 20)
+
+        # ホットパスでの辞書参照を避けるため重み・閾値を属性として保持
+        weights = self.scoring_weights
+        self._w_volume_surge = weights.get('volume_surge', 30)
+        self._w_gap_up_extreme = weights.get('gap_up_extreme', -10)
+        self._w_gap_up_high = weights.get('gap_up_high', 10)
+        self._w_gap_up_moderate = weights.get('gap_up_moderate', 20)
+        self._w_ma5_breakout = weights.get('ma5_breakout', 15)
+        self._w_ma25_breakout = weights.get('ma25_breakout', 20)
+        self._w_lower_shadow = weights.get('lower_shadow', 10)
+        self._w_high_close = weights.get('high_close', 10)
+        self._w_resistance_break = weights.get('resistance_break', 15)
+        self._w_positive_news = weights.get('positive_news', 25)
+        self._w_sector_momentum = weights.get('sector_momentum', 10)
+
+        # score_kernel用の重み配列（kernels.W_*の順）
+        self._kernel_weights = np.zeros(kernels.N_WEIGHTS, dtype=np.float64)
+        self._kernel_weights[kernels.W_VOLUME_SURGE] = self._w_volume_surge
+        self._kernel_weights[kernels.W_GAP_UP_EXTREME] = self._w_gap_up_extreme
+        self._kernel_weights[kernels.W_GAP_UP_HIGH] = self._w_gap_up_high
+        self._kernel_weights[kernels.W_GAP_UP_MODERATE] = self._w_gap_up_moderate
+        self._kernel_weights[kernels.W_MA5_BREAKOUT] = self._w_ma5_breakout
+        self._kernel_weights[kernels.W_MA25_BREAKOUT] = self._w_ma25_breakout
+        self._kernel_weights[kernels.W_LOWER_SHADOW] = self._w_lower_shadow
+        self._kernel_weights[kernels.W_HIGH_CLOSE] = self._w_high_close
+        self._kernel_weights[kernels.W_RESISTANCE_BREAK] = self._w_resistance_break
+        self._kernel_weights[kernels.W_POSITIVE_NEWS] = self._w_positive_news
+        self._kernel_weights[kernels.W_SECTOR_MOMENTUM] = self._w_sector_momentum
+
+        # 出来高・ギャップスコアの階段テーブル（score_batchでsearchsortedにより参照）
+        # 出来高: 1.5倍以上 / 2倍以上 / 3倍以上
+        self._volume_thresholds = np.array([1.5, 2.0, 3.0])
+        self._volume_table = np.array([
+            0.0, self._w_volume_surge * 0.5, self._w_volume_surge * 0.8, self._w_volume_surge
+        ])
+        # ギャップ: 区分境界はクラス定数_GAP_LOWER_THRESHOLD/_GAP_UPPER_THRESHOLDS
+        self._gap_table = np.array([
+            0.0, self._w_gap_up_moderate, self._w_gap_up_high, self._w_gap_up_extreme
+        ], dtype=np.float64)
+
+        self._min_tv = self.filters.get('min_trading_value', 500000000)
+        self._min_mc = self.filters.get('min_market_cap', 10000000000)
+        self._max_mc = self.filters.get('max_market_cap', 100000000000)
+        self._min_vol = self.filters.get('min_volatility', 0.02)
+
+        # 貸借銘柄の集合（初回のapply_filtersで取得）
+        self._marginable_set = None
+
+        # calculate_scoreの結果キャッシュ（入力項目のキー -> 結果、LRU）
+        self._score_cache = OrderedDict()
+        self._score_cache_size = 4096
+
+    def calculate_score(self, stock_data: Union[Dict, List[Dict]]) -> Union[Dict, List[Dict]]:
         """
         個別銘柄のスコア計算
 
         Args:
-            stock_data: DataFetcherから取得した銘柄データ
+            stock_data: DataFetcherから取得した銘柄データ（dictまたはStockRecord、リストの場合はscore_batchで一括計算）
 
         Returns:
             dict: スコア詳細と分析結果
         """
+        if isinstance(stock_data, list):
+            return self.score_batch(stock_data)
+
         try:
-            symbol = stock_data.get('symbol', '')
-            logger.debug(f"Calculating score for {symbol}")
+            key = self._score_key(stock_data)
+        except Exception:
+            return self._calculate_score_uncached(stock_data)
+
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            self._score_cache.move_to_end(key)
+            return self._copy_score_result(cached)
+
+        result = self._calculate_score_uncached(stock_data)
+        if 'error' in result:
+            return result
+
+        self._score_cache[key] = result
+        if len(self._score_cache) > self._score_cache_size:
+            self._score_cache.popitem(last=False)
+
+        return self._copy_score_result(result)
+
+    def clear_score_cache(self):
+        """スコアキャッシュを破棄（新しい足のデータ取得時など）"""
+        self._score_cache.clear()
+
+    def _score_key(self, stock_data: Dict) -> Tuple:
+        """スコア計算で参照する項目のみからキャッシュキーを生成"""
+        technical = stock_data.get('technical_indicators') or {}
+        sector_data = stock_data.get('sector_data') or {}
+
+        return (
+            stock_data.get('symbol', ''),
+            stock_data.get('volume_ratio', 1),
+            stock_data.get('gap_ratio', 0),
+            stock_data.get('current_price', 0),
+            technical.get('position_vs_sma5', 0),
+            technical.get('position_vs_sma25', 0),
+            technical.get('candlestick_pattern', ''),
+            tuple(technical.get('resistance_levels', [])),
+            technical.get('min_resistance'),
+            stock_data.positive_news_categories if isinstance(stock_data, StockRecord)
+            else positive_news_categories(stock_data.get('news')),
+            sector_data.get('sector_performance', 0)
+        )
+
+    @staticmethod
+    def _copy_score_result(result: Dict) -> Dict:
+        """呼び出し側での更新がキャッシュに波及しないよう結果を複製"""
+        copied = dict(result)
+        copied['score_breakdown'] = dict(result['score_breakdown'])
+        copied['signals'] = list(result['signals'])
+        copied['warnings'] = list(result['warnings'])
+        return copied
+
+    def _calculate_score_uncached(self, stock_data: Dict) -> Dict:
+        """calculate_scoreの本体（キャッシュなし）"""
+        try:
+            stock = self._as_record(stock_data)
+            symbol = stock.symbol
+            logger.debug("Calculating score for {}", symbol)
 
             # 各スコア要素を計算
-            volume_score = self._calculate_volume_score(stock_data)
-            gap_score = self._calculate_gap_score(stock_data)
-            technical_score = self._calculate_technical_score(stock_data)
-            news_score = self._calculate_news_score(stock_data)
-            social_score = self._calculate_social_score(stock_data)
-            sector_score = self._calculate_sector_score(stock_data)
+            volume_score = self._calculate_volume_score(stock)
+            gap_score = self._calculate_gap_score(stock)
+            technical_score, technical_signals = self._score_and_signal_technical(stock)
+            news_score = self._calculate_news_score(stock)
+            social_score = self._calculate_social_score(stock)
+            sector_score = self._calculate_sector_score(stock)
 
             # 総合スコア計算
             total_score = (
@@ -61,21 +335,21 @@ class StockAnalyzer:
             total_score = max(0, min(100, total_score))
 
             # シグナル検出
-            signals = self.detect_entry_signals(stock_data)
+            signals = self.detect_entry_signals(stock, technical_signals)
 
             # リスク警告
-            warnings = self._detect_warnings(stock_data)
+            warnings = self._detect_warnings(stock)
 
             result = {
                 'symbol': symbol,
-                'total_score': round(total_score, 2),
+                'total_score': total_score,
                 'score_breakdown': {
-                    'volume_score': round(volume_score, 2),
-                    'gap_score': round(gap_score, 2),
-                    'technical_score': round(technical_score, 2),
-                    'news_score': round(news_score, 2),
-                    'social_score': round(social_score, 2),
-                    'sector_score': round(sector_score, 2)
+                    'volume_score': volume_score,
+                    'gap_score': gap_score,
+                    'technical_score': technical_score,
+                    'news_score': news_score,
+                    'social_score': social_score,
+                    'sector_score': sector_score
                 },
                 'signals': signals,
                 'warnings': warnings
@@ -87,6 +361,138 @@ class StockAnalyzer:
             logger.error(f"Error calculating score for {stock_data.get('symbol', 'unknown')}: {e}")
             return {'symbol': stock_data.get('symbol', ''), 'total_score': 0, 'error': str(e)}
 
+    def score_batch(self, stocks: List[Dict], classifications: Optional[List] = None) -> List[Dict]:
+        """
+        複数銘柄のスコアを一括計算
+
+        各項目を列ごとのNumPy配列に展開し、6つのスコア要素をまとめて計算する
+        結果の形式はcalculate_scoreと同じ
+
+        Args:
+            stocks: DataFetcherから取得した銘柄データのリスト
+            classifications: 指定時は銘柄ごとの警告判定結果（calculate_risk_metricsに渡せる形式、
+                             一括計算に失敗した場合はNone）を結果と同じ順に追加する
+
+        Returns:
+            list: 銘柄ごとのスコア詳細と分析結果
+        """
+        if not stocks:
+            return []
+
+        try:
+            count = len(stocks)
+            records = [self._as_record(stock) for stock in stocks]
+            technicals = [stock.get('technical_indicators') or {} for stock in stocks]
+
+            def column(values) -> np.ndarray:
+                return np.fromiter(values, dtype=np.float64, count=count)
+
+            volume_ratio = column(stock.get('volume_ratio', 1) for stock in stocks)
+            gap_ratio = column(stock.get('gap_ratio', 0) for stock in stocks)
+            current_price = column(stock.get('current_price', 0) for stock in stocks)
+            pos_sma5 = column(tech.get('position_vs_sma5', 0) for tech in technicals)
+            pos_sma25 = column(tech.get('position_vs_sma25', 0) for tech in technicals)
+            pattern_code = np.fromiter(
+                (self._PATTERN_CODES.get(tech.get('candlestick_pattern', ''), 0) for tech in technicals),
+                dtype=np.int8, count=count
+            )
+            min_resistance = column(
+                np.nan if (level := self._min_resistance(tech)) is None else level
+                for tech in technicals
+            )
+            sector_performance = column(
+                (stock.get('sector_data') or {}).get('sector_performance', 0) for stock in stocks
+            )
+
+            positive_news = np.fromiter(
+                (record.positive_news_count for record in records), dtype=np.int64, count=count
+            )
+
+            # ギャップ区分（2%は以上、5%・10%は超で判定するため2回に分けて参照、NaNは判定対象外）
+            gap_values = np.nan_to_num(gap_ratio, nan=0.0)
+            gap_bucket = (
+                np.searchsorted(self._GAP_LOWER_THRESHOLD, gap_values, side='right') +
+                np.searchsorted(self._GAP_UPPER_THRESHOLDS, gap_values, side='left')
+            )
+            # ギャップアップシグナル
+            gap_signals = self._GAP_SIGNAL_TABLE[gap_bucket]
+
+            if kernels.NUMBA_AVAILABLE:
+                scores = kernels.score_kernel(
+                    volume_ratio, gap_ratio, pos_sma5, pos_sma25, pattern_code, sector_performance,
+                    positive_news, current_price, min_resistance, self._kernel_weights
+                )
+                (volume_score, gap_score, technical_score, news_score,
+                 social_score, sector_score, total_score) = scores.T
+            else:
+                # 出来高スコア（NaNは閾値未満として扱う）
+                volume_values = np.nan_to_num(volume_ratio, nan=0.0)
+                volume_score = self._volume_table[
+                    np.searchsorted(self._volume_thresholds, volume_values, side='right')
+                ]
+
+                # ギャップスコア（シグナルと同じ区分を参照）
+                gap_score = self._gap_table[gap_bucket]
+
+                # テクニカルスコア
+                with np.errstate(invalid='ignore'):
+                    resistance_break = current_price > min_resistance * 1.005
+                technical_score = (
+                    np.where(pos_sma5 > 0, self._w_ma5_breakout, 0) +
+                    np.where(pos_sma25 > 0, self._w_ma25_breakout, 0) +
+                    np.select(
+                        [pattern_code == 1, pattern_code == 2],
+                        [self._w_lower_shadow, self._w_high_close],
+                        0
+                    ) +
+                    np.where(resistance_break, self._w_resistance_break, 0)
+                )
+
+                # ニューススコア（上限設定）
+                news_weight = self._w_positive_news
+                news_score = np.minimum(positive_news * news_weight, news_weight)
+
+                # ソーシャルスコア（現在はサンプル）
+                social_score = np.zeros(count)
+
+                # セクタースコア
+                sector_score = np.where(sector_performance > 0.02, self._w_sector_momentum, 0)
+
+                # 総合スコア（0-100の範囲に正規化）
+                total_score = np.clip(
+                    volume_score + gap_score + technical_score + news_score + social_score + sector_score,
+                    0, 100
+                )
+
+        except Exception as e:
+            logger.warning(f"Batch scoring failed, falling back to per-stock scoring: {e}")
+            if classifications is not None:
+                classifications.extend([None] * len(stocks))
+            return [self.calculate_score(stock) for stock in stocks]
+
+        results = []
+        for i, stock in enumerate(records):
+            # 警告はリスク指標用の判定もまとめて行い、呼び出し側で再利用できるようにする
+            classification = self._classify_warnings(stock)
+            if classifications is not None:
+                classifications.append(classification)
+            results.append({
+                'symbol': stock.symbol,
+                'total_score': float(total_score[i]),
+                'score_breakdown': {
+                    'volume_score': float(volume_score[i]),
+                    'gap_score': float(gap_score[i]),
+                    'technical_score': float(technical_score[i]),
+                    'news_score': float(news_score[i]),
+                    'social_score': float(social_score[i]),
+                    'sector_score': float(sector_score[i])
+                },
+                'signals': self.detect_entry_signals(stock, gap_signal=int(gap_signals[i])),
+                'warnings': list(classification[0])
+            })
+
+        return results
+
     def apply_filters(self, stocks: List[Dict]) -> List[Dict]:
         """
         基本フィルターを適用
@@ -100,40 +506,61 @@ class StockAnalyzer:
         Returns:
             list: フィルター通過銘柄のリスト
         """
-        filtered_stocks = []
+        # 例外処理は銘柄単位ではなくバッチ全体で1回のみ
+        # 判定順は「安価かつ絞り込み効果の高い条件」から:
+        #   信用取引可否（bool参照のみ・小型株の多くが非貸借）→ 時価総額 → ボラティリティ → 売買代金（乗算が必要）
+        # 後段の列は前段を通過した銘柄分のみ取り出す
+        try:
+            # 信用取引可能チェック（貸借銘柄一覧が取得できない場合は銘柄データの値を使用）
+            marginable_set = self._get_marginable_set()
+            if marginable_set:
+                candidates = [stock for stock in stocks if stock.get('symbol') in marginable_set]
+            else:
+                candidates = [stock for stock in stocks if stock.get('is_marginable')]
+
+            # 時価総額チェック
+            market_cap = self._filter_column(candidates, 'market_cap')
+            candidates = self._select(candidates, (market_cap >= self._min_mc) & (market_cap <= self._max_mc))
+
+            # ボラティリティチェック（前日比変動率）
+            volatility = np.abs(self._filter_column(candidates, 'gap_ratio'))
+            candidates = self._select(candidates, volatility >= self._min_vol)
+
+            # 売買代金チェック（価格 × 出来高）
+            trading_value = (self._filter_column(candidates, 'current_price') *
+                             self._filter_column(candidates, 'volume'))
+            filtered_stocks = self._select(candidates, trading_value >= self._min_tv)
 
-        for stock in stocks:
-            try:
-                # 売買代金チェック（価格 × 出来高）
-                trading_value = stock.get('current_price', 0) * stock.get('volume', 0)
-                if trading_value < self.filters.get('min_trading_value', 500000000):
-                    continue
+        except Exception as e:
+            logger.error(f"Error applying filters to {len(stocks)} stocks: {e}")
+            return []
 
-                # 時価総額チェック
-                market_cap = stock.get('market_cap', 0)
-                if (market_cap < self.filters.get('min_market_cap', 10000000000) or
-                        market_cap > self.filters.get('max_market_cap', 100000000000)):
-                    continue
+        logger.info(f"Filtered {len(filtered_stocks)} stocks from {len(stocks)} total")
+        return filtered_stocks
 
-                # 信用取引可能チェック
-                if not stock.get('is_marginable', False):
-                    continue
+    def _get_marginable_set(self):
+        """貸借銘柄の集合を取得（セッション中は1回のみ読み込み）"""
+        if self._marginable_set is None and self.data_fetcher is not None:
+            try:
+                self._marginable_set = frozenset(self.data_fetcher.get_marginable_symbols())
+            except Exception as e:
+                logger.warning(f"Error loading marginable symbols: {e}")
 
-                # ボラティリティチェック（前日比変動率）
-                volatility = abs(stock.get('gap_ratio', 0))
-                if volatility < self.filters.get('min_volatility', 0.02):
-                    continue
+        return self._marginable_set
 
-                filtered_stocks.append(stock)
+    @staticmethod
+    def _filter_column(stocks: List[Dict], key: str) -> np.ndarray:
+        """フィルター判定に使う項目をNumPy配列に変換（欠損・Noneは0）"""
+        return np.fromiter((stock.get(key) or 0 for stock in stocks), dtype=np.float64, count=len(stocks))
 
-            except Exception as e:
-                logger.warning(f"Error applying filter to {stock.get('symbol', 'unknown')}: {e}")
-                continue
+    @staticmethod
+    def _select(stocks: List[Dict], mask: np.ndarray) -> List[Dict]:
+        """マスクがTrueの銘柄のみを抽出"""
+        return [stocks[i] for i in np.flatnonzero(mask)]
 
-        logger.info(f"Filtered {len(filtered_stocks)} stocks from {len(stocks)} total")
-        return filtered_stocks
-
-    def detect_entry_signals(self, stock_data: Dict) -> List[str]:
+    def detect_entry_signals(self, stock_data: Union[Dict, StockRecord],
+                             technical_signals: List[Signal] = None,
+                             gap_signal: Optional[int] = None) -> List[Signal]:
         """
         エントリーシグナルを検出
 
@@ -144,89 +571,70 @@ class StockAnalyzer:
         - 下ヒゲ陽線からの反発
         - ニュース材料（決算、業績修正）
 
+        Args:
+            stock_data: 銘柄データ
+            technical_signals: _score_and_signal_technicalで検出済みのテクニカルシグナル
+            gap_signal: score_batchで判定済みのギャップシグナル番号（_GAP_SIGNAL_NAMESの添字）
+
         Returns:
-            list: 検出されたシグナルのリスト
+            list: 検出されたシグナルのリスト（(コード, パラメータ)のタプル。表示はformat_signalで整形）
         """
         signals = []
 
         try:
+            stock = self._as_record(stock_data)
+
             # 出来高急増シグナル
-            volume_ratio = stock_data.get('volume_ratio', 1)
+            volume_ratio = stock.volume_ratio
             if volume_ratio >= 2.0:
-                signals.append(f"出来高急増 (前日比{volume_ratio:.1f}倍)")
+                signals.append(('volume_surge', {'ratio': volume_ratio}))
 
             # ギャップアップシグナル
-            gap_ratio = stock_data.get('gap_ratio', 0)
-            if 0.02 <= gap_ratio <= 0.05:
-                signals.append(f"適度なギャップアップ ({gap_ratio:.1%})")
-            elif 0.05 < gap_ratio <= 0.10:
-                signals.append(f"大幅ギャップアップ ({gap_ratio:.1%})")
+            gap_ratio = stock.gap_ratio
+            if gap_signal is None:
+                if 0.02 <= gap_ratio <= 0.05:
+                    gap_signal = 1
+                elif 0.05 < gap_ratio <= 0.10:
+                    gap_signal = 2
+                else:
+                    gap_signal = 0
+            if gap_signal:
+                signals.append((self._GAP_SIGNAL_NAMES[gap_signal], {'ratio': gap_ratio}))
 
             # テクニカル指標シグナル
-            technical = stock_data.get('technical_indicators', {})
-            if technical:
-                # 5日移動平均線突破
-                if technical.get('position_vs_sma5', 0) > 0.01:
-                    signals.append("5日移動平均線突破")
-
-                # 25日移動平均線突破
-                if technical.get('position_vs_sma25', 0) > 0.01:
-                    signals.append("25日移動平均線突破")
-
-                # ローソク足パターン
-                pattern = technical.get('candlestick_pattern', '')
-                if pattern == 'lower_shadow':
-                    signals.append("下ヒゲ陽線")
-                elif pattern == 'high_close':
-                    signals.append("高値引け")
-
-                # レジスタンス突破
-                current_price = stock_data.get('current_price', 0)
-                resistance_levels = technical.get('resistance_levels', [])
-                if resistance_levels and current_price > min(resistance_levels) * 1.005:
-                    signals.append("レジスタンス突破")
+            if technical_signals is None:
+                technical_signals = self._score_and_signal_technical(stock)[1]
+            signals.extend(technical_signals)
 
             # ニュース材料シグナル
-            news_list = stock_data.get('news', [])
-            for news in news_list:
-                if news.get('sentiment') == 'positive':
-                    category = news.get('category', '')
-                    if category in ['決算', '業績修正']:
-                        signals.append(f"好材料ニュース ({category})")
+            for category in stock.positive_news_categories:
+                if category in ('決算', '業績修正'):
+                    signals.append(('positive_news', {'category': category}))
 
         except Exception as e:
             logger.error(f"Error detecting signals: {e}")
 
         return signals
 
-    def calculate_risk_metrics(self, stock_data: Dict) -> Dict:
+    def calculate_risk_metrics(self, stock_data: Union[Dict, StockRecord],
+                               classification: Optional[Tuple[List[str], List[str], str]] = None) -> Dict:
         """
         リスク指標を計算
 
+        Args:
+            stock_data: 銘柄データ
+            classification: score_batchで作成済みの警告判定結果（省略時はここで判定）
+
         Returns:
             dict: リスク情報
         """
         try:
             current_price = stock_data.get('current_price', 0)
-            gap_ratio = stock_data.get('gap_ratio', 0)
-            volume_ratio = stock_data.get('volume_ratio', 1)
-
-            # リスクレベル判定
-            risk_level = 'low'
-            warnings = []
-
-            # ギャップアップが大きすぎる場合
-            if gap_ratio > 0.10:
-                risk_level = 'high'
-                warnings.append('極端なギャップアップ')
-            elif gap_ratio > 0.05:
-                risk_level = 'medium'
-                warnings.append('大幅なギャップアップ')
-
-            # 出来高が異常に多い場合
-            if volume_ratio > 5.0:
-                risk_level = 'high'
-                warnings.append('異常な出来高急増')
+
+            # リスクレベル判定（スコア用の警告と同じ判定結果から導出）
+            if classification is None:
+                classification = self._classify_warnings(self._as_record(stock_data))
+            _, warnings, risk_level = classification
 
             # ストップロス・利確価格計算
             stop_loss_ratio = 0.03  # 3%下
@@ -243,7 +651,7 @@ class StockAnalyzer:
                 'stop_loss_price': round(stop_loss_price, 2),
                 'take_profit_price': round(take_profit_price, 2),
                 'risk_reward_ratio': round(risk_reward_ratio, 2),
-                'warnings': warnings
+                'warnings': list(warnings)
             }
 
         except Exception as e:
@@ -255,19 +663,16 @@ class StockAnalyzer:
         スコアに基づいてランキング作成
 
         Returns:
-            list: スコア順にソートされた銘柄リスト（上位20銘柄）
+            list: スコア順にソートされた銘柄リスト（上位top_n銘柄、既定20）
         """
         try:
-            # スコアでソート
-            ranked_stocks = sorted(
+            # スコア上位N銘柄のみを抽出（全件ソートを避ける）
+            top_stocks = heapq.nlargest(
+                self.top_n,
                 analyzed_stocks,
-                key=lambda x: x.get('total_score', 0),
-                reverse=True
+                key=lambda x: x.get('total_score', 0)
             )
 
-            # 上位20銘柄に限定
-            top_stocks = ranked_stocks[:20]
-
             # ランキング番号を追加
             for i, stock in enumerate(top_stocks):
                 stock['rank'] = i + 1
@@ -279,97 +684,196 @@ class StockAnalyzer:
             logger.error(f"Error ranking stocks: {e}")
             return []
 
-    def _calculate_volume_score(self, stock_data: Dict) -> float:
+    def score_and_rank(self, stocks: Iterable, k: Optional[int] = None) -> List[Dict]:
+        """
+        スコア計算しながら上位k銘柄のみを保持してランキング作成
+
+        全銘柄のスコア結果を保持せず、サイズkの最小ヒープで上位のみを残す
+        （ジェネレーターを渡せばピークメモリはk件＋処理中の1件）
+
+        Args:
+            stocks: 銘柄データのイテラブル
+            k: 保持する上位銘柄数（省略時はtop_n）
+
+        Returns:
+            list: スコア順にソートされた上位k銘柄のスコア結果
+        """
+        k = self.top_n if k is None else k
+        if k <= 0:
+            return []
+
+        # (スコア, -入力順, 結果) のタプルで保持し、同点時は入力順の早い銘柄を優先
+        heap = []
+        try:
+            for idx, stock in enumerate(stocks):
+                result = self.calculate_score(stock)
+                item = (result.get('total_score', 0), -idx, result)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        except Exception as e:
+            logger.error(f"Error scoring and ranking stocks: {e}")
+
+        top_stocks = [result for _, _, result in sorted(heap, reverse=True)]
+        for i, result in enumerate(top_stocks):
+            result['rank'] = i + 1
+
+        logger.info(f"Ranked {len(top_stocks)} stocks")
+        return top_stocks
+
+    def _calculate_volume_score(self, stock: StockRecord) -> float:
         """出来高スコア計算"""
-        volume_ratio = stock_data.get('volume_ratio', 1)
+        volume_ratio = stock.volume_ratio
 
         if volume_ratio >= 3.0:
-            return self.scoring_weights.get('volume_surge', 30)
+            return self._w_volume_surge
         elif volume_ratio >= 2.0:
-            return self.scoring_weights.get('volume_surge', 30) * 0.8
+            return self._w_volume_surge * 0.8
         elif volume_ratio >= 1.5:
-            return self.scoring_weights.get('volume_surge', 30) * 0.5
+            return self._w_volume_surge * 0.5
         else:
             return 0
 
-    def _calculate_gap_score(self, stock_data: Dict) -> float:
+    def _calculate_gap_score(self, stock: StockRecord) -> float:
         """ギャップスコア計算"""
-        gap_ratio = stock_data.get('gap_ratio', 0)
+        gap_ratio = stock.gap_ratio
 
         if gap_ratio > 0.10:
-            return self.scoring_weights.get('gap_up_extreme', -10)
+            return self._w_gap_up_extreme
         elif gap_ratio > 0.05:
-            return self.scoring_weights.get('gap_up_high', 10)
+            return self._w_gap_up_high
         elif gap_ratio >= 0.02:
-            return self.scoring_weights.get('gap_up_moderate', 20)
+            return self._w_gap_up_moderate
         else:
             return 0
 
-    def _calculate_technical_score(self, stock_data: Dict) -> float:
-        """テクニカルスコア計算"""
-        technical = stock_data.get('technical_indicators', {})
+    def _score_and_signal_technical(self, stock: StockRecord) -> Tuple[float, List[Signal]]:
+        """テクニカルスコアとテクニカルシグナルを1回の参照で計算"""
+        technical = stock.technical_indicators or {}
         score = 0
+        signals = []
+
+        if not technical:
+            return score, signals
 
-        # 移動平均線突破
-        if technical.get('position_vs_sma5', 0) > 0:
-            score += self.scoring_weights.get('ma5_breakout', 15)
+        position_vs_sma5 = technical.get('position_vs_sma5', 0)
+        position_vs_sma25 = technical.get('position_vs_sma25', 0)
+        pattern = technical.get('candlestick_pattern', '')
+        current_price = stock.current_price
+        min_resistance = self._min_resistance(technical)
+
+        # 5日移動平均線突破
+        if position_vs_sma5 > 0:
+            score += self._w_ma5_breakout
+            if position_vs_sma5 > 0.01:
+                signals.append(('ma5_breakout', {}))
 
-        if technical.get('position_vs_sma25', 0) > 0:
-            score += self.scoring_weights.get('ma25_breakout', 20)
+        # 25日移動平均線突破
+        if position_vs_sma25 > 0:
+            score += self._w_ma25_breakout
+            if position_vs_sma25 > 0.01:
+                signals.append(('ma25_breakout', {}))
 
         # ローソク足パターン
-        pattern = technical.get('candlestick_pattern', '')
         if pattern == 'lower_shadow':
-            score += self.scoring_weights.get('lower_shadow', 10)
+            score += self._w_lower_shadow
+            signals.append(('lower_shadow', {}))
         elif pattern == 'high_close':
-            score += self.scoring_weights.get('high_close', 10)
+            score += self._w_high_close
+            signals.append(('high_close', {}))
 
         # レジスタンス突破
-        current_price = stock_data.get('current_price', 0)
-        resistance_levels = technical.get('resistance_levels', [])
-        if resistance_levels and current_price > min(resistance_levels) * 1.005:
-            score += self.scoring_weights.get('resistance_break', 15)
-
-        return score
-
-    def _calculate_news_score(self, stock_data: Dict) -> float:
+        if min_resistance is not None and current_price > min_resistance * 1.005:
+            score += self._w_resistance_break
+            signals.append(('resistance_break', {}))
+
+        return score, signals
+
+    @staticmethod
+    def _as_record(stock_data: Union[Dict, StockRecord]) -> StockRecord:
+        """辞書で渡された銘柄データをStockRecordに変換"""
+        if isinstance(stock_data, StockRecord):
+            return stock_data
+        return StockRecord.from_dict(stock_data)
+
+    @staticmethod
+    def _min_resistance(technical: Dict):
+        """最も低いレジスタンスレベル（DataFetcherで計算済みの値を優先）"""
+        min_resistance = technical.get('min_resistance')
+        if min_resistance is not None:
+            return min_resistance
+
+        resistance_levels = technical.get('resistance_levels')
+        return min(resistance_levels) if resistance_levels else None
+
+    def _calculate_news_score(self, stock: StockRecord) -> float:
         """ニューススコア計算"""
-        news_list = stock_data.get('news', [])
-        score = 0
-
-        for news in news_list:
-            if news.get('sentiment') == 'positive':
-                score += self.scoring_weights.get('positive_news', 25)
+        score = stock.positive_news_count * self._w_positive_news
+        return min(score, self._w_positive_news)  # 上限設定
 
-        return min(score, self.scoring_weights.get('positive_news', 25))  # 上限設定
-
-    def _calculate_social_score(self, stock_data: Dict) -> float:
+    def _calculate_social_score(self, stock: StockRecord) -> float:
         """ソーシャルメディアスコア計算"""
         # Twitter言及データがある場合の実装（現在はサンプル）
         return 0
 
-    def _calculate_sector_score(self, stock_data: Dict) -> float:
+    def _calculate_sector_score(self, stock: StockRecord) -> float:
         """セクタースコア計算"""
-        sector_data = stock_data.get('sector_data', {})
+        sector_data = stock.sector_data or {}
         sector_performance = sector_data.get('sector_performance', 0)
 
         if sector_performance > 0.02:
-            return self.scoring_weights.get('sector_momentum', 10)
+            return self._w_sector_momentum
         else:
             return 0
 
-    def _detect_warnings(self, stock_data: Dict) -> List[str]:
+    def _detect_warnings(self, stock: StockRecord) -> List[str]:
         """警告を検出"""
         warnings = []
 
         # 極端なギャップアップ
-        gap_ratio = stock_data.get('gap_ratio', 0)
-        if gap_ratio > 0.10:
+        if stock.gap_ratio > self._WARN_GAP_EXTREME:
             warnings.append('極端なギャップアップ注意')
 
         # 異常な出来高
-        volume_ratio = stock_data.get('volume_ratio', 1)
-        if volume_ratio > 5.0:
+        if stock.volume_ratio > self._WARN_VOLUME_SURGE:
             warnings.append('異常な出来高急増')
 
-        return warnings
\ No newline at end of file
+        return warnings
+
+    @classmethod
+    def _classify_warnings(cls, stock: StockRecord) -> Tuple[List[str], List[str], str]:
+        """
+        ギャップ・出来高の判定を1回だけ行い、スコア用とリスク指標用の警告を作成
+
+        score_batchで作成した結果をcalculate_risk_metricsに渡して再判定を省く
+
+        Args:
+            stock: 銘柄データ
+
+        Returns:
+            tuple: (スコア用の警告, リスク指標用の警告, リスクレベル)
+        """
+        score_warnings = []
+        risk_warnings = []
+        risk_level = 'low'
+
+        # ギャップアップが大きすぎる場合
+        gap_ratio = stock.gap_ratio
+        if gap_ratio > cls._WARN_GAP_EXTREME:
+            score_warnings.append('極端なギャップアップ注意')
+            risk_warnings.append('極端なギャップアップ')
+            risk_level = 'high'
+        elif gap_ratio > cls._WARN_GAP_LARGE:
+            risk_warnings.append('大幅なギャップアップ')
+            risk_level = 'medium'
+
+        # 出来高が異常に多い場合
+        if stock.volume_ratio > cls._WARN_VOLUME_SURGE:
+            score_warnings.append('異常な出来高急増')
+            risk_warnings.append('異常な出来高急増')
+            risk_level = 'high'
+
+        return score_warnings, risk_warnings, risk_level
+
@@ -0,0 +1,122 @@
+"""
+スコアリング計算カーネル
+
+StockAnalyzer.score_batchから呼び出される数値計算部分
+numbaがインストールされている場合はネイティブコードにコンパイルして実行する
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numbaは任意依存
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """numba未導入時は何もしないデコレーター"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# weights配列のインデックス
+W_VOLUME_SURGE = 0
+W_GAP_UP_EXTREME = 1
+W_GAP_UP_HIGH = 2
+W_GAP_UP_MODERATE = 3
+W_MA5_BREAKOUT = 4
+W_MA25_BREAKOUT = 5
+W_LOWER_SHADOW = 6
+W_HIGH_CLOSE = 7
+W_RESISTANCE_BREAK = 8
+W_POSITIVE_NEWS = 9
+W_SECTOR_MOMENTUM = 10
+N_WEIGHTS = 11
+
+# 戻り値の列インデックス
+COL_VOLUME = 0
+COL_GAP = 1
+COL_TECHNICAL = 2
+COL_NEWS = 3
+COL_SOCIAL = 4
+COL_SECTOR = 5
+COL_TOTAL = 6
+N_COLUMNS = 7
+
+
+# NaN（レジスタンスなし）の比較結果を保証するためfastmathは使用しない
+@njit(parallel=True, cache=True)
+def score_kernel(vol_ratio, gap_ratio, pos5, pos25, pattern_code, sector_perf,
+                 n_positive_news, current_price, min_resistance, weights):
+    """
+    スコア要素を一括計算
+
+    分岐条件はStockAnalyzerの_calculate_*と同一
+
+    Args:
+        vol_ratio, gap_ratio, pos5, pos25, sector_perf, current_price: float64配列
+        pattern_code: ローソク足パターンコード（1=下ヒゲ陽線, 2=高値引け）
+        n_positive_news: ポジティブニュース件数
+        min_resistance: 最小レジスタンス（なしの場合NaN）
+        weights: W_*インデックスに対応する重み配列
+
+    Returns:
+        ndarray: shape=(銘柄数, N_COLUMNS)のスコア配列
+    """
+    n = vol_ratio.shape[0]
+    out = np.zeros((n, N_COLUMNS), dtype=np.float64)
+
+    for i in prange(n):
+        # 出来高スコア
+        vr = vol_ratio[i]
+        if vr >= 3.0:
+            volume_score = weights[W_VOLUME_SURGE]
+        elif vr >= 2.0:
+            volume_score = weights[W_VOLUME_SURGE] * 0.8
+        elif vr >= 1.5:
+            volume_score = weights[W_VOLUME_SURGE] * 0.5
+        else:
+            volume_score = 0.0
+
+        # ギャップスコア
+        gr = gap_ratio[i]
+        if gr > 0.10:
+            gap_score = weights[W_GAP_UP_EXTREME]
+        elif gr > 0.05:
+            gap_score = weights[W_GAP_UP_HIGH]
+        elif gr >= 0.02:
+            gap_score = weights[W_GAP_UP_MODERATE]
+        else:
+            gap_score = 0.0
+
+        # テクニカルスコア
+        technical_score = 0.0
+        if pos5[i] > 0:
+            technical_score += weights[W_MA5_BREAKOUT]
+        if pos25[i] > 0:
+            technical_score += weights[W_MA25_BREAKOUT]
+        if pattern_code[i] == 1:
+            technical_score += weights[W_LOWER_SHADOW]
+        elif pattern_code[i] == 2:
+            technical_score += weights[W_HIGH_CLOSE]
+        if current_price[i] > min_resistance[i] * 1.005:
+            technical_score += weights[W_RESISTANCE_BREAK]
+
+        # ニューススコア（上限設定）
+        news_score = min(n_positive_news[i] * weights[W_POSITIVE_NEWS], weights[W_POSITIVE_NEWS])
+
+        # セクタースコア
+        sector_score = weights[W_SECTOR_MOMENTUM] if sector_perf[i] > 0.02 else 0.0
+
+        total = volume_score + gap_score + technical_score + news_score + sector_score
+
+        out[i, COL_VOLUME] = volume_score
+        out[i, COL_GAP] = gap_score
+        out[i, COL_TECHNICAL] = technical_score
+        out[i, COL_NEWS] = news_score
+        out[i, COL_SECTOR] = sector_score
+        out[i, COL_TOTAL] = max(0.0, min(100.0, total))
+
+    return out
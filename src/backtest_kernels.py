@@ -0,0 +1,57 @@
+"""
+バックテスト計算カーネル
+
+BacktestEngine.process_dayから呼び出されるポジション管理の数値計算部分
+numbaがインストールされている場合はネイティブコードにコンパイルして実行する
+"""
+
+import numpy as np
+
+from analyzer_kernels import njit  # numba未導入時のフォールバックを共有
+
+
+# 決済理由コード（process_dayの判定順）
+EXIT_NONE = 0
+EXIT_TAKE_PROFIT = 1
+EXIT_STOP_LOSS = 2
+EXIT_TIME_LIMIT = 3
+EXIT_BACKTEST_END = 4  # 期間終了時の強制決済（exit_kernelでは返さない）
+EXIT_REASONS = (None, 'take_profit', 'stop_loss', 'time_limit', 'backtest_end')
+
+
+@njit(cache=True)
+def exit_kernel(entry_price, current_price, days_held, take_profit, stop_loss, holding_limit):
+    """
+    保有ポジションの決済判定を一括実行
+
+    判定順は利確、損切り、保有期限。現在値がNaN（当日データなし）または
+    エントリー価格が0以下のポジションは判定しない
+
+    Args:
+        entry_price, current_price: float64配列
+        days_held: 保有日数（int64配列）
+        take_profit: 利確率
+        stop_loss: 損切り率
+        holding_limit: 最大保有日数
+
+    Returns:
+        ndarray: ポジションごとの決済理由コード（EXIT_*）
+    """
+    n = entry_price.shape[0]
+    out = np.zeros(n, dtype=np.int8)
+
+    for i in range(n):
+        price = current_price[i]
+        entry = entry_price[i]
+        if np.isnan(price) or not entry > 0:
+            continue
+
+        return_pct = (price - entry) / entry
+        if return_pct >= take_profit:
+            out[i] = EXIT_TAKE_PROFIT
+        elif return_pct <= -stop_loss:
+            out[i] = EXIT_STOP_LOSS
+        elif days_held[i] >= holding_limit:
+            out[i] = EXIT_TIME_LIMIT
+
+    return out
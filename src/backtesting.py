@@ -3,12 +3,18 @@
 過去データを使用した戦略検証
 """
 
+import hashlib
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Callable
 from loguru import logger
 import yfinance as yf
+import requests
+from requests.adapters import HTTPAdapter
 from dataclasses import dataclass, field
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -16,10 +22,23 @@ from pathlib import Path
 
 from database import DatabaseManager
 from data_fetcher import DataFetcher
-from analyzer import StockAnalyzer
+from analyzer import StockAnalyzer, format_signals
 from advanced_analyzer import AdvancedTechnicalAnalyzer
+import backtest_kernels as kernels
 from utils import load_config
 
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:  # bottleneckは任意依存
+    BOTTLENECK_AVAILABLE = False
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:  # polarsは任意依存
+    POLARS_AVAILABLE = False
+
 
 @dataclass
 class BacktestConfig:
@@ -34,6 +53,15 @@ class BacktestConfig:
     stop_loss: float = 0.03  # 損切り3%
     take_profit: float = 0.05  # 利確5%
     holding_period_limit: int = 5  # 最大保有日数
+    input_cache_dir: Optional[str] = None  # スコアリング入力のキャッシュ先（指定時のみ有効）
+    parallel_min_symbols: int = 50  # 指標の事前計算をプロセス並列化する最小銘柄数（未満はgroupbyで一括計算）
+    start_dt: datetime = field(init=False, repr=False)  # start_dateの解析結果
+    end_dt: datetime = field(init=False, repr=False)  # end_dateの解析結果
+
+    def __post_init__(self):
+        # 日付文字列の解析は生成時に1回だけ行う
+        self.start_dt = datetime.strptime(self.start_date, '%Y-%m-%d')
+        self.end_dt = datetime.strptime(self.end_date, '%Y-%m-%d')
 
 
 @dataclass
@@ -49,17 +77,312 @@ class Trade:
     pnl: float = 0.0
     pnl_percentage: float = 0.0
     exit_reason: str = ""
-    signals: List[str] = field(default_factory=list)
+    signals: List[Tuple[str, Dict]] = field(default_factory=list)
     score: float = 0.0
     commission_paid: float = 0.0
     slippage_cost: float = 0.0
 
 
+class TradeLog:
+    """
+    決済済み取引の列指向バッファ
+
+    数値項目は列ごとのNumPy配列に保持し、容量不足時は倍に拡張する。
+    反復時は互換性のためTradeとして復元する
+    """
+
+    _FLOAT_COLUMNS = ('entry_price', 'exit_price', 'position_value', 'pnl', 'pnl_percentage',
+                      'score', 'commission_paid', 'slippage_cost')
+    _DATE_COLUMNS = ('entry_date', 'exit_date')
+
+    def __init__(self, capacity: int = 64):
+        """
+        初期化
+
+        Args:
+            capacity: 初期容量
+        """
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {name: np.empty(capacity, dtype=np.float64)
+                                                for name in self._FLOAT_COLUMNS}
+        for name in self._DATE_COLUMNS:
+            self._columns[name] = np.empty(capacity, dtype='datetime64[ns]')
+        self._columns['shares'] = np.empty(capacity, dtype=np.int32)
+        self._columns['sym_idx'] = np.empty(capacity, dtype=np.int32)
+        self._columns['exit_reason'] = np.empty(capacity, dtype=np.int8)
+
+        self.symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._signals: List[List[Tuple[str, Dict]]] = []
+        self._exit_codes = {reason: code for code, reason in enumerate(kernels.EXIT_REASONS) if reason}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> Trade:
+        columns = self._columns
+        return Trade(
+            symbol=self.symbols[columns['sym_idx'][i]],
+            entry_date=pd.Timestamp(columns['entry_date'][i]).to_pydatetime(),
+            exit_date=pd.Timestamp(columns['exit_date'][i]).to_pydatetime(),
+            shares=int(columns['shares'][i]),
+            exit_reason=kernels.EXIT_REASONS[columns['exit_reason'][i]] or '',
+            signals=self._signals[i],
+            **{name: float(columns[name][i]) for name in self._FLOAT_COLUMNS}
+        )
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        指定列の配列（記録済み件数分のビュー）を取得
+
+        Args:
+            name: 列名
+
+        Returns:
+            np.ndarray: 列の値
+        """
+        return self._columns[name][:self._size]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        取引記録をDataFrameに変換（列配列から一括作成）
+
+        Returns:
+            DataFrame: 取引ごとの記録（signalsはシグナルのリスト）
+        """
+        return pd.DataFrame(self.to_columns())
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """
+        レポート用の列データを取得
+
+        Returns:
+            Dict[str, ndarray]: 列名と値（signalsはシグナルのリスト）
+        """
+        sym_idx = self.column('sym_idx')
+        exit_reason = self.column('exit_reason')
+        reason_names = np.array([reason or '' for reason in kernels.EXIT_REASONS], dtype=object)
+
+        return {
+            'symbol': np.array(self.symbols, dtype=object)[sym_idx],
+            'entry_date': self.column('entry_date'),
+            'exit_date': self.column('exit_date'),
+            'entry_price': self.column('entry_price'),
+            'exit_price': self.column('exit_price'),
+            'shares': self.column('shares'),
+            'pnl': self.column('pnl'),
+            'pnl_percentage': self.column('pnl_percentage'),
+            'exit_reason': reason_names[exit_reason],
+            'score': self.column('score'),
+            'signals': self._signals
+        }
+
+    def append(self, trade: Trade):
+        """
+        決済済み取引を追加
+
+        Args:
+            trade: 決済済みの取引
+        """
+        i = self._size
+        if i == len(self._columns['pnl']):
+            for name, values in self._columns.items():
+                grown = np.empty(len(values) * 2, dtype=values.dtype)
+                grown[:i] = values
+                self._columns[name] = grown
+
+        sym_idx = self._symbol_ids.get(trade.symbol)
+        if sym_idx is None:
+            sym_idx = self._symbol_ids[trade.symbol] = len(self.symbols)
+            self.symbols.append(trade.symbol)
+
+        columns = self._columns
+        for name in self._FLOAT_COLUMNS:
+            columns[name][i] = getattr(trade, name)
+        columns['entry_date'][i] = np.datetime64(trade.entry_date, 'ns')
+        columns['exit_date'][i] = np.datetime64(trade.exit_date, 'ns')
+        columns['shares'][i] = trade.shares
+        columns['sym_idx'][i] = sym_idx
+        columns['exit_reason'][i] = self._exit_codes.get(trade.exit_reason, kernels.EXIT_NONE)
+        self._signals.append(trade.signals)
+        self._size = i + 1
+
+
+class PositionTable:
+    """
+    保有ポジションの固定長スロットテーブル（SoA）
+
+    スロット数はmax_positionsで固定し、空きスロットはsym_idx=-1で表す。
+    決済判定や期間終了時のクローズはエントリー順（seq順）に行う
+    """
+
+    def __init__(self, capacity: int):
+        """
+        初期化
+
+        Args:
+            capacity: スロット数（最大保有ポジション数）
+        """
+        self.sym_idx = np.full(capacity, -1, dtype=np.int32)
+        self.shares = np.zeros(capacity, dtype=np.int32)
+        self.entry_price = np.zeros(capacity, dtype=np.float64)
+        self.entry_date = np.zeros(capacity, dtype='datetime64[ns]')
+        self.position_value = np.zeros(capacity, dtype=np.float64)
+        self.commission_paid = np.zeros(capacity, dtype=np.float64)
+        self.slippage_cost = np.zeros(capacity, dtype=np.float64)
+        self.score = np.zeros(capacity, dtype=np.float64)
+        self.seq = np.zeros(capacity, dtype=np.int64)
+        self.signals: List[List[Tuple[str, Dict]]] = [[] for _ in range(capacity)]
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.sym_idx >= 0))
+
+    def is_full(self) -> bool:
+        """空きスロットがないか"""
+        return bool((self.sym_idx >= 0).all())
+
+    def slot_of(self, sym_idx: int) -> int:
+        """
+        銘柄の保有スロットを取得
+
+        Args:
+            sym_idx: 銘柄インデックス
+
+        Returns:
+            int: スロット位置（未保有の場合は-1）
+        """
+        slots = np.flatnonzero(self.sym_idx == sym_idx)
+        return int(slots[0]) if len(slots) else -1
+
+    def active_slots(self) -> np.ndarray:
+        """保有中のスロット（エントリー順）"""
+        slots = np.flatnonzero(self.sym_idx >= 0)
+        return slots[np.argsort(self.seq[slots])]
+
+    def open(self, sym_idx: int, date: datetime, entry_price: float, shares: int,
+             position_value: float, commission: float, slippage_cost: float,
+             score: float, signals: List[Tuple[str, Dict]]) -> int:
+        """
+        空きスロットにポジションを記録
+
+        Returns:
+            int: 使用したスロット位置
+        """
+        slot = int(np.flatnonzero(self.sym_idx < 0)[0])
+        self.sym_idx[slot] = sym_idx
+        self.shares[slot] = shares
+        self.entry_price[slot] = entry_price
+        self.entry_date[slot] = np.datetime64(date, 'ns')
+        self.position_value[slot] = position_value
+        self.commission_paid[slot] = commission
+        self.slippage_cost[slot] = slippage_cost
+        self.score[slot] = score
+        self.signals[slot] = signals
+        self.seq[slot] = self._next_seq
+        self._next_seq += 1
+        return slot
+
+    def release(self, slot: int):
+        """
+        スロットを空きに戻す
+
+        Args:
+            slot: スロット位置
+        """
+        self.sym_idx[slot] = -1
+        self.signals[slot] = []
+
+
+@dataclass
+class PriceMatrix:
+    """
+    営業日×銘柄の価格行列（SoA）
+
+    各配列は形状 (n_days, n_symbols) のC連続配列で、[day_idx, sym_idx] で参照する。
+    価格はfloat32、出来高はint64で保持し、比率（ギャップ率・出来高倍率）はスコアの閾値判定に
+    使うためfloat64で保持する。データのない営業日・銘柄はNaN（出来高は0、rowsは-1）
+    """
+    days: pd.DatetimeIndex
+    symbols: List[str]
+    rows: np.ndarray  # 各営業日時点の最終行位置
+    close: np.ndarray
+    open_: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    volume: np.ndarray
+    previous_close: np.ndarray
+    average_volume: np.ndarray
+    gap_ratio: np.ndarray
+    volume_ratio: np.ndarray
+    symbol_index: Dict[str, int] = field(init=False)
+    dates: List[datetime] = field(init=False)  # daysのdatetime変換（日次ループで再変換しないため）
+
+    # float32で保持する価格フィールド
+    _PRICE_FIELDS = ('close', 'open_', 'high', 'low', 'previous_close')
+
+    # 行列フィールドと元データの列名の対応
+    _COLUMNS = {
+        'close': 'Close', 'open_': 'Open', 'high': 'High', 'low': 'Low', 'volume': 'Volume',
+        'previous_close': 'prev_close', 'average_volume': 'volume_sma_20', 'gap_ratio': 'gap_ratio'
+    }
+
+    def __post_init__(self):
+        self.symbol_index = {symbol: j for j, symbol in enumerate(self.symbols)}
+        self.dates = list(self.days.to_pydatetime())
+
+    @classmethod
+    def build(cls, days: pd.DatetimeIndex, symbols: List[str],
+              sources: Dict[str, pd.DataFrame], dates: Dict[str, np.ndarray]) -> 'PriceMatrix':
+        """
+        銘柄ごとの時系列から価格行列を作成
+
+        各営業日について、その日以前の最終行（休場日は直前の取引日）を銘柄ごとに
+        searchsortedで一括して求める
+
+        Args:
+            days: 対象営業日
+            symbols: 対象銘柄（列順）
+            sources: 銘柄ごとの価格・指標データ（_COLUMNSの列を含む）
+            dates: 銘柄ごとの昇順日付（datetime64[ns]）
+
+        Returns:
+            PriceMatrix: 価格行列
+        """
+        shape = (len(days), len(symbols))
+        rows = np.full(shape, -1, dtype=np.int64)
+        arrays = {name: np.full(shape, np.nan) for name in cls._COLUMNS}
+
+        for j, symbol in enumerate(symbols):
+            symbol_rows = np.searchsorted(dates[symbol], days.values, side='right') - 1
+            rows[:, j] = symbol_rows
+
+            has_data = symbol_rows >= 0
+            source = sources[symbol]
+            for name, column in cls._COLUMNS.items():
+                values = source[column].to_numpy(dtype=np.float64)
+                arrays[name][has_data, j] = values[symbol_rows[has_data]]
+
+        # 比率はfloat64の元データから計算してから型を縮小する
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = arrays['volume'] / arrays['average_volume']
+
+        for name in cls._PRICE_FIELDS:
+            arrays[name] = arrays[name].astype(np.float32)
+        arrays['volume'] = np.nan_to_num(arrays['volume']).astype(np.int64)
+
+        return cls(days=days, symbols=list(symbols), rows=rows, volume_ratio=volume_ratio, **arrays)
+
+
 @dataclass
 class BacktestResult:
     """バックテスト結果"""
     config: BacktestConfig
-    trades: List[Trade] = field(default_factory=list)
+    trades: TradeLog = field(default_factory=TradeLog)
     daily_equity: pd.DataFrame = field(default_factory=pd.DataFrame)
     start_date: datetime = None
     end_date: datetime = None
@@ -84,6 +407,9 @@ class BacktestResult:
 class BacktestEngine:
     """バックテストエンジン"""
 
+    # スコアリング入力キャッシュの形式バージョン（指標計算やStockRecordの項目を変更したら上げる）
+    _SCORING_INPUTS_VERSION = 1
+
     def __init__(self, config: BacktestConfig):
         """
         初期化
@@ -92,13 +418,21 @@ class BacktestEngine:
             config: バックテスト設定
         """
         self.config = config
-        self.trades = []
-        self.open_positions = {}
+        self.trades = TradeLog()
+        self.positions = PositionTable(config.max_positions)
+        self._lot_budget_factor = config.position_size / 100  # 資金に対する1単元（100株）あたりの投資比率
         self.capital = config.initial_capital
-        self.daily_equity = []
+        self._reset_equity(0)
         self.data_fetcher = None
         self.analyzer = None
         self.advanced_analyzer = None
+        self._session: Optional[requests.Session] = None
+        self._price_cache: Dict[str, pd.DataFrame] = {}
+        self._indicator_cache: Dict[str, pd.DataFrame] = {}
+        self._dates: Dict[str, np.ndarray] = {}  # 銘柄ごとの昇順日付（datetime64[ns]）
+        self._closes: Dict[str, np.ndarray] = {}  # 銘柄ごとの終値
+
+        self._prices: Optional[PriceMatrix] = None  # 営業日×銘柄の行列（build_price_matrixで作成）
 
     def setup(self, app_config: Dict):
         """
@@ -111,6 +445,12 @@ class BacktestEngine:
         self.analyzer = StockAnalyzer(app_config, self.data_fetcher)
         self.advanced_analyzer = AdvancedTechnicalAnalyzer()
 
+        # yfinanceの通信で接続（TCP/TLSハンドシェイク）を使い回すためのセッション
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
         logger.info(f"Backtest setup completed. Period: {self.config.start_date} to {self.config.end_date}")
 
     def get_universe(self) -> List[str]:
@@ -141,13 +481,13 @@ class BacktestEngine:
             DataFrame: 価格データ
         """
         try:
-            start_date = datetime.strptime(self.config.start_date, '%Y-%m-%d')
-            end_date = datetime.strptime(self.config.end_date, '%Y-%m-%d')
+            start_date = self.config.start_dt
+            end_date = self.config.end_dt
 
             # バックテスト期間の前後にバッファを追加（テクニカル指標計算のため）
             buffer_start = start_date - timedelta(days=100)
 
-            ticker = yf.Ticker(symbol)
+            ticker = yf.Ticker(symbol, session=self._session)
             data = ticker.history(start=buffer_start, end=end_date)
 
             if data.empty:
@@ -160,82 +500,364 @@ class BacktestEngine:
             logger.error(f"Error fetching data for {symbol}: {e}")
             return None
 
-    def screen_stocks(self, date: datetime, universe: List[str]) -> List[Dict]:
+    def download_historical_data(self, universe: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        対象銘柄の履歴データをyf.downloadで一括取得
+
+        銘柄ごとにTicker.historyを呼ぶ代わりに1回のバッチ取得（yfinance内部でスレッド並列）で済ませる
+
+        Args:
+            universe: 対象銘柄リスト
+
+        Returns:
+            Dict[str, DataFrame]: 銘柄ごとの価格データ（取得できた銘柄のみ）
+        """
+        if not universe:
+            return {}
+
+        try:
+            start_date = self.config.start_dt
+            end_date = self.config.end_dt
+
+            # バックテスト期間の前後にバッファを追加（テクニカル指標計算のため）
+            buffer_start = start_date - timedelta(days=100)
+
+            # Ticker.historyと同じ調整後価格を使用
+            raw = yf.download(
+                tickers=' '.join(universe), start=buffer_start, end=end_date,
+                group_by='ticker', threads=True, progress=False, auto_adjust=True,
+                session=self._session
+            )
+
+        except Exception as e:
+            logger.error(f"Error batch downloading historical data: {e}")
+            return {}
+
+        if raw is None or raw.empty:
+            return {}
+
+        data = {}
+        for symbol in universe:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if symbol not in raw.columns.get_level_values(0):
+                    continue
+                df = raw[symbol]
+            elif len(universe) == 1:
+                df = raw
+            else:
+                continue
+
+            df = df.dropna(how='all')
+            if not df.empty:
+                data[symbol] = df
+
+        return data
+
+    def prefetch_historical_data(self, universe: List[str]):
+        """
+        対象銘柄の履歴データを一括取得してキャッシュ
+
+        日次ループ内で同じ銘柄のデータを再取得しないよう、run()の開始時に1回だけ呼び出す。
+        一括取得で得られなかった銘柄のみ銘柄ごとに取得する
+
+        Args:
+            universe: 対象銘柄リスト
+        """
+        self._price_cache = {}
+        self._dates = {}
+        self._closes = {}
+
+        downloaded = self.download_historical_data(universe)
+
+        for symbol in universe:
+            df = downloaded.get(symbol)
+            if df is None:
+                df = self.get_historical_data(symbol)
+            if df is not None:
+                # yfinanceのインデックスはタイムゾーン付きのため、営業日と比較できるよう外す
+                if getattr(df.index, 'tz', None) is not None:
+                    df = df.tz_localize(None)
+                self._price_cache[symbol] = df
+                self._dates[symbol] = df.index.values.astype('datetime64[ns]')
+                self._closes[symbol] = df['Close'].to_numpy(dtype=np.float32)
+
+        logger.info(f"Prefetched historical data for {len(self._price_cache)}/{len(universe)} symbols")
+
+    def precompute_indicators(self, max_workers: Optional[int] = None):
+        """
+        キャッシュ済みの履歴データから指標系列を銘柄ごとに1回だけ計算
+
+        日次ループでは日付までの行を切り出して参照するため、日ごとの再計算が不要になる
+        銘柄ごとに独立しているため、銘柄数が多い場合はプロセス並列で計算し、
+        それ以外は全銘柄を縦持ちにしてgroupbyで一括計算する
+
+        Args:
+            max_workers: ワーカープロセス数（省略時はCPUコア数）
+        """
+        self._indicator_cache = {}
+
+        if len(self._price_cache) >= self.config.parallel_min_symbols:
+            try:
+                # numbaのスレッドプール初期化後にforkするとデッドロックし得るためspawnで起動
+                with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                         mp_context=multiprocessing.get_context('spawn')) as executor:
+                    futures = {symbol: executor.submit(_compute_indicator_frame, df)
+                               for symbol, df in self._price_cache.items()}
+                    for symbol, future in futures.items():
+                        try:
+                            self._indicator_cache[symbol] = future.result()
+                        except Exception as e:
+                            logger.warning(f"Error precomputing indicators for {symbol}: {e}")
+                return
+
+            except Exception as e:
+                logger.warning(f"Parallel indicator precomputation failed, falling back to serial: {e}")
+                self._indicator_cache = {}
+
+        else:
+            try:
+                self._indicator_cache = _compute_indicator_frames_grouped(self._price_cache)
+                return
+
+            except Exception as e:
+                logger.warning(f"Grouped indicator precomputation failed, falling back to per-symbol: {e}")
+                self._indicator_cache = {}
+
+        for symbol, df in self._price_cache.items():
+            try:
+                self._indicator_cache[symbol] = _compute_indicator_frame(df)
+            except Exception as e:
+                logger.warning(f"Error precomputing indicators for {symbol}: {e}")
+
+    def close_at(self, symbol: str, date: datetime) -> Optional[float]:
+        """
+        指定日時点の終値（指定日以前の最終取引日）を取得
+
+        Args:
+            symbol: 銘柄コード
+            date: 基準日
+
+        Returns:
+            Optional[float]: 終値（データがない場合はNone）
+        """
+        dates = self._dates.get(symbol)
+        if dates is None:
+            return None
+
+        idx = np.searchsorted(dates, np.datetime64(date, 'ns'), side='right') - 1
+        if idx < 0:
+            return None
+
+        return float(self._closes[symbol][idx])
+
+    def get_trading_days(self, start_date: datetime, end_date: datetime) -> pd.DatetimeIndex:
         """
-        指定日付でのスクリーニング実行
+        バックテスト期間の取引日を取得
+
+        平日のうち、取得済みデータのいずれかの銘柄に取引がある日のみを対象とする
+        （祝日など全銘柄が休場の日は処理しない）
 
         Args:
-            date: スクリーニング日付
+            start_date: 開始日
+            end_date: 終了日
+
+        Returns:
+            DatetimeIndex: 取引日
+        """
+        business_days = pd.bdate_range(start=start_date, end=end_date)
+        if not self._dates:
+            return business_days
+
+        traded = business_days.get_indexer(np.concatenate(list(self._dates.values())))
+        return business_days[np.unique(traded[traded >= 0])]
+
+    def build_price_matrix(self, days: pd.DatetimeIndex):
+        """
+        キャッシュ済みの価格・指標から営業日×銘柄の行列を作成
+
+        日次ループでは行列の参照のみで済むようにする
+
+        Args:
+            days: バックテスト対象の営業日
+        """
+        symbols = [symbol for symbol in self._price_cache if symbol in self._indicator_cache]
+        sources = {
+            symbol: pd.concat([self._price_cache[symbol][['Close', 'Open', 'High', 'Low', 'Volume']],
+                               self._indicator_cache[symbol][['prev_close', 'volume_sma_20', 'gap_ratio']]], axis=1)
+            for symbol in symbols
+        }
+        self._prices = PriceMatrix.build(days, symbols, sources, self._dates)
+
+    def screen_stocks(self, day_idx: int, universe: List[str]) -> List[Dict]:
+        """
+        指定営業日でのスクリーニング実行
+
+        Args:
+            day_idx: 営業日の位置（build_price_matrixのdaysに対応）
             universe: 対象銘柄リスト
 
         Returns:
             List[Dict]: スクリーニング結果
         """
+        date = self._prices.dates[day_idx]
+        stock_inputs = self.load_scoring_inputs(day_idx, universe)
+        if not stock_inputs:
+            return []
+
+        score_results = self.analyzer.score_batch(stock_inputs)
+        scores = np.fromiter((result.get('total_score', 0) for result in score_results),
+                             dtype=np.float64, count=len(score_results))
+
+        # スコアが正の銘柄から上位候補を選択（全件ソートせずargpartitionで絞り込む）
+        candidates = np.flatnonzero(scores > 0)
+        k = self.config.max_positions * 2
+        if len(candidates) > k:
+            kth_score = scores[candidates[np.argpartition(-scores[candidates], k - 1)[k - 1]]]
+            # 同点は入力順を優先するため、k位と同点の銘柄も含めて安定ソートする
+            candidates = candidates[scores[candidates] >= kth_score]
+        top = candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+
         results = []
+        for i in top:
+            stock_data = stock_inputs[i]
+            score_result = score_results[i]
+            results.append({
+                'symbol': stock_data['symbol'],
+                'date': date,
+                'price': stock_data['current_price'],
+                'score': score_result['total_score'],
+                'signals': score_result.get('signals', []),
+                'stock_data': stock_data
+            })
 
-        for symbol in universe:
+        return results  # 上位候補を返す
+
+    def load_scoring_inputs(self, day_idx: int, universe: List[str]) -> List[Dict]:
+        """
+        指定営業日のスコアリング入力を取得（ディスクキャッシュ優先）
+
+        スコアリング入力は重み設定に依存しないため、重みを変えて同じ期間を
+        繰り返しバックテストする場合はキャッシュから読み込んで指標計算を省略する
+
+        Args:
+            day_idx: 営業日の位置（build_price_matrixのdaysに対応）
+            universe: 対象銘柄リスト
+
+        Returns:
+            List[Dict]: 銘柄ごとのスコアリング入力
+        """
+        prices = self._prices
+        targets = set(universe)
+        # 実際に価格データを取得できた銘柄をキーにし、ダウンロード失敗の有無で別のキャッシュにする
+        available = [symbol for symbol in prices.symbols if symbol in targets]
+        cache_path = self._scoring_inputs_path(prices.days[day_idx], available)
+
+        if cache_path is not None and cache_path.exists():
             try:
-                # 指定日付までのデータを取得
-                df = self.get_historical_data(symbol)
-                if df is None or df.empty:
-                    continue
+                return pd.read_pickle(cache_path)
+            except Exception as e:
+                logger.warning(f"Error loading scoring inputs cache {cache_path}: {e}")
 
-                # 指定日付以前のデータのみ使用
-                historical_df = df[df.index <= date]
-                if len(historical_df) < 30:  # 最低30日分のデータが必要
-                    continue
+        stock_inputs = self.build_scoring_inputs(day_idx, universe)
+
+        # 一部の銘柄で指標計算に失敗した日（対象銘柄数に満たない結果）はキャッシュしない
+        eligible = sum(1 for j in np.flatnonzero(prices.rows[day_idx] >= 29).tolist()
+                       if prices.symbols[j] in targets)
+        if cache_path is not None and stock_inputs and len(stock_inputs) == eligible:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                pd.to_pickle(stock_inputs, cache_path)
+            except Exception as e:
+                logger.warning(f"Error saving scoring inputs cache {cache_path}: {e}")
+
+        return stock_inputs
+
+    def _scoring_inputs_path(self, date: datetime, symbols: List[str]) -> Optional[Path]:
+        """スコアリング入力キャッシュのパス（形式バージョン・日付・期間・銘柄リストをキーにする）"""
+        if not self.config.input_cache_dir:
+            return None
+
+        # 履歴データは期間の開始日・終了日で取得範囲が決まるため両方をキーに含める
+        key_source = (f"v{self._SCORING_INPUTS_VERSION}|{date:%Y-%m-%d}|{self.config.start_date}|"
+                      f"{self.config.end_date}|{','.join(sorted(symbols))}")
+        key = hashlib.blake2b(key_source.encode(), digest_size=8).hexdigest()
+        return Path(self.config.input_cache_dir) / f"scoring_inputs_{date:%Y%m%d}_{key}.pkl"
+
+    def build_scoring_inputs(self, day_idx: int, universe: List[str]) -> List[Dict]:
+        """
+        指定営業日時点の価格データとテクニカル指標からスコアリング入力を作成
 
-                # 最新の価格データ
-                latest_data = historical_df.iloc[-1]
-                prev_data = historical_df.iloc[-2] if len(historical_df) > 1 else latest_data
+        Args:
+            day_idx: 営業日の位置（build_price_matrixのdaysに対応）
+            universe: 対象銘柄リスト
+
+        Returns:
+            List[Dict]: 銘柄ごとのスコアリング入力
+        """
+        stock_inputs = []
+        prices = self._prices
+        date = prices.days[day_idx]
+        rows = prices.rows[day_idx]
+        targets = set(universe)
+
+        # ループ内で参照する当日分の列・キャッシュ・メソッドを事前に束縛
+        symbols = prices.symbols
+        price_cache = self._price_cache
+        indicator_cache = self._indicator_cache
+        calculate_all_indicators = self.advanced_analyzer.calculate_all_indicators
+        close = prices.close[day_idx].tolist()
+        previous_close = prices.previous_close[day_idx].tolist()
+        open_ = prices.open_[day_idx].tolist()
+        high = prices.high[day_idx].tolist()
+        low = prices.low[day_idx].tolist()
+        volume = prices.volume[day_idx].tolist()
+        average_volume = prices.average_volume[day_idx].tolist()
+        gap_ratio = prices.gap_ratio[day_idx].tolist()
+        volume_ratio = prices.volume_ratio[day_idx].tolist()
+
+        # 最低30日分のデータがある銘柄のみ対象
+        for j in np.flatnonzero(rows >= 29).tolist():
+            symbol = symbols[j]
+            if symbol not in targets:
+                continue
+
+            try:
+                end = rows[j] + 1
+                historical_df = price_cache[symbol].iloc[:end]
+                historical_series = indicator_cache[symbol].iloc[:end]
 
                 # 株価データ準備
                 stock_data = {
                     'symbol': symbol,
                     'name': symbol.split('.')[0],
-                    'current_price': float(latest_data['Close']),
-                    'previous_close': float(prev_data['Close']),
-                    'open': float(latest_data['Open']),
-                    'high': float(latest_data['High']),
-                    'low': float(latest_data['Low']),
-                    'volume': int(latest_data['Volume']),
-                    'average_volume': float(historical_df['Volume'].tail(20).mean()),
-                    'gap_ratio': (latest_data['Open'] - prev_data['Close']) / prev_data['Close'],
-                    'volume_ratio': latest_data['Volume'] / historical_df['Volume'].tail(20).mean(),
+                    'current_price': close[j],
+                    'previous_close': previous_close[j],
+                    'open': open_[j],
+                    'high': high[j],
+                    'low': low[j],
+                    'volume': volume[j],
+                    'average_volume': average_volume[j],
+                    'gap_ratio': gap_ratio[j],
+                    'volume_ratio': volume_ratio[j],
                     'market_cap': 1000000000000,  # ダミー値
                     'is_marginable': True
                 }
 
-                # テクニカル指標計算
-                indicators = self.advanced_analyzer.calculate_all_indicators(historical_df)
+                # テクニカル指標（事前計算した系列の最終行を参照）
+                indicators = calculate_all_indicators(historical_df, historical_series)
                 stock_data['technical_indicators'] = indicators
 
-                # スコアリング
-                score_result = self.analyzer.calculate_score(stock_data)
-
-                if score_result.get('total_score', 0) > 0:
-                    result = {
-                        'symbol': symbol,
-                        'date': date,
-                        'price': stock_data['current_price'],
-                        'score': score_result['total_score'],
-                        'signals': score_result.get('signals', []),
-                        'stock_data': stock_data
-                    }
-                    results.append(result)
+                stock_inputs.append(stock_data)
 
             except Exception as e:
                 logger.warning(f"Error screening {symbol} on {date}: {e}")
                 continue
 
-        # スコア順にソート
-        results.sort(key=lambda x: x['score'], reverse=True)
-
-        return results[:self.config.max_positions * 2]  # 上位候補を返す
+        return stock_inputs
 
     def can_open_position(self) -> bool:
         """新規ポジション開設可能かチェック"""
-        return len(self.open_positions) < self.config.max_positions
+        return not self.positions.is_full()
 
     def calculate_position_size(self, price: float) -> int:
         """
@@ -247,13 +869,11 @@ class BacktestEngine:
         Returns:
             int: 株数
         """
-        max_investment = self.capital * self.config.position_size
-        shares = int(max_investment / price / 100) * 100  # 100株単位
-
-        return max(100, shares)
+        # 100株単位（1単元あたりの予算比率は__init__で事前計算）
+        return max(100, int(self.capital * self._lot_budget_factor / price) * 100)
 
     def open_position(self, symbol: str, date: datetime, price: float,
-                      signals: List[str], score: float) -> bool:
+                      signals: List[Tuple[str, Dict]], score: float) -> bool:
         """
         ポジションオープン
 
@@ -270,7 +890,8 @@ class BacktestEngine:
         if not self.can_open_position():
             return False
 
-        if symbol in self.open_positions:
+        sym_idx = self._prices.symbol_index[symbol]
+        if self.positions.slot_of(sym_idx) >= 0:
             return False
 
         shares = self.calculate_position_size(price)
@@ -285,22 +906,19 @@ class BacktestEngine:
         if position_value + commission > self.capital:
             return False
 
-        trade = Trade(
-            symbol=symbol,
-            entry_date=date,
+        self.positions.open(
+            sym_idx, date,
             entry_price=adjusted_price,
             shares=shares,
             position_value=position_value,
-            signals=signals,
+            commission=commission,
+            slippage_cost=price * shares * self.config.slippage,
             score=score,
-            commission_paid=commission,
-            slippage_cost=price * shares * self.config.slippage
+            signals=signals
         )
-
-        self.open_positions[symbol] = trade
         self.capital -= (position_value + commission)
 
-        logger.debug(f"Opened position: {symbol} @ {adjusted_price} x {shares}")
+        logger.debug("Opened position: {} @ {} x {}", symbol, adjusted_price, shares)
 
         return True
 
@@ -314,105 +932,128 @@ class BacktestEngine:
             price: エグジット価格
             reason: クローズ理由
         """
-        if symbol not in self.open_positions:
+        sym_idx = self._prices.symbol_index.get(symbol)
+        if sym_idx is None:
+            return
+
+        slot = self.positions.slot_of(sym_idx)
+        if slot < 0:
             return
 
-        trade = self.open_positions[symbol]
+        self._close_slot(slot, date, price, reason)
+
+    def _close_slot(self, slot: int, date: datetime, price: float, reason: str):
+        """
+        スロット位置を指定してポジションをクローズし、取引記録に追加
+
+        Args:
+            slot: スロット位置
+            date: エグジット日
+            price: エグジット価格
+            reason: クローズ理由
+        """
+        positions = self.positions
+        shares = int(positions.shares[slot])
+        position_value = float(positions.position_value[slot])
+        entry_commission = float(positions.commission_paid[slot])
 
         # スリッページとコミッション考慮
         adjusted_price = price * (1 - self.config.slippage)
-        exit_value = adjusted_price * trade.shares
+        exit_value = adjusted_price * shares
         commission = exit_value * self.config.commission
+        pnl = exit_value - position_value - commission - entry_commission
 
-        trade.exit_date = date
-        trade.exit_price = adjusted_price
-        trade.pnl = exit_value - trade.position_value - commission - trade.commission_paid
-        trade.pnl_percentage = trade.pnl / trade.position_value * 100
-        trade.exit_reason = reason
-        trade.commission_paid += commission
-        trade.slippage_cost += price * trade.shares * self.config.slippage
+        trade = Trade(
+            symbol=self._prices.symbols[positions.sym_idx[slot]],
+            entry_date=pd.Timestamp(positions.entry_date[slot]).to_pydatetime(),
+            exit_date=date,
+            entry_price=float(positions.entry_price[slot]),
+            exit_price=adjusted_price,
+            shares=shares,
+            position_value=position_value,
+            pnl=pnl,
+            pnl_percentage=pnl / position_value * 100,
+            exit_reason=reason,
+            signals=positions.signals[slot],
+            score=float(positions.score[slot]),
+            commission_paid=entry_commission + commission,
+            slippage_cost=float(positions.slippage_cost[slot]) + price * shares * self.config.slippage
+        )
 
         self.capital += (exit_value - commission)
         self.trades.append(trade)
+        positions.release(slot)
+
+        logger.debug("Closed position: {} @ {}, PnL: {:.0f}", trade.symbol, adjusted_price, trade.pnl)
 
-        del self.open_positions[symbol]
+    def _reset_equity(self, n_days: int):
+        """
+        日次エクイティの記録領域を確保
 
-        logger.debug(f"Closed position: {symbol} @ {adjusted_price}, PnL: {trade.pnl:.0f}")
+        Args:
+            n_days: 営業日数
+        """
+        self._equity_cash = np.zeros(n_days, dtype=np.float64)
+        self._equity_total = np.zeros(n_days, dtype=np.float64)
+        self._equity_open = np.zeros(n_days, dtype=np.int8)
+        self._equity_recorded = np.zeros(n_days, dtype=bool)  # 処理中にエラーとなった日はFalse
 
-    def process_day(self, date: datetime, universe: List[str]):
+    def process_day(self, day_idx: int, universe: List[str]):
         """
         1日分の処理
 
         Args:
-            date: 処理日
+            day_idx: 営業日の位置（build_price_matrixのdaysに対応）
             universe: 対象銘柄リスト
         """
-        try:
-            # 既存ポジションの管理
-            positions_to_close = []
-
-            for symbol, trade in self.open_positions.items():
-                df = self.get_historical_data(symbol)
-                if df is None:
-                    continue
-
-                current_data = df[df.index <= date]
-                if current_data.empty:
-                    continue
-
-                current_price = float(current_data.iloc[-1]['Close'])
-                days_held = (date - trade.entry_date).days
-
-                # 利確/損切りチェック
-                if trade.entry_price > 0:
-                    return_pct = (current_price - trade.entry_price) / trade.entry_price
-
-                    if return_pct >= self.config.take_profit:
-                        positions_to_close.append((symbol, current_price, 'take_profit'))
-                    elif return_pct <= -self.config.stop_loss:
-                        positions_to_close.append((symbol, current_price, 'stop_loss'))
-                    elif days_held >= self.config.holding_period_limit:
-                        positions_to_close.append((symbol, current_price, 'time_limit'))
+        date = self._prices.dates[day_idx]
+        closes = self._prices.close[day_idx]
+        positions = self.positions
 
-            # ポジションクローズ
-            for symbol, price, reason in positions_to_close:
-                self.close_position(symbol, date, price, reason)
+        try:
+            # 既存ポジションの管理（利確/損切り/保有期限の判定はカーネルで一括実行）
+            slots = positions.active_slots()
+            if len(slots):
+                current_prices = closes[positions.sym_idx[slots]]
+                days_held = (np.datetime64(date, 'ns') - positions.entry_date[slots]).astype('timedelta64[D]')
+                exit_codes = kernels.exit_kernel(
+                    positions.entry_price[slots],
+                    current_prices,
+                    days_held.astype(np.int64),
+                    self.config.take_profit,
+                    self.config.stop_loss,
+                    self.config.holding_period_limit
+                )
+
+                # ポジションクローズ
+                for i in np.flatnonzero(exit_codes):
+                    self._close_slot(slots[i], date, float(current_prices[i]),
+                                     kernels.EXIT_REASONS[exit_codes[i]])
 
             # 新規エントリー検討
             if self.can_open_position():
-                screening_results = self.screen_stocks(date, universe)
+                screening_results = self.screen_stocks(day_idx, universe)
 
                 for result in screening_results:
                     if not self.can_open_position():
                         break
 
-                    symbol = result['symbol']
-                    if symbol in self.open_positions:
-                        continue
-
-                    # エントリー条件チェック
+                    # エントリー条件チェック（保有中の銘柄はopen_positionで除外）
                     if result['score'] >= 70:  # スコア閾値
                         self.open_position(
-                            symbol, date, result['price'],
+                            result['symbol'], date, result['price'],
                             result['signals'], result['score']
                         )
 
             # 日次エクイティ記録
-            total_value = self.capital
-            for trade in self.open_positions.values():
-                df = self.get_historical_data(trade.symbol)
-                if df is not None:
-                    current_data = df[df.index <= date]
-                    if not current_data.empty:
-                        current_price = float(current_data.iloc[-1]['Close'])
-                        total_value += current_price * trade.shares
-
-            self.daily_equity.append({
-                'date': date,
-                'cash': self.capital,
-                'total_value': total_value,
-                'open_positions': len(self.open_positions)
-            })
+            slots = positions.active_slots()
+            values = closes[positions.sym_idx[slots]] * positions.shares[slots]
+            total_value = self.capital + float(values[~np.isnan(values)].sum())
+
+            self._equity_cash[day_idx] = self.capital
+            self._equity_total[day_idx] = total_value
+            self._equity_open[day_idx] = len(slots)
+            self._equity_recorded[day_idx] = True
 
         except Exception as e:
             logger.error(f"Error processing day {date}: {e}")
@@ -433,29 +1074,30 @@ class BacktestEngine:
         self.setup(app_config)
 
         # 日付範囲生成
-        start_date = datetime.strptime(self.config.start_date, '%Y-%m-%d')
-        end_date = datetime.strptime(self.config.end_date, '%Y-%m-%d')
+        start_date = self.config.start_dt
+        end_date = self.config.end_dt
 
         universe = self.get_universe()
+        self.prefetch_historical_data(universe)
+        self.precompute_indicators()
 
-        # 営業日リストを生成
-        business_days = pd.bdate_range(start=start_date, end=end_date)
+        # 取引日リストを生成し、営業日×銘柄の行列を作成
+        business_days = self.get_trading_days(start_date, end_date)
+        self.build_price_matrix(business_days)
+        self._reset_equity(len(business_days))
 
-        # 日次処理
+        # 日次処理（銘柄方向は行列で処理し、日付方向のみループ）
         for i, date in enumerate(business_days):
             if i % 20 == 0:
                 logger.info(f"Processing {date.strftime('%Y-%m-%d')} ({i+1}/{len(business_days)})")
 
-            self.process_day(date.to_pydatetime(), universe)
+            self.process_day(i, universe)
 
         # 残りポジションをクローズ
-        for symbol, trade in list(self.open_positions.items()):
-            df = self.get_historical_data(symbol)
-            if df is not None:
-                final_data = df[df.index <= end_date]
-                if not final_data.empty:
-                    final_price = float(final_data.iloc[-1]['Close'])
-                    self.close_position(symbol, end_date, final_price, 'backtest_end')
+        for slot in self.positions.active_slots():
+            final_price = self.close_at(self._prices.symbols[self.positions.sym_idx[slot]], end_date)
+            if final_price is not None:
+                self._close_slot(slot, end_date, final_price, 'backtest_end')
 
         # 結果計算
         result = self.calculate_results()
@@ -476,13 +1118,20 @@ class BacktestEngine:
 
         # 基本統計
         result.trades = self.trades
-        result.start_date = datetime.strptime(self.config.start_date, '%Y-%m-%d')
-        result.end_date = datetime.strptime(self.config.end_date, '%Y-%m-%d')
+        result.start_date = self.config.start_dt
+        result.end_date = self.config.end_dt
         result.initial_capital = self.config.initial_capital
         result.final_capital = self.capital
 
-        # Daily equity DataFrame
-        result.daily_equity = pd.DataFrame(self.daily_equity)
+        # Daily equity DataFrame（処理できた日のみ）
+        recorded = self._equity_recorded
+        dates = self._prices.days.values if self._prices is not None else np.empty(0, dtype='datetime64[ns]')
+        result.daily_equity = pd.DataFrame({
+            'date': dates[recorded],
+            'cash': self._equity_cash[recorded],
+            'total_value': self._equity_total[recorded],
+            'open_positions': self._equity_open[recorded]
+        })
 
         if result.daily_equity.empty:
             return result
@@ -495,48 +1144,135 @@ class BacktestEngine:
         if days > 0:
             result.annualized_return = ((result.final_capital / result.initial_capital) ** (365.25 / days) - 1) * 100
 
+        equity = result.daily_equity['total_value'].to_numpy(dtype=np.float64)
+
         # ボラティリティとシャープレシオ
-        if len(result.daily_equity) > 1:
-            daily_returns = result.daily_equity['total_value'].pct_change().dropna()
-            if len(daily_returns) > 1:
-                result.volatility = daily_returns.std() * np.sqrt(252) * 100
-                if result.volatility > 0:
-                    result.sharpe_ratio = result.annualized_return / result.volatility
+        if len(equity) > 2:
+            daily_returns = np.diff(equity) / equity[:-1]
+            result.volatility = float(daily_returns.std(ddof=1) * np.sqrt(252) * 100)
+            if result.volatility > 0:
+                result.sharpe_ratio = result.annualized_return / result.volatility
 
         # 最大ドローダウン
-        if len(result.daily_equity) > 0:
-            equity_curve = result.daily_equity['total_value']
-            running_max = equity_curve.expanding().max()
-            drawdown = (equity_curve - running_max) / running_max
-            result.max_drawdown = drawdown.min() * 100
+        running_max = np.maximum.accumulate(equity)
+        result.max_drawdown = float(((equity - running_max) / running_max).min() * 100)
 
         # トレード統計
         if result.trades:
-            result.total_trades = len(result.trades)
-            winning_trades = [t for t in result.trades if t.pnl > 0]
-            losing_trades = [t for t in result.trades if t.pnl < 0]
+            pnl = result.trades.column('pnl')
+            wins = pnl[pnl > 0]
+            losses = pnl[pnl < 0]
 
-            result.winning_trades = len(winning_trades)
-            result.losing_trades = len(losing_trades)
+            result.total_trades = len(pnl)
+            result.winning_trades = len(wins)
+            result.losing_trades = len(losses)
             result.win_rate = result.winning_trades / result.total_trades * 100
 
-            if winning_trades:
-                result.avg_win = np.mean([t.pnl for t in winning_trades])
-                result.max_win = max([t.pnl for t in winning_trades])
+            if len(wins):
+                result.avg_win = float(wins.mean())
+                result.max_win = float(wins.max())
 
-            if losing_trades:
-                result.avg_loss = np.mean([t.pnl for t in losing_trades])
-                result.max_loss = min([t.pnl for t in losing_trades])
+            if len(losses):
+                result.avg_loss = float(losses.mean())
+                result.max_loss = float(losses.min())
 
             # プロフィットファクター
-            total_wins = sum([t.pnl for t in winning_trades])
-            total_losses = abs(sum([t.pnl for t in losing_trades]))
+            total_wins = float(wins.sum())
+            total_losses = abs(float(losses.sum()))
             if total_losses > 0:
                 result.profit_factor = total_wins / total_losses
 
         return result
 
 
+def _rolling_mean(values: pd.Series, window: int) -> pd.Series:
+    """
+    移動平均（期間不足の先頭行は利用可能な行数で平均）
+
+    bottleneckがインストールされている場合はmove_meanで計算する
+
+    Args:
+        values: 対象系列
+        window: 期間
+
+    Returns:
+        Series: 移動平均
+    """
+    if BOTTLENECK_AVAILABLE:
+        return pd.Series(bn.move_mean(values.to_numpy(dtype=np.float64), window=window, min_count=1),
+                         index=values.index)
+    return values.rolling(window, min_periods=1).mean()
+
+
+def _compute_indicator_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    1銘柄分の指標系列とスコアリング用の派生列を計算
+
+    ワーカープロセスから呼び出せるようモジュールレベルに定義する
+
+    Args:
+        df: OHLCV DataFrame
+
+    Returns:
+        DataFrame: 指標系列（volume_sma_20, prev_close, gap_ratioを含む）
+    """
+    series = AdvancedTechnicalAnalyzer().calculate_indicator_series(df)
+    prev_close = df['Close'].shift(1)
+    return series.assign(
+        volume_sma_20=_rolling_mean(df['Volume'], 20),
+        prev_close=prev_close,
+        gap_ratio=(df['Open'] - prev_close) / prev_close
+    )
+
+
+def _compute_indicator_frames_grouped(price_data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    全銘柄の指標系列とスコアリング用の派生列を縦持ちのDataFrameでまとめて計算
+
+    結果は銘柄ごとに_compute_indicator_frameと同じ形式
+
+    Args:
+        price_data: 銘柄コード -> OHLCV DataFrame
+
+    Returns:
+        dict: 銘柄コード -> 指標系列
+    """
+    if not price_data:
+        return {}
+
+    combined = pd.concat([df.assign(Symbol=symbol) for symbol, df in price_data.items()])
+    keys = combined['Symbol']
+    series = AdvancedTechnicalAnalyzer().calculate_indicator_series_grouped(combined)
+    prev_close = combined['Close'].groupby(keys, sort=False).shift(1)
+    series = series.assign(
+        volume_sma_20=combined['Volume'].groupby(keys, sort=False).transform(lambda x: _rolling_mean(x, 20)),
+        prev_close=prev_close,
+        gap_ratio=(combined['Open'] - prev_close) / prev_close
+    )
+
+    return {symbol: series.iloc[positions]
+            for symbol, positions in combined.groupby(keys, sort=False).indices.items()}
+
+
+def _write_csv(columns: Dict[str, np.ndarray], path: Path):
+    """
+    列データをBOM付きUTF-8のCSVに書き出し
+
+    polarsがインストールされている場合はpolarsのCSVライターで書き出す
+
+    Args:
+        columns: 列名と値
+        path: 出力ファイルパス
+    """
+    if POLARS_AVAILABLE:
+        # object配列（文字列）はpolarsのObject型にならないようリストで渡す
+        data = {name: list(values) if getattr(values, 'dtype', object) == object else values
+                for name, values in columns.items()}
+        pl.DataFrame(data).write_csv(path, include_bom=True, datetime_format='%Y-%m-%d')
+    else:
+        pd.DataFrame(columns).to_csv(path, index=False, encoding='utf-8-sig')
+
+
 class BacktestReporter:
     """バックテスト結果レポート生成"""
 
@@ -618,31 +1354,18 @@ class BacktestReporter:
 
         # トレードリスト
         if self.result.trades:
-            trades_df = pd.DataFrame([
-                {
-                    'symbol': t.symbol,
-                    'entry_date': t.entry_date,
-                    'exit_date': t.exit_date,
-                    'entry_price': t.entry_price,
-                    'exit_price': t.exit_price,
-                    'shares': t.shares,
-                    'pnl': t.pnl,
-                    'pnl_percentage': t.pnl_percentage,
-                    'exit_reason': t.exit_reason,
-                    'score': t.score,
-                    'signals': ', '.join(t.signals)
-                }
-                for t in self.result.trades
-            ])
+            columns = self.result.trades.to_columns()
+            columns['signals'] = [', '.join(format_signals(signals)) for signals in columns['signals']]
 
             trades_file = output_path / f"trades_{timestamp}.csv"
-            trades_df.to_csv(trades_file, index=False, encoding='utf-8-sig')
+            _write_csv(columns, trades_file)
             logger.info(f"Trades saved to {trades_file}")
 
         # エクイティカーブ
         if not self.result.daily_equity.empty:
             equity_file = output_path / f"equity_curve_{timestamp}.csv"
-            self.result.daily_equity.to_csv(equity_file, index=False, encoding='utf-8-sig')
+            daily_equity = self.result.daily_equity
+            _write_csv({name: daily_equity[name].to_numpy() for name in daily_equity.columns}, equity_file)
             logger.info(f"Equity curve saved to {equity_file}")
 
             # エクイティカーブ図
@@ -675,8 +1398,8 @@ class BacktestReporter:
 
         # ドローダウン
         plt.subplot(2, 1, 2)
-        equity = self.result.daily_equity['total_value']
-        running_max = equity.expanding().max()
+        equity = self.result.daily_equity['total_value'].to_numpy(dtype=np.float64)
+        running_max = np.maximum.accumulate(equity)
         drawdown = (equity - running_max) / running_max * 100
 
         plt.fill_between(self.result.daily_equity['date'], drawdown, 0, alpha=0.3, color='red')
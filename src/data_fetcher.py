@@ -11,20 +11,104 @@
 import pandas as pd
 import yfinance as yf
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import feedparser
+import random
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 from loguru import logger
 import numpy as np
-import ta
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:  # pyahocorasickは任意依存
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:  # diskcacheは任意依存（未導入時はメモリキャッシュのみ）
+    DISKCACHE_AVAILABLE = False
+
+# キャッシュにデータがないことを表す番兵（Noneや空のデータもキャッシュできるようにする）
+_CACHE_MISS = object()
+
+
+class RateLimiter:
+    """
+    トークンバケット方式のレートリミッター（スレッドセーフ）
+
+    秒間rate回までのリクエストを許可し、最大burst回までの連続リクエストを許容する
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = max(float(rate), 1e-6)
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """トークンを1つ取得（不足している場合は補充されるまで待機）"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class NewsItem:
+    """ニュース記事"""
+    # dataclassのslots指定はPython 3.10以降のため手動で宣言する（全フィールドがデフォルト値なし）
+    __slots__ = ('title', 'url', 'datetime', 'symbol', 'category', 'sentiment')
+
+    title: str
+    url: str
+    datetime: datetime
+    symbol: str
+    category: str
+    sentiment: str
 
 
 class DataFetcher:
     """データ取得クラス"""
 
+    # ニュース感情分析のキーワード
+    _POSITIVE_KEYWORDS = ('増益', '上方修正', '好調', '拡大', '成長', '回復')
+    _NEGATIVE_KEYWORDS = ('減益', '下方修正', '不調', '縮小', '悪化', '低迷')
+
+    # ニュースカテゴリのキーワード（先頭ほど優先）
+    _CATEGORY_KEYWORDS = (('決算', '決算'), ('修正', '業績修正'))
+
+    # レート制限（HTTP 429）時の再試行回数と待機時間の上限（秒）
+    _RATE_LIMIT_RETRIES = 3
+    _RATE_LIMIT_MAX_BACKOFF = 60
+
+    # 銘柄リストの期限切れ後も、TTLのこの倍率までは古いデータを返しつつ裏で更新する
+    _STOCK_LIST_GRACE = 1.2
+
+    # フィードごとに解析済みとして保持する記事数の上限
+    _RSS_SEEN_MAX = 256
+
+    # 期限切れキャッシュの一括削除を行う間隔（秒）
+    _CACHE_SWEEP_INTERVAL = 60
+
     def __init__(self, config: Dict):
         """
         初期化
@@ -36,16 +120,73 @@ class DataFetcher:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-
-        # キャッシュ設定
-        self.cache = {}
+        # keep-aliveで接続を再利用し、一時的なエラーはバックオフ付きで再試行
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Yahoo Financeへの同時リクエスト数（ホストあたりの並列度の上限）
+        yahoo_config = config.get('data_sources', {}).get('yahoo_finance', {})
+        self._max_workers = max(1, yahoo_config.get('max_workers', 10))
+        # 並列ワーカー全体で共有する秒間リクエスト数の上限
+        self.limiter = RateLimiter(yahoo_config.get('requests_per_second', 5))
+        # 日数指定の価格履歴はこの日数以上をまとめて取得し、短い期間は末尾を切り出して共有
+        self._price_history_days = 30
+
+        # RSSフィードごとの条件付きGET用の状態（ETag、Last-Modified、記事）
+        self._rss_state: Dict[str, Dict] = {}
+
+        # 銘柄リストのバックグラウンド更新（同時に1スレッドまで）
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        # 感情分析用のキーワードオートマトン（全キーワードをテキストの1回の走査で検出）
+        self._sentiment_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._sentiment_automaton = ahocorasick.Automaton()
+            for polarity, keywords in ((1, self._POSITIVE_KEYWORDS), (-1, self._NEGATIVE_KEYWORDS)):
+                for keyword in keywords:
+                    self._sentiment_automaton.add_word(keyword, (polarity, keyword))
+            self._sentiment_automaton.make_automaton()
+
+        # オートマトン未使用時の感情分析、およびカテゴリ分類用の正規表現
+        self._positive_re = re.compile('|'.join(map(re.escape, self._POSITIVE_KEYWORDS)))
+        self._negative_re = re.compile('|'.join(map(re.escape, self._NEGATIVE_KEYWORDS)))
+        self._category_re = re.compile('|'.join(re.escape(k) for k, _ in self._CATEGORY_KEYWORDS))
+
+        # キャッシュ設定（LRU、上限件数を超えたら最も古く参照されたものから削除）
+        self.cache = OrderedDict()
+        # 並列ワーカーやバックグラウンド更新スレッドから参照されるため、キャッシュ操作はこのロックで保護
+        self._cache_lock = threading.RLock()
+        self.cache_max = config.get('cache_max_items', 512)
+        self._next_sweep = time.monotonic() + self._CACHE_SWEEP_INTERVAL
         self.cache_ttl = {
             'stock_list': 86400,      # 24時間
             'price_data': 300,        # 5分
+            'price_frame': 120,       # 2分（価格履歴のDataFrame）
             'news_data': 1800,        # 30分
             'sector_data': 3600       # 1時間
         }
 
+        # キャッシュキーの接頭辞とTTL種別の対応（長い接頭辞を優先）
+        self._ttl_prefixes = sorted([
+            ('stock_list', 'stock_list'),
+            ('price_data_', 'price_data'),
+            ('price_frame_', 'price_frame'),
+            ('news_', 'news_data'),
+            ('sector_', 'sector_data')
+        ], key=lambda item: -len(item[0]))
+
+        # 再起動後も再利用できるディスクキャッシュ（メモリキャッシュのミス時に参照）
+        self.disk = None
+        cache_dir = config.get('cache_dir', 'data/cache/datafetcher')
+        if DISKCACHE_AVAILABLE and cache_dir:
+            try:
+                self.disk = diskcache.Cache(cache_dir)
+            except Exception as e:
+                logger.warning(f"Disk cache unavailable, using memory cache only: {e}")
+
     def fetch_stock_list(self) -> pd.DataFrame:
         """
         取引可能な全銘柄リストを取得
@@ -55,10 +196,39 @@ class DataFetcher:
         """
         cache_key = 'stock_list'
 
+        # 期限切れ直後の猶予期間内は古いリストを返し、更新はバックグラウンドで実行
+        with self._cache_lock:
+            cache_entry = self.cache.get(cache_key)
+        if cache_entry is not None:
+            if cache_entry['expires'] <= time.monotonic() < cache_entry['retain_until']:
+                logger.info("Using stale stock list while refreshing in background")
+                self._schedule_stock_list_refresh()
+                return cache_entry['data']
+
         # キャッシュチェック
-        if self._is_cache_valid(cache_key):
+        cached = self._cache_get(cache_key)
+        if cached is not _CACHE_MISS:
             logger.info("Using cached stock list")
-            return self.cache[cache_key]['data']
+            return cached
+
+        return self._refresh_stock_list()
+
+    def _schedule_stock_list_refresh(self):
+        """銘柄リストの更新をデーモンスレッドで開始（実行中の場合は何もしない）"""
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_stock_list, daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_stock_list(self) -> pd.DataFrame:
+        """
+        データソースから銘柄リストを取得してキャッシュを更新
+
+        Returns:
+            DataFrame: columns=['symbol', 'name', 'market', 'market_cap', 'is_marginable']
+        """
+        cache_key = 'stock_list'
 
         try:
             logger.info("Fetching stock list from data source")
@@ -84,16 +254,11 @@ class DataFetcher:
 
             df = pd.DataFrame(sample_stocks)
 
-            # 時価総額情報を追加取得
-            for idx, row in df.iterrows():
-                try:
-                    ticker = yf.Ticker(row['symbol'])
-                    info = ticker.info
-                    df.at[idx, 'market_cap'] = info.get('marketCap', 0)
-                    time.sleep(0.1)  # レート制限対策
-                except Exception as e:
-                    logger.warning(f"Failed to get market cap for {row['symbol']}: {e}")
-                    df.at[idx, 'market_cap'] = 0
+            # 時価総額情報を追加取得（I/O待ちが支配的なためスレッド並列で取得）
+            max_workers = min(self._max_workers, len(df))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                caps = list(executor.map(self._fetch_market_cap, df['symbol']))
+            df['market_cap'] = np.array(caps, dtype=np.int64)
 
             # キャッシュに保存
             self._cache_data(cache_key, df)
@@ -105,13 +270,63 @@ class DataFetcher:
             logger.error(f"Error fetching stock list: {e}")
             return pd.DataFrame()
 
-    def fetch_price_data(self, symbol: str, period: str = "5d") -> Dict:
+    def _fetch_market_cap(self, symbol: str) -> int:
+        """
+        時価総額を取得（ワーカースレッドから呼び出される）
+
+        Args:
+            symbol: 銘柄コード
+
+        Returns:
+            int: 時価総額（取得失敗時は0）
+        """
+        for attempt in range(self._RATE_LIMIT_RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                return int(yf.Ticker(symbol, session=self.session).info.get('marketCap') or 0)
+            except Exception as e:
+                if self._is_rate_limited(e) and attempt < self._RATE_LIMIT_RETRIES:
+                    backoff = min(self._RATE_LIMIT_MAX_BACKOFF, 2 ** attempt + random.random())
+                    logger.warning("Rate limited fetching market cap for {}, retrying in {:.1f}s", symbol, backoff)
+                    time.sleep(backoff)
+                    continue
+                logger.warning("Failed to get market cap for {}: {}", symbol, e)
+                return 0
+        return 0
+
+    @staticmethod
+    def _is_rate_limited(error: Exception) -> bool:
+        """例外がYahoo Financeのレート制限（HTTP 429）によるものか判定"""
+        rate_limit_error = getattr(getattr(yf, 'exceptions', None), 'YFRateLimitError', None)
+        if rate_limit_error is not None and isinstance(error, rate_limit_error):
+            return True
+        message = str(error)
+        return '429' in message or 'Too Many Requests' in message
+
+    def get_marginable_symbols(self) -> List[str]:
+        """
+        貸借銘柄（信用取引可能）の銘柄コード一覧を取得
+
+        Returns:
+            list: 銘柄コードのリスト
+        """
+        stock_list = self.fetch_stock_list()
+
+        if stock_list.empty or 'is_marginable' not in stock_list.columns:
+            return []
+
+        return stock_list.loc[stock_list['is_marginable'].fillna(False).astype(bool), 'symbol'].tolist()
+
+    def fetch_price_data(self, symbol: str, period: str = "5d", include_frame: bool = False) -> Dict:
         """
         個別銘柄の株価データ取得
 
+        キャッシュには集計値のみを保存し、価格履歴のDataFrameは別キーで短期間だけ保持する
+
         Args:
             symbol: 銘柄コード（例: "7203.T"）
             period: 取得期間
+            include_frame: Trueの場合は価格履歴のDataFrameを'price_data'キーに含める
 
         Returns:
             dict: 価格データと計算された指標
@@ -119,55 +334,190 @@ class DataFetcher:
         cache_key = f'price_data_{symbol}_{period}'
 
         # キャッシュチェック
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]['data']
+        if not include_frame:
+            cached = self._cache_get(cache_key)
+            if cached is not _CACHE_MISS:
+                return cached
 
         try:
-            logger.debug(f"Fetching price data for {symbol}")
+            hist = self._fetch_price_history(symbol, period)
+
+            if hist.empty:
+                logger.warning("No price data found for {}", symbol)
+                return {}
+
+            result = self._build_price_result(hist)
+
+            # キャッシュに保存
+            self._cache_data(cache_key, result)
 
-            ticker = yf.Ticker(symbol)
+            return dict(result, price_data=hist) if include_frame else result
+
+        except Exception as e:
+            logger.error("Error fetching price data for {}: {}", symbol, e)
+            return {}
+
+    def _fetch_price_history(self, symbol: str, period: str) -> pd.DataFrame:
+        """
+        価格履歴を取得
+
+        テクニカル指標と共有できる期間分をまとめて取得・キャッシュし、要求された日数分を切り出す
+
+        Args:
+            symbol: 銘柄コード
+            period: 要求された取得期間
+
+        Returns:
+            DataFrame: 価格履歴（OHLCV）
+        """
+        fetch_period, days = self._history_period(period)
+        frame_key = f'price_frame_{symbol}_{fetch_period}'
 
-            # 過去5日分のデータを取得
-            hist = ticker.history(period=period)
+        hist = self._cache_get(frame_key)
+        if hist is _CACHE_MISS:
+            logger.debug("Fetching price data for {}", symbol)
 
+            self.limiter.acquire()
+            hist = yf.Ticker(symbol, session=self.session).history(period=fetch_period)
             if hist.empty:
-                logger.warning(f"No price data found for {symbol}")
-                return {}
+                return hist
 
-            # 現在の価格情報
-            current_data = hist.iloc[-1]
-            previous_data = hist.iloc[-2] if len(hist) > 1 else current_data
+            self._cache_data(frame_key, hist)
 
-            # 平均出来高計算（過去5日間）
-            average_volume = hist['Volume'].mean()
+        return hist if days is None else hist.tail(days)
 
-            # ギャップ率計算
-            gap_ratio = (current_data['Open'] - previous_data['Close']) / previous_data['Close']
+    def _history_period(self, period: str) -> tuple:
+        """
+        実際に取得する期間を決定
 
-            # 出来高比率計算
-            volume_ratio = current_data['Volume'] / average_volume if average_volume > 0 else 1
+        日数指定（例: "5d"）の期間は共有キャッシュ用の最小日数まで広げる
 
-            result = {
-                'current_price': float(current_data['Close']),
-                'previous_close': float(previous_data['Close']),
-                'open': float(current_data['Open']),
-                'high': float(current_data['High']),
-                'low': float(current_data['Low']),
-                'volume': int(current_data['Volume']),
-                'average_volume': float(average_volume),
-                'gap_ratio': float(gap_ratio),
-                'volume_ratio': float(volume_ratio),
-                'price_data': hist
-            }
+        Args:
+            period: 要求された取得期間
 
-            # キャッシュに保存
-            self._cache_data(cache_key, result)
+        Returns:
+            tuple: (取得期間, 切り出す日数（日数指定でない場合はNone）)
+        """
+        match = re.fullmatch(r'(\d+)d', period)
+        if match is None:
+            return period, None
 
-            return result
+        days = int(match.group(1))
+        return f'{max(days, self._price_history_days)}d', days
+
+    def _build_price_result(self, hist: pd.DataFrame) -> Dict:
+        """
+        価格履歴から株価データの辞書を作成
+
+        Args:
+            hist: 価格履歴（OHLCV）
+
+        Returns:
+            dict: 価格データの集計値
+        """
+        # 列ごとにNumPy配列として一度だけ取り出して計算
+        close = hist['Close'].to_numpy(dtype=np.float64)
+        open_ = hist['Open'].to_numpy(dtype=np.float64)
+        volume = hist['Volume'].to_numpy(dtype=np.float64)
+
+        # 前日終値（1日分しかない場合は当日の値）
+        previous_close = close[-2] if len(close) > 1 else close[-1]
+
+        # 平均出来高計算（対象期間全体、欠損値は除外）
+        valid_volume = volume[~np.isnan(volume)]
+        average_volume = valid_volume.mean() if valid_volume.size else np.nan
+
+        # ギャップ率計算
+        gap_ratio = (open_[-1] - previous_close) / previous_close
+
+        # 出来高比率計算
+        volume_ratio = volume[-1] / average_volume if average_volume > 0 else 1
+
+        result = {
+            'current_price': float(close[-1]),
+            'previous_close': float(previous_close),
+            'open': float(open_[-1]),
+            'high': float(hist['High'].iat[-1]),
+            'low': float(hist['Low'].iat[-1]),
+            'volume': int(volume[-1]),
+            'average_volume': float(average_volume),
+            'gap_ratio': float(gap_ratio),
+            'volume_ratio': float(volume_ratio)
+        }
+
+        return result
+
+    def fetch_price_data_bulk(self, symbols: List[str], period: str = "5d") -> Dict[str, Dict]:
+        """
+        複数銘柄の株価データを一括取得
+
+        キャッシュにない銘柄のみyf.downloadの1回のバッチ取得（yfinance内部でスレッド並列）で取得し、
+        銘柄ごとにキャッシュへ保存する
+
+        Args:
+            symbols: 銘柄コードのリスト
+            period: 取得期間
+
+        Returns:
+            dict: 銘柄コードをキーとした価格データ（取得できた銘柄のみ）
+        """
+        results = {}
+        missing = []
+        fetch_period, days = self._history_period(period)
+
+        for symbol in symbols:
+            cache_key = f'price_data_{symbol}_{period}'
+            cached = self._cache_get(cache_key)
+            if cached is not _CACHE_MISS:
+                results[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        if not missing:
+            return results
+
+        try:
+            logger.debug("Bulk fetching price data for {} symbols", len(missing))
+
+            # Ticker.historyと同じ調整後価格を使用
+            self.limiter.acquire()
+            data = yf.download(missing, period=fetch_period, group_by='ticker', threads=True,
+                               progress=False, auto_adjust=True, session=self.session)
 
         except Exception as e:
-            logger.error(f"Error fetching price data for {symbol}: {e}")
-            return {}
+            logger.error(f"Error bulk fetching price data: {e}")
+            return results
+
+        if data is None or data.empty:
+            logger.warning("No price data found in bulk fetch")
+            return results
+
+        for symbol in missing:
+            try:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    hist = data[symbol]
+                elif len(missing) == 1:
+                    hist = data
+                else:
+                    continue
+
+                hist = hist.dropna(how='all')
+                if hist.empty:
+                    logger.warning("No price data found for {}", symbol)
+                    continue
+
+                self._cache_data(f'price_frame_{symbol}_{fetch_period}', hist)
+
+                result = self._build_price_result(hist if days is None else hist.tail(days))
+                self._cache_data(f'price_data_{symbol}_{period}', result)
+                results[symbol] = result
+
+            except Exception as e:
+                logger.error("Error processing bulk price data for {}: {}", symbol, e)
+
+        return results
 
     def fetch_technical_indicators(self, symbol: str) -> Dict:
         """
@@ -178,7 +528,7 @@ class DataFetcher:
         """
         try:
             # 価格データを取得
-            price_data = self.fetch_price_data(symbol, period="30d")
+            price_data = self.fetch_price_data(symbol, period="30d", include_frame=True)
 
             if not price_data or 'price_data' not in price_data:
                 return {}
@@ -186,14 +536,15 @@ class DataFetcher:
             df = price_data['price_data']
 
             if len(df) < 25:  # 最低25日分のデータが必要
-                logger.warning(f"Insufficient data for technical indicators: {symbol}")
+                logger.warning("Insufficient data for technical indicators: {}", symbol)
                 return {}
 
-            # 移動平均線計算
-            sma_5 = ta.trend.sma_indicator(df['Close'], window=5).iloc[-1]
-            sma_25 = ta.trend.sma_indicator(df['Close'], window=25).iloc[-1]
+            # 移動平均線計算（最終値のみ必要なため末尾の期間分だけ平均）
+            close = df['Close'].to_numpy(dtype=np.float64)
+            sma_5 = close[-5:].mean()
+            sma_25 = close[-25:].mean()
 
-            current_price = df['Close'].iloc[-1]
+            current_price = close[-1]
 
             # 移動平均線からの乖離率
             position_vs_sma5 = (current_price - sma_5) / sma_5 if sma_5 > 0 else 0
@@ -201,8 +552,8 @@ class DataFetcher:
 
             # レジスタンス・サポートレベル（過去20日間の高値・安値）
             recent_data = df.tail(20)
-            resistance_levels = recent_data['High'].nlargest(3).tolist()
-            support_levels = recent_data['Low'].nsmallest(3).tolist()
+            resistance_levels = self._extreme_levels(recent_data['High'], largest=True)
+            support_levels = self._extreme_levels(recent_data['Low'], largest=False)
 
             # ローソク足パターン分析
             candlestick_pattern = self._analyze_candlestick_pattern(df.tail(5))
@@ -213,6 +564,7 @@ class DataFetcher:
                 'position_vs_sma5': float(position_vs_sma5),
                 'position_vs_sma25': float(position_vs_sma25),
                 'resistance_levels': [float(x) for x in resistance_levels],
+                'min_resistance': float(min(resistance_levels)) if resistance_levels else None,
                 'support_levels': [float(x) for x in support_levels],
                 'candlestick_pattern': candlestick_pattern
             }
@@ -220,10 +572,35 @@ class DataFetcher:
             return result
 
         except Exception as e:
-            logger.error(f"Error calculating technical indicators for {symbol}: {e}")
+            logger.error("Error calculating technical indicators for {}: {}", symbol, e)
             return {}
 
-    def fetch_news(self, symbol: str = None) -> List[Dict]:
+    def _extreme_levels(self, values: pd.Series, largest: bool, n: int = 3) -> List[float]:
+        """
+        上位（下位）n件の値を取得（全件ソートせずnp.partitionで選択）
+
+        Args:
+            values: 対象系列
+            largest: Trueで大きい順、Falseで小さい順
+            n: 件数
+
+        Returns:
+            list: 値のリスト（nlargest / nsmallestと同じ並び順）
+        """
+        array = values.to_numpy(dtype=np.float64)
+        array = array[~np.isnan(array)]
+        n = min(n, len(array))
+        if n == 0:
+            return []
+
+        if largest:
+            selected = np.sort(np.partition(array, len(array) - n)[len(array) - n:])[::-1]
+        else:
+            selected = np.sort(np.partition(array, n - 1)[:n])
+
+        return selected.tolist()
+
+    def fetch_news(self, symbol: str = None) -> List[NewsItem]:
         """
         ニュース取得（株探）
 
@@ -236,36 +613,20 @@ class DataFetcher:
         cache_key = f'news_{symbol or "general"}'
 
         # キャッシュチェック
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]['data']
+        cached = self._cache_get(cache_key)
+        if cached is not _CACHE_MISS:
+            return cached
 
         try:
-            logger.debug(f"Fetching news for {symbol or 'general market'}")
-
-            # 株探のRSSから取得
-            rss_url = self.config.get('data_sources', {}).get('news_sources', {}).get('kabutan', {}).get('rss', '')
+            logger.debug("Fetching news for {}", symbol or 'general market')
 
-            if not rss_url:
+            rss_urls = self._news_rss_urls()
+            if not rss_urls:
                 logger.warning("RSS URL not configured")
                 return []
 
-            feed = feedparser.parse(rss_url)
-            news_list = []
-
-            for entry in feed.entries[:10]:  # 最新10件
-                # 簡単な感情分析（キーワードベース）
-                sentiment = self._analyze_news_sentiment(entry.title + " " + entry.get('summary', ''))
-
-                news_item = {
-                    'title': entry.title,
-                    'url': entry.link,
-                    'datetime': datetime.now(),  # 実際の実装では entry.published をパース
-                    'symbol': symbol or '',
-                    'category': self._categorize_news(entry.title),
-                    'sentiment': sentiment
-                }
-
-                news_list.append(news_item)
+            news_items = self._fetch_news_items(rss_urls)
+            news_list = [replace(item, symbol=symbol or '') for item in news_items]
 
             # キャッシュに保存
             self._cache_data(cache_key, news_list)
@@ -276,6 +637,156 @@ class DataFetcher:
             logger.error(f"Error fetching news: {e}")
             return []
 
+    def fetch_news_bulk(self, symbols: List[str]) -> Dict[str, List[NewsItem]]:
+        """
+        複数銘柄のニュースを一括取得
+
+        RSSは銘柄によらず共通のため、キャッシュにない銘柄があればフィードを1回だけ取得して
+        全銘柄分のニュースリストを作成する
+
+        Args:
+            symbols: 銘柄コードのリスト
+
+        Returns:
+            dict: 銘柄コードをキーとしたニュース記事のリスト（取得できた銘柄のみ）
+        """
+        results = {}
+        missing = []
+
+        for symbol in symbols:
+            cache_key = f'news_{symbol}'
+            cached = self._cache_get(cache_key)
+            if cached is not _CACHE_MISS:
+                results[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        if not missing:
+            return results
+
+        try:
+            logger.debug("Bulk fetching news for {} symbols", len(missing))
+
+            rss_urls = self._news_rss_urls()
+            if not rss_urls:
+                logger.warning("RSS URL not configured")
+                return results
+
+            news_items = self._fetch_news_items(rss_urls)
+
+            for symbol in missing:
+                news_list = [replace(item, symbol=symbol) for item in news_items]
+                self._cache_data(f'news_{symbol}', news_list)
+                results[symbol] = news_list
+
+        except Exception as e:
+            logger.error(f"Error bulk fetching news: {e}")
+
+        return results
+
+    def _news_rss_urls(self) -> List[str]:
+        """設定されたニュースソースのRSS URL一覧を取得"""
+        news_sources = self.config.get('data_sources', {}).get('news_sources', {})
+        return [source['rss'] for source in news_sources.values() if source.get('rss')]
+
+    def _fetch_news_items(self, urls: List[str]) -> List[NewsItem]:
+        """
+        全RSSフィードのニュース記事を取得（複数の場合はスレッド並列で取得）
+
+        Args:
+            urls: RSS URLのリスト
+
+        Returns:
+            list: ニュース記事のリスト（URLの順に連結、銘柄コードは呼び出し側で設定）
+        """
+        if len(urls) == 1:
+            return self._fetch_feed_items(urls[0])
+
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(urls))) as executor:
+            return [item for items in executor.map(self._fetch_feed_items, urls) for item in items]
+
+    def _fetch_feed_items(self, url: str) -> List[NewsItem]:
+        """
+        共有セッション経由でRSSフィードを1件取得してニュース記事を作成
+
+        前回取得時のETag/Last-Modifiedで条件付きGETを行い、
+        未更新（304）の場合は前回の記事をそのまま返す
+
+        Args:
+            url: RSS URL
+
+        Returns:
+            list: ニュース記事のリスト（取得失敗時は空）
+        """
+        state = self._rss_state.get(url, {})
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('modified'):
+            headers['If-Modified-Since'] = state['modified']
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=5)
+            if response.status_code == 304 and state:
+                logger.debug("RSS feed not modified: {}", url)
+                return state['items']
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Error fetching RSS feed {url}: {e}")
+            return []
+
+        seen = state.get('entries', OrderedDict())
+        entries = self._build_news_items(feedparser.parse(response.content), seen)
+
+        # 解析済みの記事は最新のフィードから外れても上限件数まで保持し、再掲載時に再利用
+        seen = OrderedDict(seen)
+        seen.update(entries)
+        while len(seen) > self._RSS_SEEN_MAX:
+            seen.popitem(last=False)
+
+        items = list(entries.values())
+        self._rss_state[url] = {
+            'etag': response.headers.get('ETag'),
+            'modified': response.headers.get('Last-Modified'),
+            'entries': seen,
+            'items': items
+        }
+        return items
+
+    def _build_news_items(self, feed, previous: Dict[str, NewsItem]) -> Dict[str, NewsItem]:
+        """
+        フィードからニュース記事を作成（銘柄コードは呼び出し側で設定）
+
+        前回取得済みの記事は感情分析・分類をやり直さずに再利用する
+
+        Args:
+            feed: パース済みのフィード
+            previous: 解析済みの記事（記事ID/リンクをキー）
+
+        Returns:
+            dict: 記事ID/リンクをキーとしたニュース記事（フィードの順）
+        """
+        news_items = {}
+
+        for entry in feed.entries[:10]:  # 最新10件
+            key = entry.get('id') or entry.link
+            item = previous.get(key)
+            if item is None:
+                # 簡単な感情分析（キーワードベース）
+                sentiment = self._analyze_news_sentiment(entry.title + " " + entry.get('summary', ''))
+
+                item = NewsItem(
+                    title=entry.title,
+                    url=entry.link,
+                    datetime=datetime.now(),  # 実際の実装では entry.published をパース
+                    symbol='',
+                    category=self._categorize_news(entry.title),
+                    sentiment=sentiment
+                )
+            news_items[key] = item
+
+        return news_items
+
     def fetch_sector_data(self, sector: str) -> Dict:
         """
         セクター全体の動向を取得
@@ -286,8 +797,9 @@ class DataFetcher:
         cache_key = f'sector_{sector}'
 
         # キャッシュチェック
-        if self._is_cache_valid(cache_key):
-            return self.cache[cache_key]['data']
+        cached = self._cache_get(cache_key)
+        if cached is not _CACHE_MISS:
+            return cached
 
         try:
             # サンプル実装（実際の実装では、より詳細なセクターデータを取得）
@@ -307,33 +819,51 @@ class DataFetcher:
             return {}
 
     def _analyze_candlestick_pattern(self, df: pd.DataFrame) -> str:
-        """ローソク足パターンを分析"""
+        """ローソク足パターンを分析（最終足）"""
         if len(df) < 1:
             return "unknown"
 
-        last_candle = df.iloc[-1]
+        return str(self._classify_candles(df.tail(1))[-1])
 
-        # 下ヒゲの長さを計算
-        body_bottom = min(last_candle['Open'], last_candle['Close'])
-        lower_shadow_ratio = (body_bottom - last_candle['Low']) / (last_candle['High'] - last_candle['Low'])
+    def _classify_candles(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        ローソク足パターンを全行まとめて分類
 
-        # 高値引けかどうか
-        close_position = (last_candle['Close'] - last_candle['Low']) / (last_candle['High'] - last_candle['Low'])
+        高値と安値が等しい足（値幅0）は判定できないため"normal"とする
 
-        if lower_shadow_ratio > 0.3 and last_candle['Close'] > last_candle['Open']:
-            return "lower_shadow"
-        elif close_position > 0.8:
-            return "high_close"
-        else:
-            return "normal"
+        Args:
+            df: OHLC DataFrame
 
-    def _analyze_news_sentiment(self, text: str) -> str:
-        """ニュースの感情分析（簡易版）"""
-        positive_keywords = ['増益', '上方修正', '好調', '拡大', '成長', '回復']
-        negative_keywords = ['減益', '下方修正', '不調', '縮小', '悪化', '低迷']
+        Returns:
+            ndarray: 行ごとのパターン名（lower_shadow / high_close / normal）
+        """
+        open_ = df['Open'].to_numpy(dtype=np.float64)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+
+        price_range = high - low
+        price_range[price_range == 0] = np.nan
+
+        # 下ヒゲの長さと終値の位置（値幅に対する比率）
+        lower_shadow_ratio = (np.minimum(open_, close) - low) / price_range
+        close_position = (close - low) / price_range
 
-        positive_count = sum(1 for keyword in positive_keywords if keyword in text)
-        negative_count = sum(1 for keyword in negative_keywords if keyword in text)
+        return np.select(
+            [(lower_shadow_ratio > 0.3) & (close > open_), close_position > 0.8],
+            ['lower_shadow', 'high_close'],
+            default='normal'
+        )
+
+    def _analyze_news_sentiment(self, text: str) -> str:
+        """ニュースの感情分析（簡易版、出現したキーワードの種類数で判定）"""
+        if self._sentiment_automaton is not None:
+            matched = {value for _, value in self._sentiment_automaton.iter(text)}
+            positive_count = sum(1 for polarity, _ in matched if polarity > 0)
+            negative_count = len(matched) - positive_count
+        else:
+            positive_count = len(set(self._positive_re.findall(text)))
+            negative_count = len(set(self._negative_re.findall(text)))
 
         if positive_count > negative_count:
             return 'positive'
@@ -344,27 +874,131 @@ class DataFetcher:
 
     def _categorize_news(self, title: str) -> str:
         """ニュースをカテゴリ分類"""
-        if '決算' in title:
-            return '決算'
-        elif '修正' in title:
-            return '業績修正'
-        else:
-            return 'その他'
+        matched = set(self._category_re.findall(title))
+        for keyword, category in self._CATEGORY_KEYWORDS:
+            if keyword in matched:
+                return category
+        return 'その他'
+
+    def _cache_ttl_name(self, key: str) -> Optional[str]:
+        """キャッシュキーに対応するTTL種別を取得"""
+        for prefix, ttl_name in self._ttl_prefixes:
+            if key.startswith(prefix):
+                return ttl_name
+        return None
+
+    def _cache_ttl_for(self, key: str) -> int:
+        """キャッシュキーに対応するTTL（秒）を取得"""
+        return self.cache_ttl.get(self._cache_ttl_name(key), 300)  # デフォルト5分
+
+    def _cache_get(self, key: str) -> Any:
+        """
+        有効なキャッシュデータを取得（期限切れのエントリは削除し、メモリにない場合はディスクを参照）
+
+        有効性の確認と取り出しを同じロック内で行うため、確認後に他スレッドに削除されることはない
 
-    def _is_cache_valid(self, key: str) -> bool:
-        """キャッシュの有効性をチェック"""
-        if key not in self.cache:
-            return False
+        Args:
+            key: キャッシュキー
 
-        cache_entry = self.cache[key]
-        cache_time = cache_entry['timestamp']
-        ttl = self.cache_ttl.get(key.split('_')[0], 300)  # デフォルト5分
+        Returns:
+            キャッシュデータ（有効なデータがない場合は_CACHE_MISS）
+        """
+        with self._cache_lock:
+            cache_entry = self.cache.get(key)
+            if cache_entry is not None:
+                if time.monotonic() >= cache_entry['expires']:
+                    self.cache.pop(key, None)
+                    return _CACHE_MISS
 
-        return (datetime.now() - cache_time).total_seconds() < ttl
+                self.cache.move_to_end(key)
+                return cache_entry['data']
+
+        return self._load_from_disk(key)
+
+    def _store_entry(self, key: str, data, timestamp: float):
+        """
+        メモリキャッシュにエントリを登録（上限件数を超えた分は古いものから削除）
+
+        有効期限はTTLから登録時に1回だけ計算し、参照時は時刻の比較のみで判定する
+
+        Args:
+            key: キャッシュキー
+            data: キャッシュするデータ
+            timestamp: 取得時刻（time.monotonic基準）
+        """
+        ttl = self._cache_ttl_for(key)
+        expires = timestamp + ttl
+        # 銘柄リストは猶予期間中も古いデータを返すため、その間は一括削除の対象外
+        retain_until = timestamp + ttl * self._STOCK_LIST_GRACE if key == 'stock_list' else expires
+
+        with self._cache_lock:
+            self.cache[key] = {
+                'data': data,
+                'timestamp': timestamp,
+                'expires': expires,
+                'retain_until': retain_until
+            }
+            self.cache.move_to_end(key)
+
+            while len(self.cache) > self.cache_max:
+                self.cache.popitem(last=False)
+
+    def _sweep_cache(self):
+        """保持期限を過ぎたエントリを一括削除（一定間隔ごとに1回だけ実行）"""
+        with self._cache_lock:
+            now = time.monotonic()
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + self._CACHE_SWEEP_INTERVAL
+
+            expired = [key for key, entry in self.cache.items() if now >= entry['retain_until']]
+            for key in expired:
+                self.cache.pop(key, None)
+
+        if expired:
+            logger.debug("Swept {} expired cache entries", len(expired))
 
     def _cache_data(self, key: str, data):
-        """データをキャッシュに保存"""
-        self.cache[key] = {
-            'data': data,
-            'timestamp': datetime.now()
-        }
\ No newline at end of file
+        """データをキャッシュに保存（期限切れエントリの一括削除も定期的に実行）"""
+        with self._cache_lock:
+            self._sweep_cache()
+            self._store_entry(key, data, time.monotonic())
+
+        if self.disk is not None:
+            try:
+                self.disk.set(key, data, expire=self._cache_ttl_for(key),
+                              tag=self._cache_ttl_name(key))
+            except Exception as e:
+                logger.warning(f"Error writing disk cache for {key}: {e}")
+
+    def _load_from_disk(self, key: str) -> Any:
+        """
+        ディスクキャッシュから有効なエントリをメモリキャッシュに読み込む
+
+        ディスク上の残り有効期間を引き継ぐため、メモリ上のタイムスタンプは
+        保存時刻に相当する値に戻して登録する
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            読み込んだキャッシュデータ（有効なエントリがない場合は_CACHE_MISS）
+        """
+        if self.disk is None:
+            return _CACHE_MISS
+
+        try:
+            data, expire_time = self.disk.get(key, default=None, expire_time=True)
+        except Exception as e:
+            logger.warning(f"Error reading disk cache for {key}: {e}")
+            return _CACHE_MISS
+
+        if data is None or expire_time is None:
+            return _CACHE_MISS
+
+        remaining = expire_time - time.time()
+        if remaining <= 0:
+            return _CACHE_MISS
+
+        self._store_entry(key, data, time.monotonic() - (self._cache_ttl_for(key) - remaining))
+        return data
\ No newline at end of file
@@ -3,7 +3,13 @@
 SQLiteを使用した履歴データの永続化
 """
 
+import asyncio
+import atexit
+import itertools
+import queue
 import sqlite3
+import threading
+import time
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
@@ -11,10 +17,319 @@ from loguru import logger
 import json
 from contextlib import contextmanager
 
+from analyzer import format_signals, round_scores
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # orjsonは任意依存（未導入時は標準のjsonを使用）
+    ORJSON_AVAILABLE = False
+
+
+def _days_ago(days: int) -> str:
+    """SQLiteのdatetime('now', ?)に渡す「n日前」の修飾子を作成"""
+    return f'-{int(days)} days'
+
+
+def _read_frame(conn: sqlite3.Connection, query: str, params=(), parse_dates: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    クエリ結果をDataFrameとして取得
+
+    pd.read_sql_queryの中間変換を経由せず、取得したタプルから1回でDataFrameを構築する
+
+    Args:
+        conn: SQLite接続
+        query: SQL
+        params: バインドパラメータ
+        parse_dates: 日時に変換する列名
+
+    Returns:
+        DataFrame: クエリ結果
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None  # sqlite3.Rowではなくタプルで取得
+    cursor.execute(query, params)
+    columns = [description[0] for description in cursor.description]
+    df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns, coerce_float=True)
+
+    for column in parse_dates or []:
+        df[column] = pd.to_datetime(df[column], errors='coerce')
+
+    return df
+
+
+def _iter_frames(conn: sqlite3.Connection, query: str, params=(), chunk_size: int = 2000):
+    """
+    クエリ結果を一定行数ずつDataFrameとして順に取得
+
+    Args:
+        conn: SQLite接続
+        query: SQL
+        params: バインドパラメータ
+        chunk_size: 1チャンクの行数
+
+    Yields:
+        DataFrame: chunk_size行以下のクエリ結果
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None  # sqlite3.Rowではなくタプルで取得
+    cursor.execute(query, params)
+    columns = [description[0] for description in cursor.description]
+
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+
+def _upsert_sql(table: str, columns: Tuple[str, ...], keys: Tuple[str, ...] = ('symbol', 'date')) -> str:
+    """
+    キー重複時に既存行をその場で更新するINSERT文（UPSERT）を作成
+
+    INSERT OR REPLACEのような削除＋挿入にならないため、インデックスやWALへの書き込みが少ない。
+    created_atも更新し、INSERT OR REPLACEと同じく最後に保存した日時を保持する
+
+    Args:
+        table: テーブル名
+        columns: 挿入する列（keysを含む）
+        keys: 一意キーの列
+
+    Returns:
+        str: SQL
+    """
+    updates = ', '.join(f'{column} = excluded.{column}'
+                        for column in columns + ('created_at',) if column not in keys)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['?'] * len(columns))}) "
+        f"ON CONFLICT({', '.join(keys)}) DO UPDATE SET {updates}"
+    )
+
+
+def _to_json(value) -> str:
+    """保存用のJSON文字列に変換（区切りの空白を省き、日本語はエスケープしない）"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass  # orjsonで扱えない型は標準のjsonで変換
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _from_json(text: Optional[str]) -> list:
+    """保存されたJSON文字列をリストに変換（空の場合は空リスト）"""
+    if not text:
+        return []
+    return orjson.loads(text) if ORJSON_AVAILABLE else json.loads(text)
+
+
+# スキーマ定義（init_databaseでexecutescriptにより一括実行）
+_SCHEMA_DDL = """
+-- スクリーニング結果テーブル
+CREATE TABLE IF NOT EXISTS screening_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    symbol TEXT NOT NULL,
+    name TEXT,
+    total_score REAL,
+    current_price REAL,
+    gap_ratio REAL,
+    volume_ratio REAL,
+    market_cap REAL,
+    signals TEXT,
+    warnings TEXT,
+    rank INTEGER,
+    screening_type TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ポジション履歴テーブル
+CREATE TABLE IF NOT EXISTS positions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    entry_time DATETIME NOT NULL,
+    exit_time DATETIME,
+    entry_price REAL NOT NULL,
+    exit_price REAL,
+    shares INTEGER NOT NULL,
+    position_type TEXT DEFAULT 'long',
+    stop_loss REAL,
+    take_profit REAL,
+    pnl REAL,
+    pnl_percentage REAL,
+    exit_reason TEXT,
+    status TEXT DEFAULT 'open',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- アラート履歴テーブル
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    symbol TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    message TEXT,
+    data TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ニュース履歴テーブル
+CREATE TABLE IF NOT EXISTS news_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    symbol TEXT,
+    title TEXT NOT NULL,
+    url TEXT,
+    category TEXT,
+    sentiment TEXT,
+    sentiment_score REAL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- バックテスト結果テーブル
+CREATE TABLE IF NOT EXISTS backtest_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_name TEXT NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    initial_capital REAL NOT NULL,
+    final_capital REAL NOT NULL,
+    total_return REAL,
+    win_rate REAL,
+    sharpe_ratio REAL,
+    max_drawdown REAL,
+    total_trades INTEGER,
+    winning_trades INTEGER,
+    losing_trades INTEGER,
+    parameters TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 期間指定＋順位順の取得と銘柄別集計（get_top_performers）を索引のみで処理できる複合インデックス
+CREATE INDEX IF NOT EXISTS idx_screening_ts_rank
+ON screening_results(timestamp DESC, rank ASC, symbol, total_score, gap_ratio, volume_ratio);
+CREATE INDEX IF NOT EXISTS idx_screening_symbol_ts
+ON screening_results(symbol, timestamp DESC, rank ASC);
+-- 上記の複合インデックスの先頭列と重複する単一列インデックスは削除
+DROP INDEX IF EXISTS idx_screening_symbol;
+DROP INDEX IF EXISTS idx_screening_timestamp;
+
+CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol);
+-- 決済済みポジションの期間集計（get_performance_stats）用の部分インデックス
+CREATE INDEX IF NOT EXISTS idx_positions_closed_exit
+ON positions(exit_time, pnl, pnl_percentage) WHERE status = 'closed';
+
+CREATE INDEX IF NOT EXISTS idx_alerts_symbol ON alerts(symbol);
+"""
+
+# 価格履歴テーブル（(symbol, date)を主キーとするWITHOUT ROWIDテーブル、テーブル名は{table}）
+_PRICE_HISTORY_DDL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    symbol TEXT NOT NULL,
+    date DATE NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID
+"""
+
+# テクニカル指標履歴テーブル（(symbol, date)を主キーとするWITHOUT ROWIDテーブル、テーブル名は{table}）
+_TECHNICAL_INDICATORS_DDL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    symbol TEXT NOT NULL,
+    date DATE NOT NULL,
+    rsi REAL,
+    macd REAL,
+    macd_signal REAL,
+    bb_upper REAL,
+    bb_middle REAL,
+    bb_lower REAL,
+    sma_5 REAL,
+    sma_25 REAL,
+    sma_75 REAL,
+    adx REAL,
+    atr REAL,
+    obv REAL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID
+"""
+
+# 保存処理で使うINSERT文（同一の文字列を再利用し、接続ごとのプリペアドステートメントキャッシュに確実にヒットさせる）
+_SQL_INSERT_SCREENING = """
+    INSERT INTO screening_results
+    (timestamp, symbol, name, total_score, current_price, gap_ratio,
+     volume_ratio, market_cap, signals, warnings, rank, screening_type)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_POSITION = """
+    INSERT INTO positions
+    (symbol, entry_time, exit_time, entry_price, exit_price, shares,
+     position_type, stop_loss, take_profit, pnl, pnl_percentage,
+     exit_reason, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_ALERT = """
+    INSERT INTO alerts (timestamp, symbol, alert_type, message, data)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_BACKTEST = """
+    INSERT INTO backtest_results
+    (test_name, start_date, end_date, initial_capital, final_capital,
+     total_return, win_rate, sharpe_ratio, max_drawdown,
+     total_trades, winning_trades, losing_trades, parameters)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class DatabaseManager:
     """データベース管理クラス"""
 
+    # WALモードを設定済みのデータベースファイル（journal_modeはファイルに永続化される）
+    _wal_enabled = set()
+
+    # 接続ごとに設定するPRAGMA
+    _CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",       # WALではコミットごとのfsyncを省略しても破損しない
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",        # 64MB
+        "PRAGMA mmap_size=268435456",      # 256MB
+        "PRAGMA busy_timeout=5000",        # 書き込み競合時はエラーにせず最大5秒待機
+    )
+
+    # 再利用のためにプールしておく接続数の上限
+    _POOL_SIZE = 8
+    # ポジション・アラートの書き込みバッファ（件数か経過秒数のどちらかで一括フラッシュ）
+    _WRITE_BATCH_SIZE = 256
+    _WRITE_FLUSH_INTERVAL = 1.0
+
+    # cleanup_old_dataで古いデータを削除するテーブル（created_atにインデックスを作成）
+    _CLEANUP_TABLES = (
+        'screening_results',
+        'price_history',
+        'technical_indicators',
+        'alerts',
+        'news_history'
+    )
+
+    # テクニカル指標テーブルの指標列（save_technical_indicators_bulkで受け付けるDataFrameの列名）
+    _INDICATOR_COLUMNS = (
+        'rsi', 'macd', 'macd_signal', 'bb_upper', 'bb_middle', 'bb_lower',
+        'sma_5', 'sma_25', 'sma_75', 'adx', 'atr', 'obv'
+    )
+
+    # (symbol, date)が重複した場合は既存行を更新するINSERT文
+    _PRICE_UPSERT = _upsert_sql('price_history', ('symbol', 'date', 'open', 'high', 'low', 'close', 'volume'))
+    _INDICATOR_UPSERT = _upsert_sql('technical_indicators', ('symbol', 'date') + _INDICATOR_COLUMNS)
+
     def __init__(self, db_path: str = "data/trading_history.db"):
         """
         初期化
@@ -23,13 +338,26 @@ class DatabaseManager:
             db_path: データベースファイルパス
         """
         self.db_path = db_path
+        # 接続プール（直近に返却された接続を優先して再利用し、ページキャッシュを温かく保つ）
+        self._pool = queue.LifoQueue(maxsize=self._POOL_SIZE)
+        self._buffer_lock = threading.Lock()
+        self._position_buffer: List[Tuple] = []
+        self._alert_buffer: List[Tuple] = []
+        self._last_flush = time.monotonic()
         self.init_database()
+        # 終了時に未保存のバッファを書き出す
+        atexit.register(self.flush)
 
     @contextmanager
     def get_connection(self):
-        """データベース接続のコンテキストマネージャー"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """データベース接続のコンテキストマネージャー（接続はプールから取得して返却）"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=512)
+            conn.row_factory = sqlite3.Row
+            self._configure_connection(conn)
+
         try:
             yield conn
             conn.commit()
@@ -38,152 +366,87 @@ class DatabaseManager:
             logger.error(f"Database error: {e}")
             raise
         finally:
-            conn.close()
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def close(self):
+        """バッファをフラッシュし、プール中の接続をすべて閉じる"""
+        self.flush()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """
+        接続のPRAGMAを設定
+
+        WALモードは書き込み時のfsync回数を減らし、書き込み中の読み取りもブロックしない
+
+        Args:
+            conn: SQLite接続
+        """
+        if self.db_path not in self._wal_enabled:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._wal_enabled.add(self.db_path)
+
+        for pragma in self._CONNECTION_PRAGMAS:
+            conn.execute(pragma)
 
     def init_database(self):
         """データベース初期化（テーブル作成）"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            # スクリーニング結果テーブル
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS screening_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    symbol TEXT NOT NULL,
-                    name TEXT,
-                    total_score REAL,
-                    current_price REAL,
-                    gap_ratio REAL,
-                    volume_ratio REAL,
-                    market_cap REAL,
-                    signals TEXT,
-                    warnings TEXT,
-                    rank INTEGER,
-                    screening_type TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # 価格履歴テーブル
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS price_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    date DATE NOT NULL,
-                    open REAL,
-                    high REAL,
-                    low REAL,
-                    close REAL,
-                    volume INTEGER,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(symbol, date)
-                )
-            """)
-
-            # テクニカル指標履歴テーブル
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS technical_indicators (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    date DATE NOT NULL,
-                    rsi REAL,
-                    macd REAL,
-                    macd_signal REAL,
-                    bb_upper REAL,
-                    bb_middle REAL,
-                    bb_lower REAL,
-                    sma_5 REAL,
-                    sma_25 REAL,
-                    sma_75 REAL,
-                    adx REAL,
-                    atr REAL,
-                    obv REAL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(symbol, date)
-                )
-            """)
-
-            # ポジション履歴テーブル
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS positions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    entry_time DATETIME NOT NULL,
-                    exit_time DATETIME,
-                    entry_price REAL NOT NULL,
-                    exit_price REAL,
-                    shares INTEGER NOT NULL,
-                    position_type TEXT DEFAULT 'long',
-                    stop_loss REAL,
-                    take_profit REAL,
-                    pnl REAL,
-                    pnl_percentage REAL,
-                    exit_reason TEXT,
-                    status TEXT DEFAULT 'open',
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # アラート履歴テーブル
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS alerts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    symbol TEXT NOT NULL,
-                    alert_type TEXT NOT NULL,
-                    message TEXT,
-                    data TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # ニュース履歴テーブル
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS news_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    symbol TEXT,
-                    title TEXT NOT NULL,
-                    url TEXT,
-                    category TEXT,
-                    sentiment TEXT,
-                    sentiment_score REAL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # バックテスト結果テーブル
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS backtest_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    test_name TEXT NOT NULL,
-                    start_date DATE NOT NULL,
-                    end_date DATE NOT NULL,
-                    initial_capital REAL NOT NULL,
-                    final_capital REAL NOT NULL,
-                    total_return REAL,
-                    win_rate REAL,
-                    sharpe_ratio REAL,
-                    max_drawdown REAL,
-                    total_trades INTEGER,
-                    winning_trades INTEGER,
-                    losing_trades INTEGER,
-                    parameters TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # インデックス作成
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_screening_symbol ON screening_results(symbol)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_screening_timestamp ON screening_results(timestamp)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_symbol_date ON price_history(symbol, date)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_technical_symbol_date ON technical_indicators(symbol, date)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_symbol ON alerts(symbol)")
+            # WITHOUT ROWIDテーブルは旧形式からの移行が必要な場合があるため個別に作成
+            self._ensure_without_rowid_table(cursor, 'price_history', _PRICE_HISTORY_DDL)
+            self._ensure_without_rowid_table(cursor, 'technical_indicators', _TECHNICAL_INDICATORS_DDL)
+
+            # 残りのテーブルとインデックスは1回のexecutescriptで作成
+            # （古いデータの削除（cleanup_old_data）で範囲検索するcreated_atのインデックスを含む）
+            created_at_indexes = ''.join(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_created_at ON {table}(created_at);\n"
+                for table in self._CLEANUP_TABLES
+            )
+            conn.executescript(_SCHEMA_DDL + created_at_indexes)
 
             logger.info("Database initialized successfully")
 
+    def _ensure_without_rowid_table(self, cursor: sqlite3.Cursor, table: str, ddl: str):
+        """
+        WITHOUT ROWIDテーブルを作成（旧形式のテーブルがあればデータを移行）
+
+        Args:
+            cursor: カーソル
+            table: テーブル名
+            ddl: CREATE TABLE文（テーブル名は{table}で指定）
+        """
+        row = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+
+        if row is None:
+            cursor.execute(ddl.format(table=table))
+            return
+
+        if 'WITHOUT ROWID' in row[0].upper():
+            return
+
+        # 新形式のテーブルに共通の列をコピーしてから置き換える
+        new_table = f'{table}_new'
+        cursor.execute(ddl.format(table=new_table))
+        old_columns = {info[1] for info in cursor.execute(f"PRAGMA table_info({table})")}
+        columns = ', '.join(info[1] for info in cursor.execute(f"PRAGMA table_info({new_table})")
+                            if info[1] in old_columns)
+        cursor.execute(f"INSERT OR REPLACE INTO {new_table} ({columns}) SELECT {columns} FROM {table}")
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+        logger.info(f"Migrated {table} to a WITHOUT ROWID table")
+
     def save_screening_results(self, results: Dict):
         """
         スクリーニング結果を保存
@@ -191,34 +454,33 @@ class DatabaseManager:
         Args:
             results: スクリーニング結果
         """
+        timestamp = results.get('timestamp', datetime.now())
+        screening_type = results.get('screening_type', 'full')
+        picks = results.get('top_picks', [])
+        watch = results.get('watch_list', [])
+
+        params = [
+            (
+                timestamp,
+                stock.get('symbol'),
+                stock.get('name'),
+                stock.get('total_score'),
+                stock.get('current_price'),
+                stock.get('gap_ratio'),
+                stock.get('volume_ratio'),
+                stock.get('market_cap'),
+                _to_json(format_signals(stock.get('signals', []))),
+                _to_json(stock.get('warnings', [])),
+                stock.get('rank'),
+                screening_type
+            )
+            for stock in map(round_scores, itertools.chain(picks, watch))
+        ]
+
         with self.get_connection() as conn:
-            cursor = conn.cursor()
+            conn.executemany(_SQL_INSERT_SCREENING, params)
 
-            timestamp = results.get('timestamp', datetime.now())
-            screening_type = results.get('screening_type', 'full')
-
-            for stock in results.get('top_picks', []) + results.get('watch_list', []):
-                cursor.execute("""
-                    INSERT INTO screening_results
-                    (timestamp, symbol, name, total_score, current_price, gap_ratio,
-                     volume_ratio, market_cap, signals, warnings, rank, screening_type)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    timestamp,
-                    stock.get('symbol'),
-                    stock.get('name'),
-                    stock.get('total_score'),
-                    stock.get('current_price'),
-                    stock.get('gap_ratio'),
-                    stock.get('volume_ratio'),
-                    stock.get('market_cap'),
-                    json.dumps(stock.get('signals', [])),
-                    json.dumps(stock.get('warnings', [])),
-                    stock.get('rank'),
-                    screening_type
-                ))
-
-            logger.info(f"Saved {len(results.get('top_picks', []) + results.get('watch_list', []))} screening results")
+        logger.info(f"Saved {len(params)} screening results")
 
     def save_price_history(self, symbol: str, df: pd.DataFrame):
         """
@@ -228,26 +490,33 @@ class DatabaseManager:
             symbol: 銘柄コード
             df: 価格データのDataFrame
         """
-        with self.get_connection() as conn:
-            for index, row in df.iterrows():
-                try:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO price_history
-                        (symbol, date, open, high, low, close, volume)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        symbol,
-                        index.date() if hasattr(index, 'date') else index,
-                        row['Open'],
-                        row['High'],
-                        row['Low'],
-                        row['Close'],
-                        row['Volume']
-                    ))
-                except Exception as e:
-                    logger.warning(f"Error saving price for {symbol} on {index}: {e}")
-
-            logger.debug(f"Saved {len(df)} price records for {symbol}")
+        # 列ごとにndarrayからPythonの値へ変換し、1回のexecutemany（1トランザクション）で書き込む
+        index = df.index
+        if isinstance(index, pd.DatetimeIndex):
+            # タイムゾーン付きは現地の日付を保ったまま外してから日単位に丸める
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            dates = index.to_numpy('datetime64[D]').tolist()
+        else:
+            dates = index.tolist()
+        rows = list(zip(
+            [symbol] * len(df),
+            dates,
+            df['Open'].to_numpy().tolist(),
+            df['High'].to_numpy().tolist(),
+            df['Low'].to_numpy().tolist(),
+            df['Close'].to_numpy().tolist(),
+            df['Volume'].to_numpy().tolist()
+        ))
+
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(self._PRICE_UPSERT, rows)
+        except Exception as e:
+            logger.warning(f"Error saving price history for {symbol}: {e}")
+            return
+
+        logger.debug("Saved {} price records for {}", len(df), symbol)
 
     def save_technical_indicators(self, symbol: str, date: datetime, indicators: Dict):
         """
@@ -261,12 +530,7 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO technical_indicators
-                (symbol, date, rsi, macd, macd_signal, bb_upper, bb_middle, bb_lower,
-                 sma_5, sma_25, sma_75, adx, atr, obv)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(self._INDICATOR_UPSERT, (
                 symbol,
                 date.date() if hasattr(date, 'date') else date,
                 indicators.get('rsi', {}).get('value'),
@@ -283,60 +547,133 @@ class DatabaseManager:
                 indicators.get('obv', {}).get('value')
             ))
 
-    def save_position(self, position: Dict):
+    def save_technical_indicators_bulk(self, symbol: str, df: pd.DataFrame):
         """
-        ポジション情報を保存
+        テクニカル指標の履歴をまとめて保存（1回のexecutemany、1トランザクション）
 
         Args:
-            position: ポジション情報
+            symbol: 銘柄コード
+            df: 日付をインデックス、指標名（_INDICATOR_COLUMNS）を列とするDataFrame
+                （存在しない列と欠損値はNULLとして保存）
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        if df.empty:
+            return
+
+        frame = df.reindex(columns=list(self._INDICATOR_COLUMNS))
+        frame = frame.astype(object).where(frame.notna(), None)
+        dates = df.index.date if isinstance(df.index, pd.DatetimeIndex) else df.index
+        rows = list(zip(
+            [symbol] * len(df),
+            dates.tolist(),
+            *(frame[column].tolist() for column in self._INDICATOR_COLUMNS)
+        ))
 
-            cursor.execute("""
-                INSERT INTO positions
-                (symbol, entry_time, exit_time, entry_price, exit_price, shares,
-                 position_type, stop_loss, take_profit, pnl, pnl_percentage,
-                 exit_reason, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                position.get('symbol'),
-                position.get('entry_time'),
-                position.get('exit_time'),
-                position.get('entry_price'),
-                position.get('exit_price'),
-                position.get('shares'),
-                position.get('position_type', 'long'),
-                position.get('stop_loss'),
-                position.get('take_profit'),
-                position.get('pnl'),
-                position.get('pnl_percentage'),
-                position.get('exit_reason'),
-                position.get('status', 'open')
-            ))
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(self._INDICATOR_UPSERT, rows)
+        except Exception as e:
+            logger.warning(f"Error saving technical indicators for {symbol}: {e}")
+            return
 
-            logger.info(f"Saved position for {position.get('symbol')}")
+        logger.debug("Saved {} technical indicator records for {}", len(rows), symbol)
+
+    def save_position(self, position: Dict):
+        """
+        ポジション情報をバッファに追加（一定件数・一定時間ごとにまとめて保存）
+
+        Args:
+            position: ポジション情報
+        """
+        row = (
+            position.get('symbol'),
+            position.get('entry_time'),
+            position.get('exit_time'),
+            position.get('entry_price'),
+            position.get('exit_price'),
+            position.get('shares'),
+            position.get('position_type', 'long'),
+            position.get('stop_loss'),
+            position.get('take_profit'),
+            position.get('pnl'),
+            position.get('pnl_percentage'),
+            position.get('exit_reason'),
+            position.get('status', 'open')
+        )
+        with self._buffer_lock:
+            self._position_buffer.append(row)
+        logger.debug("Buffered position for {}", position.get('symbol'))
+        self._maybe_flush(len(self._position_buffer))
 
     def save_alert(self, alert: Dict):
         """
-        アラート情報を保存
+        アラート情報をバッファに追加（一定件数・一定時間ごとにまとめて保存）
 
         Args:
             alert: アラート情報
         """
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
+        row = (
+            alert.get('timestamp', datetime.now()),
+            alert.get('symbol'),
+            alert.get('type'),
+            alert.get('message'),
+            _to_json(alert.get('data', {}))
+        )
+        with self._buffer_lock:
+            self._alert_buffer.append(row)
+        self._maybe_flush(len(self._alert_buffer))
+
+    def _maybe_flush(self, buffered: int):
+        """バッファ件数または前回フラッシュからの経過時間が閾値を超えたらフラッシュ"""
+        if (buffered >= self._WRITE_BATCH_SIZE
+                or time.monotonic() - self._last_flush >= self._WRITE_FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except Exception as e:
+                # 書き込めなかった行はバッファに戻されているため、次回のフラッシュで再試行する
+                logger.warning(f"Deferred buffered writes after flush failure: {e}")
+
+    def flush(self):
+        """
+        バッファ済みのポジション・アラートを1トランザクションで保存
 
-            cursor.execute("""
-                INSERT INTO alerts (timestamp, symbol, alert_type, message, data)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                alert.get('timestamp', datetime.now()),
-                alert.get('symbol'),
-                alert.get('type'),
-                alert.get('message'),
-                json.dumps(alert.get('data', {}))
-            ))
+        シャットダウン時やバックテスト終了時に呼び出す。
+        書き込みに失敗した場合は行をバッファの先頭に戻してから例外を送出する。
+        """
+        with self._buffer_lock:
+            positions, self._position_buffer = self._position_buffer, []
+            alerts, self._alert_buffer = self._alert_buffer, []
+            self._last_flush = time.monotonic()
+
+        if not positions and not alerts:
+            return
+
+        batches = ((_SQL_INSERT_POSITION, positions), (_SQL_INSERT_ALERT, alerts))
+
+        try:
+            try:
+                with self.get_connection() as conn:
+                    for sql, rows in batches:
+                        if rows:
+                            conn.executemany(sql, rows)
+            except sqlite3.IntegrityError as e:
+                # 不正な行が1件あるとバッチ全体がロールバックされるため、1行ずつ保存し直して不正な行だけ捨てる
+                logger.warning(f"Batch flush failed, retrying row by row: {e}")
+                with self.get_connection() as conn:
+                    for sql, rows in batches:
+                        for row in rows:
+                            try:
+                                conn.execute(sql, row)
+                            except sqlite3.IntegrityError as row_error:
+                                logger.warning(f"Skipped invalid buffered row {row}: {row_error}")
+        except Exception:
+            # ロック待ちのタイムアウトやI/Oエラーではトランザクションごとロールバックされるため、
+            # 全行を後から追加された行より前に戻して次回のフラッシュで再試行する
+            with self._buffer_lock:
+                self._position_buffer[:0] = positions
+                self._alert_buffer[:0] = alerts
+            raise
+
+        logger.info(f"Flushed {len(positions)} positions and {len(alerts)} alerts")
 
     def save_backtest_result(self, result: Dict):
         """
@@ -348,13 +685,7 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute("""
-                INSERT INTO backtest_results
-                (test_name, start_date, end_date, initial_capital, final_capital,
-                 total_return, win_rate, sharpe_ratio, max_drawdown,
-                 total_trades, winning_trades, losing_trades, parameters)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor.execute(_SQL_INSERT_BACKTEST, (
                 result.get('test_name'),
                 result.get('start_date'),
                 result.get('end_date'),
@@ -367,7 +698,7 @@ class DatabaseManager:
                 result.get('total_trades'),
                 result.get('winning_trades'),
                 result.get('losing_trades'),
-                json.dumps(result.get('parameters', {}))
+                _to_json(result.get('parameters', {}))
             ))
 
             logger.info(f"Saved backtest result: {result.get('test_name')}")
@@ -386,20 +717,22 @@ class DatabaseManager:
         with self.get_connection() as conn:
             query = """
                 SELECT * FROM screening_results
-                WHERE timestamp > datetime('now', '-{} days')
-            """.format(days)
+                WHERE timestamp > datetime('now', ?)
+            """
+            params = [_days_ago(days)]
 
             if symbol:
-                query += f" AND symbol = '{symbol}'"
+                query += " AND symbol = ?"
+                params.append(symbol)
 
             query += " ORDER BY timestamp DESC, rank ASC"
 
-            df = pd.read_sql_query(query, conn)
+            df = _read_frame(conn, query, params)
 
             # JSON文字列をリストに変換
             if not df.empty:
-                df['signals'] = df['signals'].apply(lambda x: json.loads(x) if x else [])
-                df['warnings'] = df['warnings'].apply(lambda x: json.loads(x) if x else [])
+                df['signals'] = [_from_json(text) for text in df['signals'].tolist()]
+                df['warnings'] = [_from_json(text) for text in df['warnings'].tolist()]
 
             return df
 
@@ -416,16 +749,19 @@ class DatabaseManager:
             DataFrame: 価格履歴
         """
         with self.get_connection() as conn:
-            query = f"SELECT * FROM price_history WHERE symbol = '{symbol}'"
+            query = "SELECT * FROM price_history WHERE symbol = ?"
+            params = [symbol]
 
             if start_date:
-                query += f" AND date >= '{start_date}'"
+                query += " AND date >= ?"
+                params.append(str(start_date))
             if end_date:
-                query += f" AND date <= '{end_date}'"
+                query += " AND date <= ?"
+                params.append(str(end_date))
 
             query += " ORDER BY date ASC"
 
-            df = pd.read_sql_query(query, conn, parse_dates=['date'])
+            df = _read_frame(conn, query, params, parse_dates=['date'])
 
             if not df.empty:
                 df.set_index('date', inplace=True)
@@ -442,15 +778,19 @@ class DatabaseManager:
         Returns:
             DataFrame: ポジション履歴
         """
+        self.flush()
+
         with self.get_connection() as conn:
             query = "SELECT * FROM positions"
+            params = []
 
             if status:
-                query += f" WHERE status = '{status}'"
+                query += " WHERE status = ?"
+                params.append(status)
 
             query += " ORDER BY entry_time DESC"
 
-            df = pd.read_sql_query(query, conn, parse_dates=['entry_time', 'exit_time'])
+            df = _read_frame(conn, query, params, parse_dates=['entry_time', 'exit_time'])
 
             return df
 
@@ -464,6 +804,8 @@ class DatabaseManager:
         Returns:
             dict: パフォーマンス統計
         """
+        self.flush()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
@@ -478,9 +820,9 @@ class DatabaseManager:
                     MAX(pnl) as best_trade,
                     MIN(pnl) as worst_trade
                 FROM positions
-                WHERE exit_time > datetime('now', '-{} days')
+                WHERE exit_time > datetime('now', ?)
                 AND status = 'closed'
-            """.format(days))
+            """, (_days_ago(days),))
 
             stats = dict(cursor.fetchone())
 
@@ -491,25 +833,18 @@ class DatabaseManager:
                 stats['win_rate'] = 0
 
             # スクリーニング精度（TOP5の翌日パフォーマンス）
+            # s1はidx_screening_ts_rankの範囲検索、p1/p2は(symbol, date)主キーの一致検索で結合する。
+            # DATE()は結合先の検索値の計算にのみ使い、インデックス列側には適用しない
             cursor.execute("""
-                SELECT AVG(accuracy) as screening_accuracy
-                FROM (
-                    SELECT
-                        s1.symbol,
-                        s1.timestamp,
-                        CASE
-                            WHEN p2.close > p1.close THEN 1.0
-                            ELSE 0.0
-                        END as accuracy
-                    FROM screening_results s1
-                    JOIN price_history p1 ON s1.symbol = p1.symbol
-                        AND DATE(s1.timestamp) = p1.date
-                    JOIN price_history p2 ON s1.symbol = p2.symbol
-                        AND p2.date = DATE(p1.date, '+1 day')
-                    WHERE s1.rank <= 5
-                    AND s1.timestamp > datetime('now', '-{} days')
-                )
-            """.format(days))
+                SELECT AVG(CASE WHEN p2.close > p1.close THEN 1.0 ELSE 0.0 END) as screening_accuracy
+                FROM screening_results s1
+                JOIN price_history p1 ON p1.symbol = s1.symbol
+                    AND p1.date = DATE(s1.timestamp)
+                JOIN price_history p2 ON p2.symbol = s1.symbol
+                    AND p2.date = DATE(p1.date, '+1 day')
+                WHERE s1.timestamp > datetime('now', ?)
+                AND s1.rank <= 5
+            """, (_days_ago(days),))
 
             result = cursor.fetchone()
             if result and result[0]:
@@ -531,6 +866,8 @@ class DatabaseManager:
             DataFrame: 高パフォーマンス銘柄
         """
         with self.get_connection() as conn:
+            # 期間条件で範囲検索し、集計に必要な列もすべて含む複合インデックスのみで処理する
+            # （GROUP BY symbolの順序に引きずられて(symbol, ...)のインデックスを全走査しないよう指定）
             query = """
                 SELECT
                     symbol,
@@ -538,18 +875,32 @@ class DatabaseManager:
                     AVG(total_score) as avg_score,
                     AVG(gap_ratio) as avg_gap_ratio,
                     AVG(volume_ratio) as avg_volume_ratio
-                FROM screening_results
-                WHERE timestamp > datetime('now', '-{} days')
+                FROM screening_results INDEXED BY idx_screening_ts_rank
+                WHERE timestamp > datetime('now', ?)
                 AND rank <= 20
                 GROUP BY symbol
                 ORDER BY appearance_count DESC, avg_score DESC
-                LIMIT {}
-            """.format(days, limit)
+                LIMIT ?
+            """
 
-            df = pd.read_sql_query(query, conn)
+            df = _read_frame(conn, query, (_days_ago(days), int(limit)))
 
             return df
 
+    # 非同期版の読み取りメソッド（イベントループを塞がないようワーカースレッドで実行し、接続プールを共有）
+
+    async def aget_screening_history(self, symbol: str = None, days: int = 30) -> pd.DataFrame:
+        """get_screening_historyの非同期版"""
+        return await asyncio.to_thread(self.get_screening_history, symbol, days)
+
+    async def aget_price_history(self, symbol: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """get_price_historyの非同期版"""
+        return await asyncio.to_thread(self.get_price_history, symbol, start_date, end_date)
+
+    async def aget_performance_stats(self, days: int = 30) -> Dict:
+        """get_performance_statsの非同期版"""
+        return await asyncio.to_thread(self.get_performance_stats, days)
+
     def cleanup_old_data(self, days_to_keep: int = 90):
         """
         古いデータを削除
@@ -557,22 +908,18 @@ class DatabaseManager:
         Args:
             days_to_keep: 保持する日数
         """
+        self.flush()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            tables = [
-                'screening_results',
-                'price_history',
-                'technical_indicators',
-                'alerts',
-                'news_history'
-            ]
+            # 基準日時は1回だけ計算し、全テーブルの削除を1トランザクションで実行
+            cutoff = cursor.execute("SELECT datetime('now', ?)", (_days_ago(days_to_keep),)).fetchone()[0]
+            cursor.execute("BEGIN")
 
-            for table in tables:
-                cursor.execute(f"""
-                    DELETE FROM {table}
-                    WHERE created_at < datetime('now', '-{days_to_keep} days')
-                """)
+            for table in self._CLEANUP_TABLES:
+                # テーブル名は固定のリストからのみ埋め込む
+                cursor.execute(f"DELETE FROM {table} WHERE created_at < ?", (cutoff,))
 
                 deleted = cursor.rowcount
                 if deleted > 0:
@@ -585,6 +932,8 @@ class DatabaseManager:
         Args:
             output_path: 出力ファイルパス
         """
+        self.flush()
+
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             # 各テーブルを別シートとしてエクスポート
             tables = {
@@ -598,10 +947,15 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 for sheet_name, table_name in tables.items():
                     query = f"SELECT * FROM {table_name} ORDER BY created_at DESC LIMIT 10000"
-                    df = pd.read_sql_query(query, conn)
 
-                    if not df.empty:
-                        df.to_excel(writer, sheet_name=sheet_name, index=False)
-                        logger.info(f"Exported {len(df)} records from {table_name}")
+                    # チャンクごとにシートへ追記（ヘッダーは最初のチャンクのみ）
+                    exported = 0
+                    for chunk in _iter_frames(conn, query):
+                        chunk.to_excel(writer, sheet_name=sheet_name, index=False,
+                                       header=exported == 0, startrow=exported + 1 if exported else 0)
+                        exported += len(chunk)
+
+                    if exported:
+                        logger.info(f"Exported {exported} records from {table_name}")
 
         logger.info(f"Database exported to {output_path}")
\ No newline at end of file
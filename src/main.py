@@ -2,23 +2,30 @@
 メインエントリーポイント
 """
 
+import io
 import yaml
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 from loguru import logger
 import schedule
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # 相対インポート
 from data_fetcher import DataFetcher
-from analyzer import StockAnalyzer
+from analyzer import StockAnalyzer, StockRecord, format_signals
 from notifier import Notifier
 from utils import setup_logging, load_config, format_currency
 
+# レポートの区切り線（改行込み）
+_REPORT_RULE = "=" * 60 + "\n"
+_REPORT_SEPARATOR = "-" * 40 + "\n"
+
 
 class DayTradeScreener:
     """デイトレードスクリーニングシステム"""
@@ -44,6 +51,10 @@ class DayTradeScreener:
         self.analyzer = StockAnalyzer(self.config, self.data_fetcher)
         self.notifier = Notifier(self.config)
 
+        # 銘柄ごとのデータ取得の並列数（Yahoo Financeの同時リクエスト数に合わせる）
+        yahoo_config = self.config.get('data_sources', {}).get('yahoo_finance', {})
+        self._max_workers = max(1, yahoo_config.get('max_workers', 10))
+
         logger.info("DayTradeScreener initialized successfully")
 
     def run_screening(self, screening_type: str = "full") -> Dict:
@@ -59,6 +70,9 @@ class DayTradeScreener:
         start_time = datetime.now()
         logger.info(f"Starting {screening_type} screening at {start_time}")
 
+        # 前回実行分のスコアキャッシュは新しいデータに対して使わない
+        self.analyzer.clear_score_cache()
+
         try:
             # 1. 銘柄リスト取得
             logger.info("Fetching stock list...")
@@ -71,48 +85,23 @@ class DayTradeScreener:
             logger.info(f"Found {len(stock_list)} stocks")
 
             # 2. 各銘柄のデータ取得と分析
-            analyzed_stocks = []
-
-            for idx, stock_info in stock_list.iterrows():
-                try:
-                    symbol = stock_info['symbol']
-                    logger.debug(f"Processing {symbol}")
-
-                    # 株価データ取得
-                    price_data = self.data_fetcher.fetch_price_data(symbol)
-                    if not price_data:
-                        continue
-
-                    # テクニカル指標取得
-                    technical_indicators = self.data_fetcher.fetch_technical_indicators(symbol)
-
-                    # ニュース取得
-                    news_data = self.data_fetcher.fetch_news(symbol)
-
-                    # セクターデータ取得（簡易版）
-                    sector_data = self.data_fetcher.fetch_sector_data('general')
-
-                    # 銘柄データを統合
-                    stock_data = {
-                        'symbol': symbol,
-                        'name': stock_info['name'],
-                        'market': stock_info['market'],
-                        'market_cap': stock_info.get('market_cap', 0),
-                        'is_marginable': stock_info.get('is_marginable', False),
-                        **price_data,
-                        'technical_indicators': technical_indicators,
-                        'news': news_data,
-                        'sector_data': sector_data
-                    }
-
-                    analyzed_stocks.append(stock_data)
-
-                    # 処理間隔（API制限対策）
-                    time.sleep(0.1)
-
-                except Exception as e:
-                    logger.warning(f"Error processing {stock_info.get('symbol', 'unknown')}: {e}")
-                    continue
+            # 株価データとニュースは全銘柄分を一括取得
+            symbols = stock_list['symbol'].tolist()
+            price_data_map = self.data_fetcher.fetch_price_data_bulk(symbols)
+            news_data_map = self.data_fetcher.fetch_news_bulk(symbols)
+            # セクターデータは全銘柄共通のため1回だけ取得（簡易版）
+            sector_data = self.data_fetcher.fetch_sector_data('general')
+
+            # 銘柄ごとの取得はI/O待ちが支配的なためスレッド並列で実行
+            # （API制限はDataFetcher内の共有レートリミッターで全スレッド共通に守る）
+            records = stock_list.to_dict('records')
+            max_workers = min(self._max_workers, len(records))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                fetched = executor.map(
+                    lambda stock_info: self._fetch_one(stock_info, price_data_map, news_data_map, sector_data),
+                    records
+                )
+                analyzed_stocks = [stock_data for stock_data in fetched if stock_data is not None]
 
             logger.info(f"Processed {len(analyzed_stocks)} stocks")
 
@@ -123,12 +112,14 @@ class DayTradeScreener:
             # 4. スコア計算
             logger.info("Calculating scores...")
             scored_stocks = []
-            for stock in filtered_stocks:
+            # 警告の判定結果はリスク指標計算で再利用する
+            classifications = []
+            score_results = self.analyzer.score_batch(filtered_stocks, classifications)
+            for stock, score_result, classification in zip(filtered_stocks, score_results, classifications):
                 try:
-                    score_result = self.analyzer.calculate_score(stock)
                     if score_result.get('total_score', 0) > 0:
                         # リスク指標追加
-                        risk_metrics = self.analyzer.calculate_risk_metrics(stock)
+                        risk_metrics = self.analyzer.calculate_risk_metrics(stock, classification)
                         score_result.update(risk_metrics)
 
                         # 元の株式データもマージ
@@ -143,7 +134,7 @@ class DayTradeScreener:
                         scored_stocks.append(score_result)
 
                 except Exception as e:
-                    logger.warning(f"Error scoring {stock.get('symbol', 'unknown')}: {e}")
+                    logger.warning("Error scoring {}: {}", stock.get('symbol', 'unknown'), e)
                     continue
 
             # 5. ランキング作成
@@ -154,6 +145,9 @@ class DayTradeScreener:
             end_time = datetime.now()
             execution_time = (end_time - start_time).total_seconds()
 
+            # スコアは1回だけ取り出し、統計値はNumPyの集約で計算
+            scores = np.fromiter((s.get('total_score', 0) for s in scored_stocks), dtype=np.float64, count=len(scored_stocks))
+
             results = {
                 'timestamp': start_time,
                 'screening_type': screening_type,
@@ -164,9 +158,9 @@ class DayTradeScreener:
                 'top_picks': ranked_stocks[:5],  # 上位5銘柄
                 'watch_list': ranked_stocks[5:20],  # 6-20位
                 'statistics': {
-                    'avg_score': sum(s.get('total_score', 0) for s in scored_stocks) / len(scored_stocks) if scored_stocks else 0,
-                    'max_score': max(s.get('total_score', 0) for s in scored_stocks) if scored_stocks else 0,
-                    'min_score': min(s.get('total_score', 0) for s in scored_stocks) if scored_stocks else 0
+                    'avg_score': float(scores.mean()) if scores.size else 0,
+                    'max_score': float(scores.max()) if scores.size else 0,
+                    'min_score': float(scores.min()) if scores.size else 0
                 }
             }
 
@@ -179,6 +173,52 @@ class DayTradeScreener:
             logger.error(f"Error during screening: {e}")
             return {'error': str(e), 'timestamp': datetime.now()}
 
+    def _fetch_one(self, stock_info: Dict, price_data_map: Dict, news_data_map: Dict,
+                   sector_data: Dict) -> Optional[StockRecord]:
+        """
+        1銘柄分のデータを取得して統合
+
+        Args:
+            stock_info: 銘柄リストの1行
+            price_data_map: 一括取得した株価データ
+            news_data_map: 一括取得したニュース
+            sector_data: 全銘柄共通のセクターデータ
+
+        Returns:
+            StockRecord: 統合した銘柄データ（取得できなかった場合はNone）
+        """
+        try:
+            symbol = stock_info['symbol']
+            logger.debug("Processing {}", symbol)
+
+            # 株価データ取得（一括取得で得られなかった銘柄のみ個別取得）
+            price_data = price_data_map.get(symbol) or self.data_fetcher.fetch_price_data(symbol)
+            if not price_data:
+                return None
+
+            # テクニカル指標取得
+            technical_indicators = self.data_fetcher.fetch_technical_indicators(symbol)
+
+            # ニュース取得
+            news_data = news_data_map[symbol] if symbol in news_data_map else self.data_fetcher.fetch_news(symbol)
+
+            # 銘柄データを統合
+            return StockRecord(
+                symbol=symbol,
+                name=stock_info['name'],
+                market=stock_info['market'],
+                market_cap=stock_info.get('market_cap', 0),
+                is_marginable=stock_info.get('is_marginable', False),
+                **price_data,
+                technical_indicators=technical_indicators,
+                news=news_data,
+                sector_data=sector_data
+            )
+
+        except Exception as e:
+            logger.warning("Error processing {}: {}", stock_info.get('symbol', 'unknown'), e)
+            return None
+
     def generate_report(self, results: Dict) -> str:
         """
         レポート生成
@@ -193,41 +233,42 @@ class DayTradeScreener:
             return f"スクリーニングエラー: {results['error']}"
 
         try:
-            report_lines = []
-            report_lines.append("=" * 60)
-            report_lines.append("デイトレスクリーニング結果")
-            report_lines.append(f"実行時刻: {results['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
-            report_lines.append(f"処理時間: {results['execution_time']:.2f}秒")
-            report_lines.append(f"処理銘柄数: {results['total_processed']} → {results['scored_count']}銘柄")
-            report_lines.append("=" * 60)
-            report_lines.append("")
+            buf = io.StringIO()
+            write = buf.write
+            write(_REPORT_RULE)
+            write("デイトレスクリーニング結果\n")
+            write(f"実行時刻: {results['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}\n")
+            write(f"処理時間: {results['execution_time']:.2f}秒\n")
+            write(f"処理銘柄数: {results['total_processed']} → {results['scored_count']}銘柄\n")
+            write(_REPORT_RULE)
+            write("\n")
 
             # 推奨銘柄TOP5
             if results['top_picks']:
-                report_lines.append("【推奨銘柄TOP5】")
-                report_lines.append("")
+                write("【推奨銘柄TOP5】\n")
+                write("\n")
 
                 for i, stock in enumerate(results['top_picks'], 1):
-                    report_lines.append(f"{i}. [{stock['symbol']}] {stock.get('name', '')}")
-                    report_lines.append(f"   スコア: {stock['total_score']}/100")
-                    report_lines.append(f"   現在値: {format_currency(stock.get('current_price', 0))}円")
+                    write(f"{i}. [{stock['symbol']}] {stock.get('name', '')}\n")
+                    write(f"   スコア: {stock['total_score']:.1f}/100\n")
+                    write(f"   現在値: {format_currency(stock.get('current_price', 0))}円\n")
 
                     gap_ratio = stock.get('gap_ratio', 0)
                     if gap_ratio > 0:
-                        report_lines.append(f"   前日比: +{gap_ratio:.1%}")
+                        write(f"   前日比: +{gap_ratio:.1%}\n")
                     else:
-                        report_lines.append(f"   前日比: {gap_ratio:.1%}")
+                        write(f"   前日比: {gap_ratio:.1%}\n")
 
                     volume_ratio = stock.get('volume_ratio', 1)
-                    report_lines.append(f"   出来高: 前日比 {volume_ratio:.1f}倍")
-                    report_lines.append("")
+                    write(f"   出来高: 前日比 {volume_ratio:.1f}倍\n")
+                    write("\n")
 
                     # シグナル
                     if stock.get('signals'):
-                        report_lines.append("   ▼ シグナル")
-                        for signal in stock['signals']:
-                            report_lines.append(f"   - {signal}")
-                        report_lines.append("")
+                        write("   ▼ シグナル\n")
+                        for signal in format_signals(stock['signals']):
+                            write(f"   - {signal}\n")
+                        write("\n")
 
                     # 推奨アクション
                     current_price = stock.get('current_price', 0)
@@ -238,41 +279,42 @@ class DayTradeScreener:
                         entry_low = current_price * 1.002
                         entry_high = current_price * 1.008
 
-                        report_lines.append("   ▼ 推奨アクション")
-                        report_lines.append(f"   エントリー: {format_currency(entry_low)}-{format_currency(entry_high)}円")
+                        write("   ▼ 推奨アクション\n")
+                        write(f"   エントリー: {format_currency(entry_low)}-{format_currency(entry_high)}円\n")
 
                         if take_profit > 0:
                             profit_pct = (take_profit - current_price) / current_price * 100
-                            report_lines.append(f"   利確目標: {format_currency(take_profit)}円 (+{profit_pct:.1f}%)")
+                            write(f"   利確目標: {format_currency(take_profit)}円 (+{profit_pct:.1f}%)\n")
 
                         if stop_loss > 0:
                             loss_pct = (current_price - stop_loss) / current_price * 100
-                            report_lines.append(f"   損切り: {format_currency(stop_loss)}円 (-{loss_pct:.1f}%)")
+                            write(f"   損切り: {format_currency(stop_loss)}円 (-{loss_pct:.1f}%)\n")
 
-                        report_lines.append("")
+                        write("\n")
 
                     # 注意事項
                     if stock.get('warnings'):
-                        report_lines.append("   ▼ 注意事項")
+                        write("   ▼ 注意事項\n")
                         for warning in stock['warnings']:
-                            report_lines.append(f"   - {warning}")
-                        report_lines.append("")
+                            write(f"   - {warning}\n")
+                        write("\n")
 
-                    report_lines.append("-" * 40)
-                    report_lines.append("")
+                    write(_REPORT_SEPARATOR)
+                    write("\n")
 
             # 統計情報
             stats = results.get('statistics', {})
             if stats:
-                report_lines.append("【統計情報】")
-                report_lines.append(f"平均スコア: {stats.get('avg_score', 0):.1f}")
-                report_lines.append(f"最高スコア: {stats.get('max_score', 0):.1f}")
-                report_lines.append(f"最低スコア: {stats.get('min_score', 0):.1f}")
-                report_lines.append("")
+                write("【統計情報】\n")
+                write(f"平均スコア: {stats.get('avg_score', 0):.1f}\n")
+                write(f"最高スコア: {stats.get('max_score', 0):.1f}\n")
+                write(f"最低スコア: {stats.get('min_score', 0):.1f}\n")
+                write("\n")
 
-            report_lines.append("=" * 60)
+            write(_REPORT_RULE)
 
-            return "\n".join(report_lines)
+            # 各行は改行で終わるため、末尾の改行だけ落として従来の連結結果と揃える
+            return buf.getvalue()[:-1]
 
         except Exception as e:
             logger.error(f"Error generating report: {e}")
@@ -291,31 +333,24 @@ class DayTradeScreener:
         """
         logger.info("Setting up scheduled execution")
 
-        # スケジュール設定
-        schedule.every().monday.at("07:00").do(self._run_scheduled_screening, "initial")
-        schedule.every().tuesday.at("07:00").do(self._run_scheduled_screening, "initial")
-        schedule.every().wednesday.at("07:00").do(self._run_scheduled_screening, "initial")
-        schedule.every().thursday.at("07:00").do(self._run_scheduled_screening, "initial")
-        schedule.every().friday.at("07:00").do(self._run_scheduled_screening, "initial")
-
-        schedule.every().monday.at("08:00").do(self._run_scheduled_screening, "secondary")
-        schedule.every().tuesday.at("08:00").do(self._run_scheduled_screening, "secondary")
-        schedule.every().wednesday.at("08:00").do(self._run_scheduled_screening, "secondary")
-        schedule.every().thursday.at("08:00").do(self._run_scheduled_screening, "secondary")
-        schedule.every().friday.at("08:00").do(self._run_scheduled_screening, "secondary")
-
-        schedule.every().monday.at("08:30").do(self._run_scheduled_screening, "final")
-        schedule.every().tuesday.at("08:30").do(self._run_scheduled_screening, "final")
-        schedule.every().wednesday.at("08:30").do(self._run_scheduled_screening, "final")
-        schedule.every().thursday.at("08:30").do(self._run_scheduled_screening, "final")
-        schedule.every().friday.at("08:30").do(self._run_scheduled_screening, "final")
+        # スケジュール設定（時刻ごとに1ジョブのみ登録し、土日は実行時にスキップ）
+        schedule.every().day.at("07:00").do(self._run_weekday_screening, "initial")
+        schedule.every().day.at("08:00").do(self._run_weekday_screening, "secondary")
+        schedule.every().day.at("08:30").do(self._run_weekday_screening, "final")
 
         logger.info("Scheduled tasks configured. Starting scheduler loop...")
 
         # スケジューラーループ
         while True:
             schedule.run_pending()
-            time.sleep(60)  # 1分間隔でチェック
+            time.sleep(60 - datetime.now().second)  # 次の分の境界までスリープ（1分間隔でチェック）
+
+    def _run_weekday_screening(self, screening_type: str):
+        """平日のみスケジュール実行する内部メソッド"""
+        if datetime.now().weekday() >= 5:
+            return
+
+        self._run_scheduled_screening(screening_type)
 
     def _run_scheduled_screening(self, screening_type: str):
         """スケジュール実行用の内部メソッド"""
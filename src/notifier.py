@@ -4,227 +4,26 @@
 
 import os
 import csv
+import re
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from typing import Dict, List
 from loguru import logger
 import json
 
+from analyzer import format_signals, round_scores
 
-class Notifier:
-    """通知・出力クラス"""
-
-    def __init__(self, config: Dict):
-        """
-        初期化
-
-        Args:
-            config: 設定辞書
-        """
-        self.config = config
-        self.notification_config = config.get('notification', {})
-
-        # LINE Notify設定
-        self.line_token = os.getenv('LINE_NOTIFY_TOKEN')
-
-        # Discord Webhook設定
-        self.discord_webhook = os.getenv('DISCORD_WEBHOOK_URL')
-
-    def send_notification(self, report: str, results: Dict):
-        """
-        設定に基づいて通知を送信
-
-        Args:
-            report: テキストレポート
-            results: スクリーニング結果データ
-        """
-        if not self.notification_config.get('enabled', False):
-            logger.info("Notifications are disabled")
-            return
-
-        channels = self.notification_config.get('channels', [])
-
-        for channel in channels:
-            if not channel.get('enabled', False):
-                continue
-
-            channel_type = channel.get('type')
-
-            try:
-                if channel_type == 'line':
-                    self.send_line_notify(report)
-                elif channel_type == 'discord':
-                    self.send_discord_webhook(report)
-                elif channel_type == 'file':
-                    file_path = channel.get('path', 'data/screening_results.csv')
-                    self.save_to_csv(results, file_path)
-                    # HTMLレポートも保存
-                    html_path = file_path.replace('.csv', '.html')
-                    html_report = self.create_html_report(results)
-                    self.save_html_report(html_report, html_path)
-
-            except Exception as e:
-                logger.error(f"Error sending notification via {channel_type}: {e}")
-
-    def send_line_notify(self, message: str):
-        """
-        LINE Notify送信
-
-        Args:
-            message: 送信メッセージ
-        """
-        if not self.line_token:
-            logger.warning("LINE Notify token not configured")
-            return
-
-        try:
-            url = "https://notify-api.line.me/api/notify"
-            headers = {
-                "Authorization": f"Bearer {self.line_token}"
-            }
-
-            # メッセージが長すぎる場合は分割
-            max_length = 1000
-            if len(message) > max_length:
-                # 重要な部分（TOP5）のみ送信
-                lines = message.split('\n')
-                summary_lines = []
-                in_top5 = False
-
-                for line in lines:
-                    if '【推奨銘柄TOP5】' in line:
-                        in_top5 = True
-                        summary_lines.append(line)
-                    elif in_top5 and ('【' in line or '=' in line):
-                        break
-                    elif in_top5:
-                        summary_lines.append(line)
-                    elif 'スクリーニング結果' in line or '実行時刻:' in line:
-                        summary_lines.append(line)
-
-                message = '\n'.join(summary_lines[:50])  # 最初の50行
-
-            data = {"message": message}
-
-            response = requests.post(url, headers=headers, data=data)
-            response.raise_for_status()
-
-            logger.info("LINE notification sent successfully")
-
-        except Exception as e:
-            logger.error(f"Error sending LINE notification: {e}")
-
-    def send_discord_webhook(self, message: str):
-        """
-        Discord Webhook送信
-
-        Args:
-            message: 送信メッセージ
-        """
-        if not self.discord_webhook:
-            logger.warning("Discord webhook URL not configured")
-            return
-
-        try:
-            # Discordの文字数制限（2000文字）
-            if len(message) > 1900:
-                message = message[:1900] + "..."
-
-            data = {
-                "content": f"```\n{message}\n```"
-            }
-
-            response = requests.post(self.discord_webhook, json=data)
-            response.raise_for_status()
-
-            logger.info("Discord notification sent successfully")
-
-        except Exception as e:
-            logger.error(f"Error sending Discord notification: {e}")
-
-    def save_to_csv(self, results: Dict, filepath: str):
-        """
-        CSV出力
-
-        Args:
-            results: スクリーニング結果
-            filepath: 出力ファイルパス
-        """
-        try:
-            # ディレクトリが存在しない場合は作成
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-            # 推奨銘柄とウォッチリストをまとめる
-            all_stocks = results.get('top_picks', []) + results.get('watch_list', [])
-
-            if not all_stocks:
-                logger.warning("No stocks to save to CSV")
-                return
-
-            # CSV用データ準備
-            csv_data = []
-            for stock in all_stocks:
-                row = {
-                    'timestamp': results.get('timestamp', datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
-                    'rank': stock.get('rank', 0),
-                    'symbol': stock.get('symbol', ''),
-                    'name': stock.get('name', ''),
-                    'total_score': stock.get('total_score', 0),
-                    'current_price': stock.get('current_price', 0),
-                    'gap_ratio': stock.get('gap_ratio', 0),
-                    'volume_ratio': stock.get('volume_ratio', 1),
-                    'market_cap': stock.get('market_cap', 0),
-                    'risk_level': stock.get('risk_level', 'unknown'),
-                    'stop_loss_price': stock.get('stop_loss_price', 0),
-                    'take_profit_price': stock.get('take_profit_price', 0),
-                    'signals': '|'.join(stock.get('signals', [])),
-                    'warnings': '|'.join(stock.get('warnings', [])),
-                    'volume_score': stock.get('score_breakdown', {}).get('volume_score', 0),
-                    'gap_score': stock.get('score_breakdown', {}).get('gap_score', 0),
-                    'technical_score': stock.get('score_breakdown', {}).get('technical_score', 0),
-                    'news_score': stock.get('score_breakdown', {}).get('news_score', 0)
-                }
-                csv_data.append(row)
-
-            # DataFrameに変換してCSV保存
-            df = pd.DataFrame(csv_data)
-
-            # 既存ファイルに追記するかどうか
-            file_exists = os.path.exists(filepath)
-            mode = 'a' if file_exists else 'w'
-            header = not file_exists
-
-            df.to_csv(filepath, mode=mode, header=header, index=False, encoding='utf-8-sig')
-
-            logger.info(f"Results saved to CSV: {filepath}")
-
-        except Exception as e:
-            logger.error(f"Error saving to CSV: {e}")
-
-    def create_html_report(self, results: Dict) -> str:
-        """
-        HTMLレポート生成
-
-        Args:
-            results: スクリーニング結果
-
-        Returns:
-            str: HTMLレポート
-        """
-        try:
-            timestamp = results.get('timestamp', datetime.now())
-            top_picks = results.get('top_picks', [])
-            watch_list = results.get('watch_list', [])
-            statistics = results.get('statistics', {})
-
-            html = f"""
+# HTMLレポートの雛形（str.formatで埋め込むため、CSSの波括弧は二重にしている）
+_HTML_HEADER = """
 <!DOCTYPE html>
 <html lang="ja">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>デイトレスクリーニング結果 - {timestamp.strftime('%Y-%m-%d %H:%M')}</title>
+    <title>デイトレスクリーニング結果 - {title_time}</title>
     <style>
         body {{
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -349,76 +148,45 @@ class Notifier:
     <div class="container">
         <div class="header">
             <h1>デイトレスクリーニング結果</h1>
-            <p>実行時刻: {timestamp.strftime('%Y年%m月%d日 %H:%M:%S')}</p>
+            <p>実行時刻: {run_time}</p>
         </div>
 
         <div class="stats">
             <div class="stat-item">
-                <div class="stat-value">{len(top_picks)}</div>
+                <div class="stat-value">{top_count}</div>
                 <div>推奨銘柄</div>
             </div>
             <div class="stat-item">
-                <div class="stat-value">{len(watch_list)}</div>
+                <div class="stat-value">{watch_count}</div>
                 <div>ウォッチ銘柄</div>
             </div>
             <div class="stat-item">
-                <div class="stat-value">{statistics.get('max_score', 0):.1f}</div>
+                <div class="stat-value">{max_score:.1f}</div>
                 <div>最高スコア</div>
             </div>
             <div class="stat-item">
-                <div class="stat-value">{statistics.get('avg_score', 0):.1f}</div>
+                <div class="stat-value">{avg_score:.1f}</div>
                 <div>平均スコア</div>
             </div>
         </div>
 """
 
-            # 推奨銘柄TOP5
-            if top_picks:
-                html += '<div class="section-title">推奨銘柄 TOP5</div>'
-
-                for stock in top_picks:
-                    html += self._generate_stock_card_html(stock)
-
-            # ウォッチリスト
-            if watch_list:
-                html += '<div class="section-title">ウォッチリスト</div>'
-
-                for stock in watch_list[:10]:  # 上位10銘柄のみ表示
-                    html += self._generate_stock_card_html(stock)
-
-            html += """
+_HTML_FOOTER = """
     </div>
 </body>
 </html>
 """
 
-            return html
-
-        except Exception as e:
-            logger.error(f"Error creating HTML report: {e}")
-            return f"<html><body><h1>レポート生成エラー</h1><p>{e}</p></body></html>"
-
-    def _generate_stock_card_html(self, stock: Dict) -> str:
-        """個別銘柄のHTMLカード生成"""
-        signals = stock.get('signals', [])
-        warnings = stock.get('warnings', [])
-
-        signal_tags = ''.join([f'<span class="signal-tag">{signal}</span>' for signal in signals])
-        warning_tags = ''.join([f'<span class="warning-tag">{warning}</span>' for warning in warnings])
-
-        gap_ratio = stock.get('gap_ratio', 0)
-        gap_display = f"+{gap_ratio:.1%}" if gap_ratio > 0 else f"{gap_ratio:.1%}"
-
-        return f"""
+_CARD_TEMPLATE = """
         <div class="stock-card">
             <div class="stock-header">
-                <div class="stock-title">{stock.get('rank', '')}. [{stock.get('symbol', '')}] {stock.get('name', '')}</div>
-                <div class="score">{stock.get('total_score', 0):.1f}/100</div>
+                <div class="stock-title">{rank}. [{symbol}] {name}</div>
+                <div class="score">{total_score:.1f}/100</div>
             </div>
             <div class="stock-details">
                 <div class="detail-item">
                     <div class="detail-label">現在値</div>
-                    <div class="detail-value">{stock.get('current_price', 0):,.0f}円</div>
+                    <div class="detail-value">{current_price:,.0f}円</div>
                 </div>
                 <div class="detail-item">
                     <div class="detail-label">前日比</div>
@@ -426,19 +194,19 @@ class Notifier:
                 </div>
                 <div class="detail-item">
                     <div class="detail-label">出来高比</div>
-                    <div class="detail-value">{stock.get('volume_ratio', 1):.1f}倍</div>
+                    <div class="detail-value">{volume_ratio:.1f}倍</div>
                 </div>
                 <div class="detail-item">
                     <div class="detail-label">利確目標</div>
-                    <div class="detail-value">{stock.get('take_profit_price', 0):,.0f}円</div>
+                    <div class="detail-value">{take_profit_price:,.0f}円</div>
                 </div>
                 <div class="detail-item">
                     <div class="detail-label">損切り</div>
-                    <div class="detail-value">{stock.get('stop_loss_price', 0):,.0f}円</div>
+                    <div class="detail-value">{stop_loss_price:,.0f}円</div>
                 </div>
                 <div class="detail-item">
                     <div class="detail-label">リスクレベル</div>
-                    <div class="detail-value">{stock.get('risk_level', 'unknown').upper()}</div>
+                    <div class="detail-value">{risk_level}</div>
                 </div>
             </div>
             <div class="signals">
@@ -448,6 +216,285 @@ class Notifier:
         </div>
         """
 
+# シグナル・注意事項のタグ（束縛済みのstr.formatをmapで適用）
+_SIGNAL_TAG = '<span class="signal-tag">{}</span>'.format
+_WARNING_TAG = '<span class="warning-tag">{}</span>'.format
+
+# LINE通知の要約用: TOP5見出し行から、（TOP5見出し以外で）【または=を含む行の直前までのブロック
+_LINE_TOP5_RE = re.compile(r'^.*【推奨銘柄TOP5】.*$(?:\n(?:[^【=\n]*|.*【推奨銘柄TOP5】.*)$)*', re.MULTILINE)
+# TOP5より前にある見出し行（タイトル・実行時刻）
+_LINE_HEADER_RE = re.compile(r'^.*(?:スクリーニング結果|実行時刻:).*$', re.MULTILINE)
+
+
+class Notifier:
+    """通知・出力クラス"""
+
+    # CSV出力の列順
+    _CSV_FIELDS = (
+        'timestamp', 'rank', 'symbol', 'name', 'total_score', 'current_price',
+        'gap_ratio', 'volume_ratio', 'market_cap', 'risk_level', 'stop_loss_price',
+        'take_profit_price', 'signals', 'warnings', 'volume_score', 'gap_score',
+        'technical_score', 'news_score'
+    )
+    # 送信リクエストのタイムアウト（接続, 読み取り）秒
+    _REQUEST_TIMEOUT = (3, 10)
+
+    def __init__(self, config: Dict):
+        """
+        初期化
+
+        Args:
+            config: 設定辞書
+        """
+        self.config = config
+        self.notification_config = config.get('notification', {})
+
+        # LINE Notify設定
+        self.line_token = os.getenv('LINE_NOTIFY_TOKEN')
+
+        # Discord Webhook設定
+        self.discord_webhook = os.getenv('DISCORD_WEBHOOK_URL')
+
+        # 送信先ごとの接続をkeep-aliveで再利用（POSTは重複送信を避けるため接続エラー時のみ再試行される）
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+
+    def send_notification(self, report: str, results: Dict):
+        """
+        設定に基づいて通知を送信
+
+        Args:
+            report: テキストレポート
+            results: スクリーニング結果データ
+        """
+        if not self.notification_config.get('enabled', False):
+            logger.info("Notifications are disabled")
+            return
+
+        channels = self.notification_config.get('channels', [])
+
+        for channel in channels:
+            if not channel.get('enabled', False):
+                continue
+
+            channel_type = channel.get('type')
+
+            try:
+                if channel_type == 'line':
+                    self.send_line_notify(report)
+                elif channel_type == 'discord':
+                    self.send_discord_webhook(report)
+                elif channel_type == 'file':
+                    file_path = channel.get('path', 'data/screening_results.csv')
+                    self.save_to_csv(results, file_path)
+                    # HTMLレポートも保存
+                    html_path = file_path.replace('.csv', '.html')
+                    html_report = self.create_html_report(results)
+                    self.save_html_report(html_report, html_path)
+
+            except Exception as e:
+                logger.error(f"Error sending notification via {channel_type}: {e}")
+
+    def send_line_notify(self, message: str):
+        """
+        LINE Notify送信
+
+        Args:
+            message: 送信メッセージ
+        """
+        if not self.line_token:
+            logger.warning("LINE Notify token not configured")
+            return
+
+        try:
+            url = "https://notify-api.line.me/api/notify"
+            headers = {
+                "Authorization": f"Bearer {self.line_token}"
+            }
+
+            # メッセージが長すぎる場合は分割
+            max_length = 1000
+            if len(message) > max_length:
+                # 重要な部分（見出し行とTOP5ブロック）のみ送信
+                top5 = _LINE_TOP5_RE.search(message)
+                head = message[:top5.start()] if top5 else message
+                summary_lines = _LINE_HEADER_RE.findall(head)
+                if top5:
+                    summary_lines.extend(top5.group(0).split('\n'))
+
+                message = '\n'.join(summary_lines[:50])  # 最初の50行
+
+            data = {"message": message}
+
+            response = self.session.post(url, headers=headers, data=data, timeout=self._REQUEST_TIMEOUT)
+            response.raise_for_status()
+
+            logger.info("LINE notification sent successfully")
+
+        except Exception as e:
+            logger.error(f"Error sending LINE notification: {e}")
+
+    def send_discord_webhook(self, message: str):
+        """
+        Discord Webhook送信
+
+        Args:
+            message: 送信メッセージ
+        """
+        if not self.discord_webhook:
+            logger.warning("Discord webhook URL not configured")
+            return
+
+        try:
+            # Discordの文字数制限（2000文字）
+            if len(message) > 1900:
+                message = message[:1900] + "..."
+
+            data = {
+                "content": f"```\n{message}\n```"
+            }
+
+            response = self.session.post(self.discord_webhook, json=data, timeout=self._REQUEST_TIMEOUT)
+            response.raise_for_status()
+
+            logger.info("Discord notification sent successfully")
+
+        except Exception as e:
+            logger.error(f"Error sending Discord notification: {e}")
+
+    def save_to_csv(self, results: Dict, filepath: str):
+        """
+        CSV出力
+
+        Args:
+            results: スクリーニング結果
+            filepath: 出力ファイルパス
+        """
+        try:
+            # ディレクトリが存在しない場合は作成
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+            # 推奨銘柄とウォッチリストをまとめる
+            all_stocks = results.get('top_picks', []) + results.get('watch_list', [])
+
+            if not all_stocks:
+                logger.warning("No stocks to save to CSV")
+                return
+
+            # CSV用データ準備（列順どおりのタプルで1行ずつ作り、実行時刻の整形は1回だけ行う）
+            timestamp = results.get('timestamp', datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
+            csv_rows = []
+            for stock in map(round_scores, all_stocks):
+                breakdown = stock.get('score_breakdown') or {}
+                csv_rows.append((
+                    timestamp,
+                    stock.get('rank', 0),
+                    stock.get('symbol', ''),
+                    stock.get('name', ''),
+                    stock.get('total_score', 0),
+                    stock.get('current_price', 0),
+                    stock.get('gap_ratio', 0),
+                    stock.get('volume_ratio', 1),
+                    stock.get('market_cap', 0),
+                    stock.get('risk_level', 'unknown'),
+                    stock.get('stop_loss_price', 0),
+                    stock.get('take_profit_price', 0),
+                    '|'.join(format_signals(stock.get('signals', []))),
+                    '|'.join(stock.get('warnings', [])),
+                    breakdown.get('volume_score', 0),
+                    breakdown.get('gap_score', 0),
+                    breakdown.get('technical_score', 0),
+                    breakdown.get('news_score', 0)
+                ))
+
+            # DataFrameを経由せず、ファイルへ直接ストリーム書き込み
+            # 新規作成時のみBOM付きで書き、ヘッダーを出力する
+            file_exists = os.path.exists(filepath)
+            mode = 'a' if file_exists else 'w'
+            encoding = 'utf-8' if file_exists else 'utf-8-sig'
+
+            with open(filepath, mode, newline='', encoding=encoding) as f:
+                writer = csv.writer(f, lineterminator=os.linesep)
+                if not file_exists:
+                    writer.writerow(self._CSV_FIELDS)
+                writer.writerows(csv_rows)
+
+            logger.info(f"Results saved to CSV: {filepath}")
+
+        except Exception as e:
+            logger.error(f"Error saving to CSV: {e}")
+
+    def create_html_report(self, results: Dict) -> str:
+        """
+        HTMLレポート生成
+
+        Args:
+            results: スクリーニング結果
+
+        Returns:
+            str: HTMLレポート
+        """
+        try:
+            timestamp = results.get('timestamp', datetime.now())
+            top_picks = results.get('top_picks', [])
+            watch_list = results.get('watch_list', [])
+            statistics = results.get('statistics', {})
+
+            parts = [_HTML_HEADER.format(
+                title_time=timestamp.strftime('%Y-%m-%d %H:%M'),
+                run_time=timestamp.strftime('%Y年%m月%d日 %H:%M:%S'),
+                top_count=len(top_picks),
+                watch_count=len(watch_list),
+                max_score=statistics.get('max_score', 0),
+                avg_score=statistics.get('avg_score', 0)
+            )]
+
+            # 推奨銘柄TOP5
+            if top_picks:
+                parts.append('<div class="section-title">推奨銘柄 TOP5</div>')
+                parts.extend(self._generate_stock_card_html(stock) for stock in top_picks)
+
+            # ウォッチリスト
+            if watch_list:
+                parts.append('<div class="section-title">ウォッチリスト</div>')
+                # 上位10銘柄のみ表示
+                parts.extend(self._generate_stock_card_html(stock) for stock in watch_list[:10])
+
+            parts.append(_HTML_FOOTER)
+
+            return "".join(parts)
+
+        except Exception as e:
+            logger.error(f"Error creating HTML report: {e}")
+            return f"<html><body><h1>レポート生成エラー</h1><p>{e}</p></body></html>"
+
+    def _generate_stock_card_html(self, stock: Dict) -> str:
+        """個別銘柄のHTMLカード生成"""
+        signals = format_signals(stock.get('signals', []))
+        warnings = stock.get('warnings', [])
+
+        signal_tags = ''.join(map(_SIGNAL_TAG, signals))
+        warning_tags = ''.join(map(_WARNING_TAG, warnings))
+
+        gap_ratio = stock.get('gap_ratio', 0)
+        gap_display = f"+{gap_ratio:.1%}" if gap_ratio > 0 else f"{gap_ratio:.1%}"
+
+        return _CARD_TEMPLATE.format(
+            rank=stock.get('rank', ''),
+            symbol=stock.get('symbol', ''),
+            name=stock.get('name', ''),
+            total_score=stock.get('total_score', 0),
+            current_price=stock.get('current_price', 0),
+            gap_display=gap_display,
+            volume_ratio=stock.get('volume_ratio', 1),
+            take_profit_price=stock.get('take_profit_price', 0),
+            stop_loss_price=stock.get('stop_loss_price', 0),
+            risk_level=stock.get('risk_level', 'unknown').upper(),
+            signal_tags=signal_tags,
+            warning_tags=warning_tags
+        )
+
     def save_html_report(self, html: str, filepath: str):
         """
         HTMLレポートをファイルに保存
@@ -485,6 +532,14 @@ class Notifier:
             if 'timestamp' in results_copy:
                 results_copy['timestamp'] = results_copy['timestamp'].isoformat()
 
+            # スコアの丸めとシグナルの表示用文字列への整形は、CSV・HTMLと同じく出力時に行う
+            for key in ('top_picks', 'watch_list'):
+                if key in results_copy:
+                    results_copy[key] = [
+                        dict(stock, signals=format_signals(stock.get('signals', [])))
+                        for stock in map(round_scores, results_copy[key])
+                    ]
+
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(results_copy, f, ensure_ascii=False, indent=2)
 
@@ -173,7 +173,7 @@ class RealtimeMonitor:
                     # アラートチェック
                     self._check_alerts(symbol, stock)
 
-                    logger.debug(f"{symbol}: {current_price:.2f} ({stock['pnl_percentage']:+.2f}%)")
+                    logger.debug("{}: {:.2f} ({:+.2f}%)", symbol, current_price, stock['pnl_percentage'])
 
                 # 更新間隔待機
                 time.sleep(self.update_interval)
@@ -10,7 +10,7 @@ sys.path.append('src')
 
 from datetime import datetime
 from data_fetcher import DataFetcher
-from analyzer import StockAnalyzer
+from analyzer import StockAnalyzer, format_signals
 from notifier import Notifier
 from utils import setup_logging, load_config
 from loguru import logger
@@ -102,7 +102,7 @@ def test_basic_screening():
 
         if stock.get('signals'):
             print(f"  シグナル:")
-            for signal in stock['signals']:
+            for signal in format_signals(stock['signals']):
                 print(f"    - {signal}")
 
         if stock.get('warnings'):
@@ -218,7 +218,7 @@ def test_analyzer():
     # シグナル検出
     print("2. シグナル検出...")
     signals = analyzer.detect_entry_signals(sample_stock)
-    for signal in signals:
+    for signal in format_signals(signals):
         print(f"   ✓ {signal}")
 
     # リスク計算
@@ -22,7 +22,7 @@ sys.path.append('src')
 
 from database import DatabaseManager
 from data_fetcher import DataFetcher
-from analyzer import StockAnalyzer
+from analyzer import StockAnalyzer, StockRecord, format_signals, round_scores
 from advanced_analyzer import AdvancedTechnicalAnalyzer
 from realtime_monitor import RealtimeMonitor, PositionManager
 from utils import load_config, setup_logging
@@ -107,7 +107,7 @@ def get_stock_details(symbol):
     """個別銘柄の詳細情報を取得"""
     try:
         # 価格データ取得
-        price_data = data_fetcher.fetch_price_data(symbol, period='30d')
+        price_data = data_fetcher.fetch_price_data(symbol, period='30d', include_frame=True)
 
         # テクニカル指標計算
         df = price_data.get('price_data')
@@ -141,7 +141,7 @@ def get_chart_data(symbol):
     """チャート用データを取得"""
     try:
         # 価格データ取得
-        price_data = data_fetcher.fetch_price_data(symbol, period='60d')
+        price_data = data_fetcher.fetch_price_data(symbol, period='60d', include_frame=True)
         df = price_data.get('price_data')
 
         if df is None or df.empty:
@@ -416,29 +416,32 @@ def run_periodic_screening():
 
                 # スクリーニング実行（簡易版）
                 stock_list = data_fetcher.fetch_stock_list()
-                results = []
+                price_data_map = data_fetcher.fetch_price_data_bulk(stock_list['symbol'].tolist()) if not stock_list.empty else {}
 
-                for _, stock in stock_list.iterrows():
-                    try:
-                        symbol = stock['symbol']
-                        price_data = data_fetcher.fetch_price_data(symbol)
+                def iter_stock_data():
+                    for stock in stock_list.to_dict('records'):
+                        try:
+                            symbol = stock['symbol']
+                            price_data = price_data_map.get(symbol) or data_fetcher.fetch_price_data(symbol)
 
-                        if price_data:
-                            stock_data = {
-                                'symbol': symbol,
-                                'name': stock['name'],
-                                **price_data
-                            }
+                            if price_data:
+                                yield StockRecord(
+                                    symbol=symbol,
+                                    name=stock['name'],
+                                    **price_data
+                                )
 
-                            score = analyzer.calculate_score(stock_data)
-                            results.append(score)
+                        except Exception as e:
+                            logger.warning("Error processing {}: {}", symbol, e)
 
-                    except Exception as e:
-                        logger.warning(f"Error processing {symbol}: {e}")
+                # 上位10銘柄のみ保持しながらスコア計算
+                top_stocks = analyzer.score_and_rank(iter_stock_data(), k=10)
 
                 # 結果をブロードキャスト
-                if results:
-                    top_stocks = sorted(results, key=lambda x: x.get('total_score', 0), reverse=True)[:10]
+                if top_stocks:
+                    top_stocks = [round_scores(top_stock) for top_stock in top_stocks]
+                    for top_stock in top_stocks:
+                        top_stock['signals'] = format_signals(top_stock.get('signals', []))
                     socketio.emit('screening_update', {
                         'timestamp': current_time.isoformat(),
                         'stocks': top_stocks